@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+
+"""
+Scripts de rendimiento para el Proyecto QAP.
+
+Cada módulo se ejecuta como 'python -m benchmarks.<modulo>' desde la raíz del repositorio.
+"""
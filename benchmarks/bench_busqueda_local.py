@@ -0,0 +1,212 @@
+# benchmarks/bench_busqueda_local.py
+
+"""
+Mide el coste de la búsqueda local de src.optimization sobre instancias de data/raw.
+
+Modos:
+    disperso:     evaluación densa frente a dispersa (vista CSR de la matriz de flujos) de los deltas
+                  de intercambio, en el barrido completo del vecindario 2-exchange y en la búsqueda local.
+    motores:      tiempo medio y coste final de cada motor de MOTORES_BUSQUEDA_LOCAL.
+    lamarckiana:  tiempo total de una ejecución corta de la variante Lamarckiana con cada motor.
+    dlb:          bits de "no mirar" con primera y mejor mejora frente a los demás motores, desde las
+                  mismas permutaciones: tiempo medio hasta detenerse, coste medio y desviación respecto
+                  al mejor coste medio.
+
+Uso:
+    python -m benchmarks.bench_busqueda_local --mode disperso --data "data/raw/tai*c.dat" --individuals 5
+    python -m benchmarks.bench_busqueda_local --mode lamarckiana --data data/raw/tai64c.dat --generations 5
+    python -m benchmarks.bench_busqueda_local --mode dlb --data data/raw/nug30.dat data/raw/tai60a.dat --individuals 10
+"""
+
+import argparse
+import glob
+import os
+import time
+import numpy as np
+from numba import njit
+
+from src.lamarckian_ga import ejecutar_varianta_lamarckiana
+from src.optimization import (calcular_delta_coste_numba, calcular_delta_coste_disperso, optimizar_individuo_busqueda_local,
+                              MOTORES_BUSQUEDA_LOCAL)
+from src.utils import cargar_datos, construir_flujo_disperso
+
+# Configuraciones del modo dlb: (nombre en la tabla, motor, estrategia)
+CONFIGURACIONES_DLB = (
+    ('mascara', 'mascara', 'primera'),
+    ('mascara_jit', 'mascara_jit', 'primera'),
+    ('tabla_deltas', 'tabla_deltas', 'primera'),
+    ('dlb primera', 'bits_no_mirar', 'primera'),
+    ('dlb mejor', 'bits_no_mirar', 'mejor'),
+)
+
+
+@njit
+def barrido_denso(individuo, flujo_matrix, distancia_matrix):
+    total = 0.0
+    n = individuo.shape[0]
+    for r in range(n):
+        for s in range(r + 1, n):
+            total += calcular_delta_coste_numba(individuo, flujo_matrix, distancia_matrix, r, s)
+    return total
+
+
+@njit
+def barrido_disperso(individuo, indptr, indices, datos, indptr_t, indices_t, datos_t, distancia_matrix):
+    total = 0.0
+    n = individuo.shape[0]
+    for r in range(n):
+        for s in range(r + 1, n):
+            total += calcular_delta_coste_disperso(individuo, indptr, indices, datos, indptr_t, indices_t, datos_t,
+                                                   distancia_matrix, r, s)
+    return total
+
+
+def medir(funcion, repeticiones=1):
+    """
+    Devuelve el mejor tiempo (en segundos) y el resultado de 'repeticiones' llamadas a 'funcion'.
+    """
+    mejor, resultado = float('inf'), None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def modo_disperso(rutas, args):
+    print(f"{'instancia':<10} {'n':>4} {'densidad':>9} {'barrido denso (ms)':>19} {'barrido disperso (ms)':>22} "
+          f"{'BL densa (s)':>13} {'BL dispersa (s)':>16} {'mismo coste':>12}")
+    for ruta in rutas:
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        n, flujo, distancias = cargar_datos(ruta)
+        fd = construir_flujo_disperso(flujo)
+        rng = np.random.default_rng(args.seed)
+        individuos = [rng.permutation(n) for _ in range(args.individuals)]
+
+        # Compilación previa de los kernels para no medir el JIT
+        barrido_denso(individuos[0], flujo, distancias)
+        barrido_disperso(individuos[0], fd.indptr, fd.indices, fd.datos, fd.indptr_t, fd.indices_t, fd.datos_t, distancias)
+
+        t_denso, _ = medir(lambda: barrido_denso(individuos[0], flujo, distancias), 3)
+        t_disperso, _ = medir(lambda: barrido_disperso(individuos[0], fd.indptr, fd.indices, fd.datos,
+                                                       fd.indptr_t, fd.indices_t, fd.datos_t, distancias), 3)
+
+        def busqueda(flujo_disperso):
+            np.random.seed(args.seed)
+            return [optimizar_individuo_busqueda_local(ind, flujo, distancias, max_iter=args.max_iter,
+                                                       flujo_disperso=flujo_disperso)[1] for ind in individuos]
+
+        t_bl_densa, costes_densos = medir(lambda: busqueda(None))
+        t_bl_dispersa, costes_dispersos = medir(lambda: busqueda(fd))
+
+        print(f"{nombre:<10} {n:>4} {fd.densidad:>9.3f} {t_denso * 1e3:>19.2f} {t_disperso * 1e3:>22.2f} "
+              f"{t_bl_densa:>13.2f} {t_bl_dispersa:>16.2f} {str(np.allclose(costes_densos, costes_dispersos)):>12}")
+
+
+def modo_motores(rutas, args):
+    print(f"{'instancia':<10} {'n':>4} {'motor':<14} {'tiempo medio (ms)':>18} {'coste medio':>16}")
+    for ruta in rutas:
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        n, flujo, distancias, fd = cargar_datos(ruta, detectar_dispersion=True)
+        rng = np.random.default_rng(args.seed)
+        individuos = [rng.permutation(n) for _ in range(args.individuals)]
+        for motor in args.engines:
+            # Compilación previa (o carga desde la caché de numba)
+            optimizar_individuo_busqueda_local(individuos[0], flujo, distancias, max_iter=1, flujo_disperso=fd, motor=motor)
+            np.random.seed(args.seed)
+            inicio = time.perf_counter()
+            costes = [optimizar_individuo_busqueda_local(ind, flujo, distancias, max_iter=args.max_iter,
+                                                         flujo_disperso=fd, motor=motor)[1] for ind in individuos]
+            tiempo = (time.perf_counter() - inicio) / len(individuos)
+            print(f"{nombre:<10} {n:>4} {motor:<14} {tiempo * 1e3:>18.2f} {np.mean(costes):>16.1f}")
+
+
+def modo_lamarckiana(rutas, args):
+    print(f"{'instancia':<10} {'n':>4} {'motor':<14} {'tiempo (s)':>11} {'mejor coste':>14}")
+    for ruta in rutas:
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        n, flujo, distancias, fd = cargar_datos(ruta, detectar_dispersion=True)
+        for motor in args.engines:
+            optimizar_individuo_busqueda_local(np.arange(n), flujo, distancias, max_iter=1, flujo_disperso=fd, motor=motor)
+            parametros = {
+                'poblacion': args.population,
+                'generaciones': args.generations,
+                'tasa_cruce': 0.8,
+                'tasa_mutacion': 0.02,
+                'elitismo': True,
+                'tam_poblacion_opt': args.population // 2,
+                'hill_climbing_max_iter': args.max_iter,
+                'flujo_disperso': fd,
+                'motor_busqueda_local': motor
+            }
+            np.random.seed(args.seed)
+            inicio = time.perf_counter()
+            mejor_solucion, _ = ejecutar_varianta_lamarckiana(n, flujo, distancias, parametros)
+            tiempo = time.perf_counter() - inicio
+            print(f"{nombre:<10} {n:>4} {motor:<14} {tiempo:>11.2f} {mejor_solucion[1]:>14.1f}")
+
+
+def modo_dlb(rutas, args):
+    print(f"{'instancia':<10} {'n':>4} {'motor':<14} {'tiempo medio (ms)':>18} {'coste medio':>16} {'desv. (%)':>10}")
+    for ruta in rutas:
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        n, flujo, distancias = cargar_datos(ruta)
+        rng = np.random.default_rng(args.seed)
+        individuos = [rng.permutation(n) for _ in range(args.individuals)]
+
+        resultados = []
+        for etiqueta, motor, estrategia in CONFIGURACIONES_DLB:
+            # Compilación previa (o carga desde la caché de numba)
+            optimizar_individuo_busqueda_local(individuos[0], flujo, distancias, max_iter=1, motor=motor,
+                                               estrategia=estrategia)
+            tiempo, costes = 0.0, []
+            for k, ind in enumerate(individuos):
+                # Misma semilla para cada permutación inicial en todos los motores
+                np.random.seed(args.seed + k)
+                inicio = time.perf_counter()
+                costes.append(optimizar_individuo_busqueda_local(ind, flujo, distancias, max_iter=args.max_iter,
+                                                                 motor=motor, estrategia=estrategia)[1])
+                tiempo += time.perf_counter() - inicio
+            resultados.append((etiqueta, tiempo / len(individuos), float(np.mean(costes))))
+
+        mejor = min(coste for _, _, coste in resultados)
+        for etiqueta, tiempo, coste in resultados:
+            print(f"{nombre:<10} {n:>4} {etiqueta:<14} {tiempo * 1e3:>18.2f} {coste:>16.1f} "
+                  f"{100 * (coste - mejor) / mejor:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la búsqueda local')
+    parser.add_argument('--mode', type=str, default='disperso', choices=['disperso', 'motores', 'lamarckiana', 'dlb'],
+                        help='Comparación a realizar')
+    parser.add_argument('--data', type=str, nargs='+',
+                        default=['data/raw/chr25a.dat', 'data/raw/tai64c.dat', 'data/raw/tai256c.dat'],
+                        help='Rutas o patrones glob de las instancias')
+    parser.add_argument('--engines', type=str, nargs='+', default=list(MOTORES_BUSQUEDA_LOCAL),
+                        choices=list(MOTORES_BUSQUEDA_LOCAL),
+                        help='Motores de búsqueda local a comparar (modos motores y lamarckiana)')
+    parser.add_argument('--individuals', type=int, default=3,
+                        help='Número de individuos aleatorios optimizados por instancia')
+    parser.add_argument('--max_iter', type=int, default=1000,
+                        help='Iteraciones máximas de la búsqueda local')
+    parser.add_argument('--population', type=int, default=20,
+                        help='Tamaño de población (modo lamarckiana)')
+    parser.add_argument('--generations', type=int, default=5,
+                        help='Número de generaciones (modo lamarckiana)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Semilla de los individuos iniciales')
+    args = parser.parse_args()
+
+    rutas = sorted({ruta for patron in args.data for ruta in glob.glob(patron)})
+    if args.mode == 'disperso':
+        modo_disperso(rutas, args)
+    elif args.mode == 'motores':
+        modo_motores(rutas, args)
+    elif args.mode == 'dlb':
+        modo_dlb(rutas, args)
+    else:
+        modo_lamarckiana(rutas, args)
+
+
+if __name__ == '__main__':
+    main()
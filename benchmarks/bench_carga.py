@@ -0,0 +1,74 @@
+# benchmarks/bench_carga.py
+
+"""
+Compara el tiempo de carga de las instancias de data/raw con el lector original (np.loadtxt),
+el lector por tokens de src.utils y la caché binaria de src.utils.cargar_datos_cache (primera
+carga, que la genera, y cargas siguientes).
+
+Uso:
+    python -m benchmarks.bench_carga --data "data/raw/tai256c.dat" --repeats 5
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+
+from src.utils import cargar_datos
+
+
+def cargar_datos_loadtxt(ruta_archivo):
+    """
+    Lector original de cargar_datos: exige exactamente 2n líneas de n valores tras la primera.
+    """
+    data = np.loadtxt(ruta_archivo, skiprows=1)
+    n = int(data.shape[0] / 2)
+    if data.shape[0] != 2 * n or data.shape[1] != n:
+        raise ValueError(f"El archivo {ruta_archivo} no tiene las dimensiones esperadas.")
+    return n, np.int32(data[:n, :]), np.float32(data[n:, :])
+
+
+def medir(funcion, repeticiones):
+    """
+    Devuelve el mejor tiempo (en segundos) de 'repeticiones' llamadas a 'funcion'.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga de instancias con y sin caché binaria.")
+    parser.add_argument('--data', type=str, default=os.path.join('data', 'raw', '*.dat'),
+                        help='Patrón glob de las instancias a cargar')
+    parser.add_argument('--repeats', type=int, default=5, help='Repeticiones por medida (se toma la mejor)')
+    args = parser.parse_args()
+
+    # Compilar el lector por tokens antes de medir
+    cargar_datos(sorted(glob.glob(args.data))[0])
+
+    print(f"{'instancia':<12} {'loadtxt (ms)':>13} {'tokens (ms)':>12} {'1ª caché (ms)':>14} {'caché (ms)':>11} {'tokens/caché':>12}")
+    for ruta in sorted(glob.glob(args.data)):
+        try:
+            t_loadtxt = f"{medir(lambda: cargar_datos_loadtxt(ruta), args.repeats) * 1e3:.2f}"
+        except ValueError:
+            t_loadtxt = 'error'
+        t_texto = medir(lambda: cargar_datos(ruta), args.repeats)
+        directorio_cache = tempfile.mkdtemp()
+        inicio = time.perf_counter()
+        cargar_datos(ruta, cache=directorio_cache)
+        t_primera = time.perf_counter() - inicio
+        t_cache = medir(lambda: cargar_datos(ruta, cache=directorio_cache), args.repeats)
+        shutil.rmtree(directorio_cache)
+        print(f"{os.path.basename(ruta):<12} {t_loadtxt:>13} {t_texto * 1e3:>12.2f} {t_primera * 1e3:>14.2f} "
+              f"{t_cache * 1e3:>11.2f} {t_texto / t_cache:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_cruce.py
+
+"""
+Mide el rendimiento (hijos/s) de cada operador de cruce por lotes del registro (ver
+src.crossover.OPERADORES_CRUCE) para varios tamaños de individuo, con k parejas por lote. Se mide
+el cruce solo, con los puntos de cruce y las máscaras generados de antemano, y la generación
+completa de MotorReproduccion (selección + cruce + mutación) con cada operador.
+
+Uso:
+    python -m benchmarks.bench_cruce --sizes 30 100 256 --pairs 500 --repeats 20
+"""
+
+import argparse
+import time
+import numpy as np
+
+from src.crossover import OPERADORES_CRUCE, funcion_cruce_lote, generar_aleatorios_cruce
+from src.reproduccion import MotorReproduccion
+
+
+def medir_cruce(operador, padres1, padres2, repeticiones, rng):
+    """
+    Devuelve los hijos/s de la función por lotes del operador.
+    """
+    k, n = padres1.shape
+    funcion = funcion_cruce_lote(operador)
+    puntos1, puntos2, mascaras = generar_aleatorios_cruce(operador, k, n, rng)
+    funcion(padres1, padres2, puntos1, puntos2, mascaras)  # Compilación
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(padres1, padres2, puntos1, puntos2, mascaras)
+    return 2 * k * repeticiones / (time.perf_counter() - inicio)
+
+
+def medir_generacion(operador, poblacion, repeticiones, rng):
+    """
+    Devuelve los hijos/s de MotorReproduccion.siguiente_generacion con el operador.
+    """
+    tam, n = poblacion.shape
+    fitness = rng.random(tam)
+    motor = MotorReproduccion(tam, n, 1.0, 0.02, True, rng=rng, operador_cruce=operador)
+    motor.siguiente_generacion(poblacion, fitness)  # Compilación
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        motor.siguiente_generacion(poblacion, fitness)
+    return tam * repeticiones / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los operadores de cruce por lotes.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[30, 100, 256], help='Tamaños de individuo n')
+    parser.add_argument('--pairs', type=int, default=500, help='Parejas por lote (k)')
+    parser.add_argument('--repeats', type=int, default=20, help='Repeticiones de cada medida')
+    parser.add_argument('--operators', type=str, nargs='+', default=list(OPERADORES_CRUCE), help='Operadores a medir')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>5} {'operador':<12} {'cruce (hijos/s)':>16} {'generación (hijos/s)':>21}")
+    for n in args.sizes:
+        padres1 = np.array([rng.permutation(n) for _ in range(args.pairs)])
+        padres2 = np.array([rng.permutation(n) for _ in range(args.pairs)])
+        poblacion = np.concatenate([padres1, padres2])
+        for operador in args.operators:
+            cruce = medir_cruce(operador, padres1, padres2, args.repeats, rng)
+            generacion = medir_generacion(operador, poblacion, args.repeats, rng)
+            print(f"{n:>5} {operador:<12} {cruce:>16.0f} {generacion:>21.0f}")
+
+
+if __name__ == '__main__':
+    main()
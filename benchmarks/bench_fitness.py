@@ -0,0 +1,88 @@
+# benchmarks/bench_fitness.py
+
+"""
+Compara la evaluación de la población original (gather (poblacion, n, n) completo)
+con el evaluador por bloques y el kernel numba de src.fitness sobre las instancias de data/raw.
+
+Uso:
+    python -m benchmarks.bench_fitness --population 100 --repeats 5
+"""
+
+import argparse
+import glob
+import os
+import time
+import numpy as np
+
+from src.fitness import EvaluadorPoblacion, MAX_BYTES_DEFECTO, fitness_pop_numba
+from src.utils import cargar_datos
+
+
+def fitness_pop_completo(population, flow, distances):
+    """
+    Implementación original de fitness_pop, que materializa el array (poblacion, n, n).
+    """
+    return np.sum(flow[np.newaxis, :, :] * distances[population[:, :, np.newaxis], population[:, np.newaxis, :]], axis=(1, 2))
+
+
+def medir(funcion, repeticiones):
+    """
+    Devuelve el mejor tiempo (en segundos) de 'repeticiones' llamadas a 'funcion'.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la evaluación de fitness por bloques')
+    parser.add_argument('--data', type=str, default='data/raw/*.dat',
+                        help='Patrón glob de las instancias a evaluar')
+    parser.add_argument('--population', type=int, default=100,
+                        help='Tamaño de la población evaluada')
+    parser.add_argument('--repeats', type=int, default=5,
+                        help='Repeticiones por medida (se toma la mejor)')
+    parser.add_argument('--max_bytes', type=int, default=MAX_BYTES_DEFECTO,
+                        help='Presupuesto de memoria del evaluador por bloques')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Compilar (o cargar de la caché en disco) el kernel numba antes de medir
+    fitness_pop_numba(np.zeros((1, 2), dtype=np.int64), np.zeros((2, 2), dtype=np.int32),
+                      np.zeros((2, 2), dtype=np.float32), np.empty(1))
+
+    print(f"{'instancia':<12} {'n':>4} {'completo (ms)':>14} {'bloques (ms)':>13} {'numba (ms)':>11} "
+          f"{'temp. completo (MB)':>20} {'temp. bloques (MB)':>19} {'idéntico':>9}")
+    for ruta in sorted(glob.glob(args.data)):
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        try:
+            n, flow, distances = cargar_datos(ruta)
+        except Exception as e:
+            print(f"{nombre:<12} omitida: {e}")
+            continue
+
+        population = np.array([rng.permutation(n) for _ in range(args.population)])
+        evaluador = EvaluadorPoblacion(flow, distances, max_bytes=args.max_bytes)
+        evaluador_numba = EvaluadorPoblacion(flow, distances, backend='numba')
+
+        referencia = fitness_pop_completo(population, flow, distances)
+        identico = np.array_equal(referencia, evaluador.evaluar(population))
+
+        t_completo = medir(lambda: fitness_pop_completo(population, flow, distances), args.repeats)
+        t_bloques = medir(lambda: evaluador.evaluar(population), args.repeats)
+        t_numba = medir(lambda: evaluador_numba.evaluar(population), args.repeats)
+
+        # Memoria temporal: gather + producto (completo) frente a los buffers del evaluador
+        bytes_gather = distances.dtype.itemsize + np.result_type(flow, distances).itemsize
+        mb_completo = args.population * n * n * bytes_gather / 1024 ** 2
+        mb_bloques = (evaluador._indices.nbytes + evaluador._recogidas.nbytes + evaluador._producto.nbytes) / 1024 ** 2
+
+        print(f"{nombre:<12} {n:>4} {t_completo * 1e3:>14.2f} {t_bloques * 1e3:>13.2f} {t_numba * 1e3:>11.2f} "
+              f"{mb_completo:>20.1f} {mb_bloques:>19.1f} {str(identico):>9}")
+
+
+if __name__ == '__main__':
+    main()
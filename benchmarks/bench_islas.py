@@ -0,0 +1,63 @@
+# benchmarks/bench_islas.py
+
+"""
+Mide la aceleración del modelo de islas frente al número de islas K, con la población total fija
+(cada isla evoluciona poblacion/K individuos durante las mismas generaciones) y la eficiencia con el
+tamaño de isla fijo (K veces más trabajo en total; 1.0x es escalado perfecto). Las medidas incluyen
+el arranque de los procesos. Muestra también el mejor coste alcanzado.
+
+Uso:
+    python -m benchmarks.bench_islas --data data/raw/tai100a.dat --islands 1 2 4 8 --population 800
+"""
+
+import argparse
+import logging
+import time
+import numpy as np
+
+from src.island_model import ejecutar_modelo_islas
+from src.utils import cargar_datos
+
+
+def ejecutar(n, flujo, distancias, islas, poblacion, generaciones, variante, semilla):
+    """
+    Ejecuta el modelo de islas y devuelve (segundos, mejor coste).
+    """
+    np.random.seed(semilla)
+    parametros = {'poblacion': poblacion, 'generaciones': generaciones, 'tasa_cruce': 0.8, 'tasa_mutacion': 0.02,
+                  'elitismo': True, 'islas': islas, 'variante_isla': variante, 'intervalo_migracion': 10,
+                  'migrantes': 2, 'tam_poblacion_opt': max(1, poblacion // 10), 'hill_climbing_max_iter': 100}
+    inicio = time.perf_counter()
+    (_, coste), _ = ejecutar_modelo_islas(n, flujo, distancias, parametros)
+    return time.perf_counter() - inicio, coste
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de aceleración del modelo de islas.")
+    parser.add_argument('--data', type=str, default='data/raw/tai100a.dat', help='Instancia a utilizar')
+    parser.add_argument('--islands', type=int, nargs='+', default=[1, 2, 4, 8], help='Números de islas a medir')
+    parser.add_argument('--population', type=int, default=800, help='Población total (se reparte entre las islas)')
+    parser.add_argument('--generations', type=int, default=200, help='Generaciones de cada isla')
+    parser.add_argument('--variant', type=str, default='standard', help='Variante de cada isla')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    n, flujo, distancias = cargar_datos(args.data)
+    print(f"{'islas':>6} {'pobl. fija (s)':>15} {'aceleración':>12} {'coste':>12} "
+          f"{'isla fija (s)':>14} {'eficiencia':>11} {'coste':>12}")
+    base_fija = base_isla = None
+    tam_isla = max(2, args.population // max(args.islands))
+    for k in args.islands:
+        t_fija, c_fija = ejecutar(n, flujo, distancias, k, max(2, args.population // k), args.generations,
+                                  args.variant, args.seed)
+        t_isla, c_isla = ejecutar(n, flujo, distancias, k, tam_isla, args.generations, args.variant, args.seed)
+        # Referencia: la primera medida (normalmente K=1)
+        base_fija = base_fija or t_fija
+        base_isla = base_isla or t_isla
+        print(f"{k:>6} {t_fija:>15.2f} {base_fija / t_fija:>11.2f}x {c_fija:>12.0f} "
+              f"{t_isla:>14.2f} {base_isla / t_isla:>10.2f}x {c_isla:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
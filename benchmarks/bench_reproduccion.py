@@ -0,0 +1,97 @@
+# benchmarks/bench_reproduccion.py
+
+"""
+Mide el tiempo por generación del AG estándar con el bucle original (pareja a pareja con
+seleccion_torneo, cruce_pmx y mutacion_swap) y con MotorReproduccion, para varios tamaños de
+población. Se mide la reproducción sola y la generación completa (reproducción + evaluación).
+
+Uso:
+    python -m benchmarks.bench_reproduccion --data data/raw/tai100a.dat --populations 100 500 1000 5000
+"""
+
+import argparse
+import random
+import time
+import numpy as np
+
+from src.crossover import cruce_pmx
+from src.fitness import EvaluadorPoblacion
+from src.mutation import mutacion_swap
+from src.reproduccion import MotorReproduccion
+from src.selection import seleccion_torneo
+from src.utils import cargar_datos
+
+
+def generacion_legacy(poblacion, fitness, tasa_cruce, tasa_mutacion, elite):
+    """
+    Bucle de reproducción original de ejecutar_algoritmo_genetico.
+    """
+    nueva_poblacion = [elite.copy()]
+    while len(nueva_poblacion) < len(poblacion):
+        padre1 = seleccion_torneo(poblacion, fitness)
+        padre2 = seleccion_torneo(poblacion, fitness)
+        if random.random() < tasa_cruce:
+            hijo1, hijo2 = cruce_pmx(padre1, padre2)
+        else:
+            hijo1, hijo2 = padre1.copy(), padre2.copy()
+        nueva_poblacion.extend([mutacion_swap(hijo1, tasa_mutacion), mutacion_swap(hijo2, tasa_mutacion)])
+    return np.array(nueva_poblacion[:len(poblacion)])
+
+
+def medir_generaciones(siguiente, evaluador, poblacion, generaciones):
+    """
+    Ejecuta 'generaciones' generaciones y devuelve el tiempo medio (s) de reproducción y de generación completa.
+    """
+    fitness = evaluador.evaluar(poblacion)
+    t_reproduccion = t_total = 0.0
+    for _ in range(generaciones):
+        inicio = time.perf_counter()
+        poblacion = siguiente(poblacion, fitness)
+        medio = time.perf_counter()
+        fitness = evaluador.evaluar(poblacion)
+        fin = time.perf_counter()
+        t_reproduccion += medio - inicio
+        t_total += fin - inicio
+    return t_reproduccion / generaciones, t_total / generaciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo por generación del AG estándar.")
+    parser.add_argument('--data', type=str, default='data/raw/tai100a.dat', help='Instancia a utilizar')
+    parser.add_argument('--populations', type=int, nargs='+', default=[100, 500, 1000, 2000, 5000],
+                        help='Tamaños de población a medir')
+    parser.add_argument('--generations', type=int, default=5, help='Generaciones medidas por tamaño')
+    parser.add_argument('--max_legacy', type=int, default=1000,
+                        help='Población máxima con la que se mide el bucle original (es muy lento)')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla')
+    args = parser.parse_args()
+
+    n, flujo, distancias = cargar_datos(args.data)
+    evaluador = EvaluadorPoblacion(flujo, distancias)
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'poblacion':>10} {'legacy repr. (ms)':>18} {'legacy gen. (ms)':>17} {'vect. repr. (ms)':>17} "
+          f"{'vect. gen. (ms)':>16} {'speedup gen.':>13}")
+    for tam in args.populations:
+        poblacion = np.array([rng.permutation(n) for _ in range(tam)])
+
+        motor = MotorReproduccion(tam, n, 0.8, 0.02, True, rng=rng, dtype=poblacion.dtype)
+        # Compilar los kernels antes de medir
+        motor.siguiente_generacion(poblacion, evaluador.evaluar(poblacion))
+        v_repr, v_gen = medir_generaciones(
+            lambda p, f: motor.siguiente_generacion(p, f, elite=p[np.argmin(f)].copy()), evaluador, poblacion,
+            args.generations)
+
+        if tam <= args.max_legacy:
+            l_repr, l_gen = medir_generaciones(
+                lambda p, f: generacion_legacy(p, f, 0.8, 0.02, p[np.argmin(f)]), evaluador, poblacion, args.generations)
+            print(f"{tam:>10} {l_repr * 1e3:>18.2f} {l_gen * 1e3:>17.2f} {v_repr * 1e3:>17.2f} {v_gen * 1e3:>16.2f} "
+                  f"{l_gen / v_gen:>12.1f}x")
+        else:
+            print(f"{tam:>10} {'-':>18} {'-':>17} {v_repr * 1e3:>17.2f} {v_gen * 1e3:>16.2f} {'-':>13}")
+
+
+if __name__ == '__main__':
+    main()
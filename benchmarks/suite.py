@@ -0,0 +1,321 @@
+# benchmarks/suite.py
+
+"""
+Suite de benchmarks reproducible: ejecuta variantes de src.main sobre instancias de data/raw con
+semillas fijas, cada ejecución en su propio proceso con --profile (ver src.instrumentation), y
+registra por ejecución el coste final y su desviación respecto a la mejor solución conocida
+(benchmarks/mejores_conocidos.csv), el tiempo hasta alcanzar el objetivo, las evaluaciones/s, los
+movimientos de búsqueda local/s y el pico de memoria residente (RSS). Los resultados se guardan
+en CSV y JSON; el modo 'compare' compara dos archivos de resultados y termina con código 1 si el
+rendimiento empeora más de la tolerancia, para usarlo como control antes de aceptar un cambio.
+
+Uso:
+    python -m benchmarks.suite run --variants standard lamarckian --instances nug12 nug30 tai60a --seeds 0 1 2 \\
+        --output results/bench/base --extra "--generations 200"
+    python -m benchmarks.suite compare results/bench/base.json results/bench/nuevo.json --tolerance 5
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import time
+import numpy as np
+
+from src.utils import DIRECTORIO_DATOS_DEFECTO, resolver_instancias
+
+# Tabla de mejores soluciones conocidas (QAPLIB) de las instancias de data/raw
+RUTA_MEJORES_CONOCIDOS = os.path.join(os.path.dirname(__file__), 'mejores_conocidos.csv')
+
+# Instancias por defecto: una muestra de tamaños y familias que se ejecuta en pocos minutos
+INSTANCIAS_DEFECTO = ('nug12', 'chr20a', 'bur26a', 'nug30', 'lipa50a', 'tai60a')
+
+# Columnas de los resultados, en orden
+COLUMNAS = ('variante', 'instancia', 'n', 'semilla', 'estado', 'coste', 'mejor_conocido', 'desviacion',
+            'objetivo', 'tiempo_objetivo', 'segundos', 'evaluaciones', 'evaluaciones_por_segundo',
+            'movimientos_busqueda_local', 'movimientos_por_segundo', 'rss_pico_mb', 'motivo_parada')
+
+# Columnas de COLUMNAS que no son numéricas (el resto se convierte a float al leer un CSV)
+COLUMNAS_TEXTO = ('variante', 'instancia', 'estado', 'motivo_parada')
+
+# Métricas que se comparan en el modo 'compare': (columna, True si mayor es mejor)
+METRICAS_COMPARACION = (
+    ('evaluaciones_por_segundo', True),
+    ('movimientos_por_segundo', True),
+    ('segundos', False),
+    ('tiempo_objetivo', False),
+    ('desviacion', False),
+    ('rss_pico_mb', False),
+)
+
+# Fases en las que se ejecutan los movimientos de búsqueda local (o de recocido)
+_FASES_MOVIMIENTOS = ('busqueda_local', 'recocido')
+
+
+def cargar_mejores_conocidos(ruta=RUTA_MEJORES_CONOCIDOS):
+    """
+    Lee la tabla de mejores soluciones conocidas.
+
+    Returns:
+        dict: Nombre de la instancia -> coste.
+    """
+    with open(ruta, encoding='utf-8') as f:
+        return {fila['instancia']: float(fila['coste']) for fila in csv.DictReader(f)}
+
+
+def tiempo_hasta_objetivo(generaciones, objetivo):
+    """
+    Devuelve el instante (s desde el inicio) de la primera generación cuyo mejor coste alcanza el
+    objetivo, o None si no se alcanza.
+
+    Args:
+        generaciones (list): Registros por generación de perfil.json (con 'instante' y 'mejor_coste').
+        objetivo (float): Coste objetivo.
+    """
+    for registro in generaciones:
+        if registro.get('mejor_coste', np.inf) <= objetivo:
+            return registro['instante']
+    return None
+
+
+def _ejecutar_proceso(comando):
+    """
+    Ejecuta 'comando' y devuelve (código de salida, pico de RSS en MiB o None, segundos).
+    El pico de RSS es el del propio proceso hijo (os.wait4), no disponible en Windows.
+    """
+    inicio = time.perf_counter()
+    with open(os.devnull, 'w') as nulo:
+        proceso = subprocess.Popen(comando, stdout=nulo, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            _, estado, uso = os.wait4(proceso.pid, 0)
+            proceso.returncode = os.waitstatus_to_exitcode(estado)
+            # ru_maxrss está en KiB en Linux y en bytes en macOS
+            rss = uso.ru_maxrss / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+        else:
+            proceso.wait()
+            rss = None
+    return proceso.returncode, rss, time.perf_counter() - inicio
+
+
+def ejecutar_caso(variante, ruta, semilla, directorio, extra, mejores_conocidos, desviacion_objetivo):
+    """
+    Ejecuta una variante sobre una instancia con una semilla y devuelve la fila de resultados.
+    """
+    instancia = os.path.splitext(os.path.basename(ruta))[0]
+    salida = os.path.join(directorio, variante, instancia, f"semilla_{semilla}")
+    comando = [sys.executable, '-m', 'src.main', '--variant', variante, '--data', ruta, '--output', salida,
+               '--seed', str(semilla), '--profile'] + extra
+    codigo, rss, duracion = _ejecutar_proceso(comando)
+
+    mejor_conocido = mejores_conocidos.get(instancia)
+    fila = dict.fromkeys(COLUMNAS)
+    fila.update(variante=variante, instancia=instancia, semilla=semilla, mejor_conocido=mejor_conocido,
+                segundos=duracion, rss_pico_mb=rss)
+    ruta_perfil = os.path.join(salida, 'perfil.json')
+    if codigo != 0 or not os.path.exists(ruta_perfil):
+        fila['estado'] = f"error ({codigo}), ver {os.path.join(salida, 'ejecucion.log')}"
+        return fila
+    with open(ruta_perfil, encoding='utf-8') as f:
+        perfil = json.load(f)
+
+    contadores = perfil.get('contadores', {})
+    fases = perfil.get('fases', {})
+    coste = perfil['mejor_coste']
+    evaluaciones = contadores.get('evaluaciones', 0)
+    movimientos = contadores.get('iteraciones_busqueda_local', 0) + contadores.get('movimientos_propuestos', 0)
+    tiempo_movimientos = sum(fases.get(fase, {}).get('segundos', 0.0) for fase in _FASES_MOVIMIENTOS)
+    fila.update(
+        estado='ok', coste=coste, segundos=perfil['segundos_totales'],
+        evaluaciones=evaluaciones,
+        evaluaciones_por_segundo=evaluaciones / perfil['segundos_totales'] if evaluaciones else None,
+        movimientos_busqueda_local=movimientos,
+        movimientos_por_segundo=movimientos / tiempo_movimientos if movimientos and tiempo_movimientos else None,
+        n=perfil.get('n'), motivo_parada=perfil.get('motivo_parada'),
+    )
+    if mejor_conocido is not None:
+        fila['desviacion'] = 100 * (coste - mejor_conocido) / mejor_conocido
+        fila['objetivo'] = mejor_conocido * (1 + desviacion_objetivo / 100)
+        fila['tiempo_objetivo'] = tiempo_hasta_objetivo(perfil.get('generaciones', []), fila['objetivo'])
+        if coste < mejor_conocido:
+            fila['estado'] = 'ok (mejora la mejor solución conocida)'
+    return fila
+
+
+def guardar_resultados(filas, ruta_base, metadatos):
+    """
+    Guarda las filas en '<ruta_base>.csv' y, junto a los metadatos de la ejecución, en '<ruta_base>.json'.
+    """
+    directorio = os.path.dirname(ruta_base)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(f"{ruta_base}.csv", 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS)
+        escritor.writeheader()
+        escritor.writerows(filas)
+    with open(f"{ruta_base}.json", 'w', encoding='utf-8') as f:
+        json.dump({'metadatos': metadatos, 'resultados': filas}, f, indent=4)
+
+
+def cargar_resultados(ruta):
+    """
+    Lee un archivo de resultados en CSV o JSON y devuelve sus filas.
+    """
+    if ruta.endswith('.json'):
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)['resultados']
+    with open(ruta, newline='', encoding='utf-8') as f:
+        filas = list(csv.DictReader(f))
+    for fila in filas:
+        for columna, valor in fila.items():
+            if columna not in COLUMNAS or columna in COLUMNAS_TEXTO:
+                continue
+            fila[columna] = float(valor) if valor not in ('', None) else None
+    return filas
+
+
+def _medias(filas):
+    """
+    Agrupa las filas correctas por (variante, instancia) y promedia cada métrica sobre las semillas.
+    """
+    grupos = {}
+    for fila in filas:
+        if str(fila['estado']).startswith('ok'):
+            grupos.setdefault((fila['variante'], fila['instancia']), []).append(fila)
+    medias = {}
+    for clave, grupo in grupos.items():
+        medias[clave] = {}
+        for metrica, _ in METRICAS_COMPARACION:
+            valores = [fila[metrica] for fila in grupo if fila[metrica] is not None]
+            # Sin objetivo alcanzado en alguna semilla, el tiempo hasta el objetivo no es comparable
+            if metrica == 'tiempo_objetivo' and len(valores) < len(grupo):
+                valores = []
+            medias[clave][metrica] = float(np.mean(valores)) if valores else None
+    return medias
+
+
+def comparar(base, nuevo, tolerancia=5.0):
+    """
+    Compara dos conjuntos de resultados, promediados por (variante, instancia).
+
+    Args:
+        base (list): Filas de referencia.
+        nuevo (list): Filas a comparar.
+        tolerancia (float, optional): Empeoramiento relativo (%) admitido en las métricas de rendimiento.
+
+    Returns:
+        tuple: (filas de la comparación, lista de regresiones (variante, instancia, métrica, cambio %))
+    """
+    medias_base, medias_nuevo = _medias(base), _medias(nuevo)
+    comparacion, regresiones = [], []
+    for clave in sorted(set(medias_base) & set(medias_nuevo)):
+        for metrica, mayor_mejor in METRICAS_COMPARACION:
+            antes, despues = medias_base[clave][metrica], medias_nuevo[clave][metrica]
+            if antes is None or despues is None:
+                continue
+            if metrica == 'desviacion':
+                # Ya es un porcentaje: se compara en puntos
+                cambio = despues - antes
+            else:
+                cambio = 100 * (despues - antes) / antes if antes else 0.0
+            empeora = -cambio if mayor_mejor else cambio
+            comparacion.append((*clave, metrica, antes, despues, cambio))
+            if metrica != 'desviacion' and empeora > tolerancia:
+                regresiones.append((*clave, metrica, cambio))
+    return comparacion, regresiones
+
+
+def _comando_run(args):
+    mejores_conocidos = cargar_mejores_conocidos()
+    rutas = resolver_instancias(args.instances, args.data_dir)
+    extra = shlex.split(args.extra)
+    directorio = args.runs_dir or f"{args.output}_ejecuciones"
+    metadatos = {
+        'variantes': args.variants, 'instancias': [os.path.basename(r) for r in rutas], 'semillas': args.seeds,
+        'extra': args.extra, 'desviacion_objetivo': args.target_gap, 'python': platform.python_version(),
+        'numpy': np.__version__, 'plataforma': platform.platform(), 'cpus': os.cpu_count(),
+        'commit': _commit_actual(), 'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+    filas = []
+    print(f"{'variante':<11} {'instancia':<9} {'semilla':>7} {'coste':>13} {'desv. (%)':>9} {'t. obj. (s)':>11} "
+          f"{'total (s)':>9} {'eval/s':>10} {'mov/s':>11} {'RSS (MiB)':>9}")
+    for variante in args.variants:
+        for ruta in rutas:
+            for semilla in args.seeds:
+                fila = ejecutar_caso(variante, ruta, semilla, directorio, extra, mejores_conocidos, args.target_gap)
+                filas.append(fila)
+                print(f"{variante:<11} {fila['instancia']:<9} {semilla:>7} {_formato(fila['coste'], '.0f'):>13} "
+                      f"{_formato(fila['desviacion'], '.3f'):>9} {_formato(fila['tiempo_objetivo'], '.2f'):>11} "
+                      f"{_formato(fila['segundos'], '.2f'):>9} {_formato(fila['evaluaciones_por_segundo'], '.0f'):>10} "
+                      f"{_formato(fila['movimientos_por_segundo'], '.0f'):>11} {_formato(fila['rss_pico_mb'], '.1f'):>9}"
+                      + ('' if fila['estado'] == 'ok' else f"  {fila['estado']}"))
+                # Se guarda tras cada ejecución para no perder resultados si se interrumpe
+                guardar_resultados(filas, args.output, metadatos)
+    print(f"Resultados guardados en {args.output}.csv y {args.output}.json")
+
+
+def _comando_compare(args):
+    comparacion, regresiones = comparar(cargar_resultados(args.base), cargar_resultados(args.new), args.tolerance)
+    print(f"{'variante':<11} {'instancia':<9} {'métrica':<25} {'base':>14} {'nuevo':>14} {'cambio':>9}")
+    for variante, instancia, metrica, antes, despues, cambio in comparacion:
+        unidad = ' pp' if metrica == 'desviacion' else ' %'
+        print(f"{variante:<11} {instancia:<9} {metrica:<25} {antes:>14.4g} {despues:>14.4g} {cambio:>+7.2f}{unidad}")
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones por encima de la tolerancia ({args.tolerance} %):")
+        for variante, instancia, metrica, cambio in regresiones:
+            print(f"  {variante} {instancia} {metrica}: {cambio:+.2f} %")
+        sys.exit(1)
+    print(f"\nSin regresiones por encima de la tolerancia ({args.tolerance} %).")
+
+
+def _commit_actual():
+    """
+    Devuelve el commit de git actual, o None si no está disponible.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _formato(valor, especificacion):
+    return '-' if valor is None else format(valor, especificacion)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks reproducible de las variantes del QAP.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    run = subparsers.add_parser('run', help='Ejecuta la suite y guarda los resultados en CSV y JSON')
+    run.add_argument('--variants', type=str, nargs='+', default=['standard'], help='Variantes de src.main a ejecutar')
+    run.add_argument('--instances', type=str, nargs='+', default=list(INSTANCIAS_DEFECTO),
+                     help="Instancias de data/raw: nombres, patrones ('tai*') o 'all'")
+    run.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2], help='Semillas de cada caso')
+    run.add_argument('--extra', type=str, default='',
+                     help="Argumentos adicionales de src.main (p. ej. \"--generations 200 --population 50\")")
+    run.add_argument('--target_gap', type=float, default=1.0,
+                     help='Desviación (%%) respecto a la mejor solución conocida que define el objetivo')
+    run.add_argument('--output', type=str, default=os.path.join('results', 'bench', 'resultados'),
+                     help='Ruta sin extensión de los archivos de resultados')
+    run.add_argument('--runs_dir', type=str, default=None,
+                     help='Directorio de las salidas de cada ejecución (por defecto, <output>_ejecuciones)')
+    run.add_argument('--data_dir', type=str, default=DIRECTORIO_DATOS_DEFECTO, help='Directorio de las instancias')
+    run.set_defaults(funcion=_comando_run)
+
+    compare = subparsers.add_parser('compare', help='Compara dos archivos de resultados (CSV o JSON)')
+    compare.add_argument('base', type=str, help='Resultados de referencia')
+    compare.add_argument('new', type=str, help='Resultados a comparar')
+    compare.add_argument('--tolerance', type=float, default=5.0,
+                         help='Empeoramiento relativo (%%) admitido antes de considerarlo una regresión')
+    compare.set_defaults(funcion=_comando_compare)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == '__main__':
+    main()
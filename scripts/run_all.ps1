@@ -1,7 +1,7 @@
 # scripts/run_all.ps1
 
 # Descripción:
-# Ejecuta todas las variantes del Algoritmo Genético secuencialmente.
+# Ejecuta todas las variantes del Algoritmo Genético en paralelo con src/experiments.py.
 # Incluye pasos de formateo y verificación de estilo de código antes de la ejecución.
 
 function Handle-Error {
@@ -54,14 +54,11 @@ try {
     Handle-Error "Verificación de estilo con Flake8 falló."
 }
 
-# Ejecutar todas las variantes
-foreach ($variant in $Variants) {
-    Write-Host "Ejecutando Variante $variant del Algoritmo Genético..."
-    try {
-        & ".\scripts\run_${variant}_ga.ps1"
-    } catch {
-        Handle-Error "Ejecución de la Variante $variant falló."
-    }
+# Ejecutar todas las variantes en paralelo con el ejecutor de experimentos (rejilla en scripts/experimentos.json)
+Write-Host "Ejecutando las variantes del Algoritmo Genético..."
+python -m src.experiments scripts/experimentos.json @args
+if ($LASTEXITCODE -ne 0) {
+    Handle-Error "Ejecución de las variantes falló. Ver results/experimentos/resultados.csv"
 }
 
 Write-Host "===== Todas las variantes del Algoritmo Genético han sido ejecutadas correctamente ====="
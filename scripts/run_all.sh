@@ -3,39 +3,22 @@
 # scripts/run_all.sh
 
 # Descripción:
-# Ejecuta todas las variantes del Algoritmo Genético secuencialmente.
-# Primero ejecuta el Algoritmo Genético Estándar, luego la Variante Baldwiniana y finalmente la Variante Lamarckiana.
-# Los resultados se guardarán en los respectivos directorios dentro de results/
+# Ejecuta todas las variantes del Algoritmo Genético en paralelo con el ejecutor de experimentos
+# (src/experiments.py), según la rejilla declarativa de scripts/experimentos.json.
+# Los trabajos ya terminados se saltan al relanzar el script; los resultados de cada trabajo se guardan
+# en results/experimentos/<variante>/<instancia>/... y la tabla con todos en results/experimentos/resultados.csv
+# Los argumentos adicionales se pasan al ejecutor (p. ej. --jobs 4 o --dry_run).
 
 # Activar entorno virtual si lo estás utilizando
 # source ../venv/bin/activate
 
 echo "Iniciando ejecución de todas las variantes del Algoritmo Genético..."
 
-# Ejecutar Algoritmo Genético Estándar
-bash scripts/run_standard_ga.sh
+python -m src.experiments scripts/experimentos.json "$@"
 
-# Verificar si el anterior script finalizó correctamente
+# Verificar si el ejecutor finalizó correctamente
 if [ $? -ne 0 ]; then
-    echo "Error al ejecutar el Algoritmo Genético Estándar. Abortando ejecución."
-    exit 1
-fi
-
-# Ejecutar Variante Baldwiniana
-bash scripts/run_baldwinian_ga.sh
-
-# Verificar si el anterior script finalizó correctamente
-if [ $? -ne 0 ]; then
-    echo "Error al ejecutar la Variante Baldwiniana. Abortando ejecución."
-    exit 1
-fi
-
-# Ejecutar Variante Lamarckiana
-bash scripts/run_lamarckian_ga.sh
-
-# Verificar si el anterior script finalizó correctamente
-if [ $? -ne 0 ]; then
-    echo "Error al ejecutar la Variante Lamarckiana. Abortando ejecución."
+    echo "Error al ejecutar las variantes del Algoritmo Genético. Ver results/experimentos/resultados.csv"
     exit 1
 fi
 
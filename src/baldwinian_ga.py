@@ -1,10 +1,14 @@
 import numpy as np
 import random
-from src.fitness import fitness_pop
-from src.selection import seleccion_torneo
-from src.crossover import cruce_pmx
-from src.mutation import mutacion_swap
-from src.optimization import optimizar_individuo_busqueda_local, generar_poblacion
+from src.cache import (CacheFitness, MemoBusquedaLocal, TAM_CACHE_FITNESS_DEFECTO, TAM_MEMO_BUSQUEDA_LOCAL_DEFECTO,
+                       MAX_BYTES_MEMO_DEFECTO)
+from src.fitness import EvaluadorPoblacion
+from src.selection import seleccionar_indices
+from src.crossover import cruzar
+from src.mutation import mutar_poblacion
+from src.instrumentation import obtener_instrumentacion
+from src.termination import contar_evaluaciones, obtener_control_parada
+from src.optimization import optimizar_poblacion, crear_ejecutor_busqueda_local, generar_poblacion
 
 def ejecutar_varianta_baldwiniana(n, flujo_matrix, distancia_matrix, parametros=None):
     """
@@ -26,61 +30,137 @@ def ejecutar_varianta_baldwiniana(n, flujo_matrix, distancia_matrix, parametros=
             'tasa_cruce': 0.8,
             'tasa_mutacion': 0.02,
             'elitismo': True,
-            'tam_poblacion_opt': 50  # Tamaño de la población a optimizar
+            'tam_poblacion_opt': 50,  # Tamaño de la población a optimizar
+            'hill_climbing_max_iter': 1000
         }
 
+    # Vista dispersa de los flujos (None si la matriz es densa), ver src.utils.cargar_datos
+    flujo_disperso = parametros.get('flujo_disperso')
+    # Criterios de parada además de las generaciones (src.termination); el reloj cuenta desde aquí
+    control = obtener_control_parada(parametros)
+    # Sin progreso por la salida estándar (p. ej. en las islas y los trabajos de src.experiments)
+    mostrar_progreso = parametros.get('mostrar_progreso', True)
+    control.iniciar()
+
+    # Opciones de la búsqueda local por lotes (ver optimizar_poblacion)
+    backend_busqueda_local = parametros.get('backend_busqueda_local', 'secuencial')
+    opciones_busqueda_local = {
+        'max_iter': parametros['hill_climbing_max_iter'],
+        'flujo_disperso': flujo_disperso,
+        'motor': parametros.get('motor_busqueda_local', 'mascara'),
+        'estrategia': parametros.get('estrategia_busqueda_local', 'primera'),
+        'backend': backend_busqueda_local,
+        # Resultados de la búsqueda local de generaciones anteriores (permutación -> óptimo local y coste)
+        'memo': MemoBusquedaLocal(parametros.get('tam_memo_busqueda_local', TAM_MEMO_BUSQUEDA_LOCAL_DEFECTO),
+                                  parametros.get('max_bytes_memo', MAX_BYTES_MEMO_DEFECTO))
+    }
+
     # Inicializar población
-    print("Generando población inicial...")
-    poblacion = generar_poblacion(parametros['poblacion'], n, seed=196917)
+    if mostrar_progreso:
+        print("Generando población inicial...")
+    poblacion = generar_poblacion(parametros['poblacion'], n, seed=parametros.get('semilla_poblacion', 196917))
 
     # Verificar la validez de la población
-    print("Verificando la validez de la población inicial...")
+    if mostrar_progreso:
+        print("Verificando la validez de la población inicial...")
     for idx, ind in enumerate(poblacion):
         assert set(ind) == set(range(n)), f"El individuo {idx} no es una permutación válida."
 
+    # El ejecutor de la búsqueda local (procesos o hilos) se crea una vez y se reutiliza en todas las generaciones
+    with crear_ejecutor_busqueda_local(backend_busqueda_local, flujo_matrix, distancia_matrix, flujo_disperso,
+                                       parametros.get('trabajadores'), parametros.get('instancia_compartida')) as ejecutor:
+        return _evolucionar(n, flujo_matrix, distancia_matrix, parametros, poblacion, ejecutor, opciones_busqueda_local,
+                            control)
+
+def _evolucionar(n, flujo_matrix, distancia_matrix, parametros, poblacion, ejecutor, opciones_busqueda_local, control):
+    """
+    Bucle generacional de la variante Baldwiniana.
+
+    Args:
+        n (int): Número de instalaciones/localizaciones.
+        flujo_matrix (numpy.ndarray): Matriz de flujos.
+        distancia_matrix (numpy.ndarray): Matriz de distancias.
+        parametros (dict): Parámetros del Algoritmo Genético y Búsqueda Local.
+        poblacion (numpy.ndarray): Población inicial.
+        ejecutor (Executor o None): Ejecutor de la búsqueda local por lotes.
+        opciones_busqueda_local (dict): Argumentos de optimizar_poblacion.
+        control (ControlParada): Criterios de parada.
+
+    Returns:
+        tuple: Mejor solución encontrada y su historial de fitness.
+    """
+    flujo_disperso = opciones_busqueda_local['flujo_disperso']
+    # Tiempos por fase y contadores (src.instrumentation); sin coste si no se pide
+    instrumentacion = obtener_instrumentacion(parametros)
+    mostrar_progreso = parametros.get('mostrar_progreso', True)
+
     # Aplicar optimización local a una parte de la población inicial
-    print("Aplicando búsqueda local a la población inicial...")
+    if mostrar_progreso:
+        print("Aplicando búsqueda local a la población inicial...")
     indices_opt = np.random.choice(len(poblacion), parametros['tam_poblacion_opt'], replace=False)
-    for idx in indices_opt:
-        poblacion[idx], _ = optimizar_individuo_busqueda_local(
-            poblacion[idx], flujo_matrix, distancia_matrix
-        )
-
-    fitness = fitness_pop(poblacion, flujo_matrix, distancia_matrix)
+    contadores_busqueda_local = {}
+    poblacion[indices_opt], _ = optimizar_poblacion(
+        poblacion, flujo_matrix, distancia_matrix, indices=indices_opt, ejecutor=ejecutor,
+        contadores=contadores_busqueda_local, **opciones_busqueda_local
+    )
+
+    # Evaluador por bloques: reutiliza sus buffers temporales en todas las generaciones.
+    # La caché de fitness evita reevaluar los individuos ya vistos (p. ej. copias sin mutar de los padres)
+    evaluador = CacheFitness(
+        EvaluadorPoblacion(flujo_matrix, distancia_matrix, backend=parametros.get('backend_fitness', 'auto'),
+                           flujo_disperso=flujo_disperso),
+        parametros.get('tam_cache_fitness', TAM_CACHE_FITNESS_DEFECTO)
+    )
+    contadores_evaluacion = {}
+    fitness = evaluador.evaluar(poblacion, contadores=contadores_evaluacion)
 
     # Inicializar historial y encontrar la mejor solución inicial
     historial = []
     mejor_idx = np.argmin(fitness)
     mejor_solucion = (poblacion[mejor_idx], fitness[mejor_idx])
     historial.append(mejor_solucion[1])
-
-    print(f"Generación 0: Mejor fitness = {mejor_solucion[1]}")
+    control.registrar(mejor_solucion[1], contar_evaluaciones(contadores_evaluacion, contadores_busqueda_local),
+                      poblacion)
+
+    if mostrar_progreso:
+        print(f"Generación 0: Mejor fitness = {mejor_solucion[1]}")
+
+    # Selección por lotes: los padres de cada generación se eligen con una sola llamada
+    rng = np.random.default_rng(np.random.randint(2**31 - 1))
+    opciones_seleccion = {
+        'metodo': parametros.get('seleccion', 'torneo'),
+        'k': parametros.get('k_torneo', 3),
+        'presion': parametros.get('presion_ranking', 1.5),
+        'rng': rng
+    }
+    operador_cruce = parametros.get('cruce', 'pmx')
+    parejas = (parametros['poblacion'] - (1 if parametros['elitismo'] else 0) + 1) // 2
+    migracion = parametros.get('migracion')
 
     for gen in range(parametros['generaciones']):
+        if control.detenido:
+            break
         nueva_poblacion = []
+        # Búsquedas, iteraciones y movimientos aceptados de la búsqueda local en esta generación
+        contadores_busqueda_local = {}
 
         # Elitismo: mantener el mejor individuo
         if parametros['elitismo']:
             nueva_poblacion.append(poblacion[mejor_idx].copy())
 
-        while len(nueva_poblacion) < parametros['poblacion']:
-            # Selección
-            padre1 = seleccion_torneo(poblacion, fitness)
-            padre2 = seleccion_torneo(poblacion, fitness)
+        # Selección
+        with instrumentacion.fase('seleccion'):
+            padres = seleccionar_indices(fitness, 2 * parejas, **opciones_seleccion).reshape(parejas, 2)
 
-            # Cruce
-            if random.random() < parametros['tasa_cruce']:
-                hijo1, hijo2 = cruce_pmx(padre1, padre2)
-            else:
-                hijo1, hijo2 = padre1.copy(), padre2.copy()
-
-            # Mutación
-            hijo1 = mutacion_swap(hijo1, parametros['tasa_mutacion'])
-            hijo2 = mutacion_swap(hijo2, parametros['tasa_mutacion'])
+        for idx_padre1, idx_padre2 in padres:
+            padre1, padre2 = poblacion[idx_padre1], poblacion[idx_padre2]
 
-            # Verificar que los hijos son permutaciones válidas
-            assert set(hijo1) == set(range(n)), "Hijo1 no es una permutación válida después de mutación."
-            assert set(hijo2) == set(range(n)), "Hijo2 no es una permutación válida después de mutación."
+            # Cruce
+            with instrumentacion.fase('cruce'):
+                if random.random() < parametros['tasa_cruce']:
+                    hijo1, hijo2 = cruzar(padre1, padre2, operador_cruce, rng)
+                else:
+                    hijo1, hijo2 = padre1.copy(), padre2.copy()
 
             # Añadir los hijos sin optimizar (genomas originales)
             nueva_poblacion.extend([hijo1, hijo2])
@@ -88,18 +168,34 @@ def ejecutar_varianta_baldwiniana(n, flujo_matrix, distancia_matrix, parametros=
         # Convertir a array de NumPy y truncar si es necesario
         poblacion = np.array(nueva_poblacion[:parametros['poblacion']])
 
+        # Mutación por lotes de los hijos, in situ (la élite no muta)
+        with instrumentacion.fase('mutacion'):
+            mutar_poblacion(poblacion[1 if parametros['elitismo'] else 0:], parametros['tasa_mutacion'],
+                            parametros.get('mutacion', 'swap'), rng)
+
         # Verificar la validez de la nueva población
         for idx, ind in enumerate(poblacion):
             assert set(ind) == set(range(n)), f"El individuo {idx} no es una permutación válida."
 
         # Aplicar optimización local a una parte de la nueva población
         indices_opt = np.random.choice(len(poblacion), parametros['tam_poblacion_opt'], replace=False)
-        for idx in indices_opt:
-            poblacion[idx], _ = optimizar_individuo_busqueda_local(
-                poblacion[idx], flujo_matrix, distancia_matrix
+        with instrumentacion.fase('busqueda_local'):
+            poblacion[indices_opt], _ = optimizar_poblacion(
+                poblacion, flujo_matrix, distancia_matrix, indices=indices_opt, ejecutor=ejecutor,
+                contadores=contadores_busqueda_local, **opciones_busqueda_local
             )
 
-        fitness = fitness_pop(poblacion, flujo_matrix, distancia_matrix)
+        # Evaluaciones completas, incrementales y aciertos de la caché de esta generación
+        contadores_evaluacion = {}
+        with instrumentacion.fase('evaluacion'):
+            fitness = evaluador.evaluar(poblacion, contadores=contadores_evaluacion)
+        instrumentacion.sumar_contadores(contadores_evaluacion)
+        instrumentacion.sumar_contadores(contadores_busqueda_local)
+
+        # Migración del modelo de islas (src.island_model): sustituye individuos por inmigrantes, in situ
+        if migracion is not None:
+            with instrumentacion.fase('migracion'):
+                migracion(gen, poblacion, fitness)
 
         # Actualizar el mejor individuo
         mejor_idx = np.argmin(fitness)
@@ -108,9 +204,15 @@ def ejecutar_varianta_baldwiniana(n, flujo_matrix, distancia_matrix, parametros=
 
         if mejor_gen[1] < mejor_solucion[1]:
             mejor_solucion = mejor_gen
+        instrumentacion.cerrar_generacion(gen, mejor_solucion[1])
+        control.registrar(mejor_solucion[1], contar_evaluaciones(contadores_evaluacion, contadores_busqueda_local),
+                          poblacion)
 
         # Imprimir progreso cada 100 generaciones y al inicio
-        if (gen + 1) % 100 == 0 or gen == 0:
+        if mostrar_progreso and ((gen + 1) % 100 == 0 or gen == 0):
             print(f"Generación {gen + 1}: Mejor fitness = {mejor_solucion[1]}")
 
+    control.finalizar()
+    evaluador.registrar_estadisticas()
+    opciones_busqueda_local['memo'].registrar_estadisticas()
     return mejor_solucion, historial
\ No newline at end of file
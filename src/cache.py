@@ -0,0 +1,268 @@
+# src/cache.py
+
+import logging
+import numpy as np
+from collections import OrderedDict
+from src.fitness import fitness_incremental_lote
+
+# Número de entradas por defecto de la caché de fitness (0 la desactiva)
+TAM_CACHE_FITNESS_DEFECTO = 50000
+
+# Entradas y memoria por defecto de la memoria de resultados de la búsqueda local
+TAM_MEMO_BUSQUEDA_LOCAL_DEFECTO = 20000
+MAX_BYTES_MEMO_DEFECTO = 64 * 1024 ** 2
+
+# Bytes estimados por entrada de una tabla además de la clave y el valor (diccionario, tupla, objetos)
+_SOBRECARGA_ENTRADA = 200
+
+# Fracción máxima de posiciones cambiadas respecto al padre para calcular el fitness de forma incremental
+FRACCION_INCREMENTAL_DEFECTO = 0.5
+
+
+def claves_permutaciones(poblacion):
+    """
+    Devuelve la clave de caché de cada individuo: los bytes de la permutación en int16 (o int32 si
+    n no cabe en int16), que identifican la permutación sin ambigüedad y se calculan sin hashing en Python.
+
+    Args:
+        poblacion (numpy.ndarray): Población, shape=(poblacion, n).
+
+    Returns:
+        list: Clave (bytes) de cada individuo.
+    """
+    poblacion = np.asarray(poblacion)
+    dtype = np.int16 if poblacion.shape[1] <= np.iinfo(np.int16).max else np.int32
+    compacta = np.ascontiguousarray(poblacion, dtype=dtype)
+    return [fila.tobytes() for fila in compacta]
+
+
+class CacheLRU:
+    """
+    Tabla acotada con expulsión LRU (la entrada usada menos recientemente sale primero) y contadores
+    de aciertos y fallos.
+
+    Args:
+        capacidad (int): Número máximo de entradas. Con 0 la caché no guarda nada.
+        max_bytes (int, optional): Límite de memoria aproximado, según el tamaño declarado de cada entrada.
+    """
+
+    def __init__(self, capacidad, max_bytes=None):
+        self.capacidad = capacidad
+        self.max_bytes = max_bytes
+        self._tabla = OrderedDict()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._tabla)
+
+    def __contains__(self, clave):
+        return clave in self._tabla
+
+    def obtener(self, clave, defecto=None):
+        """
+        Devuelve el valor de la clave (marcándola como usada) o 'defecto' si no está, y actualiza los contadores.
+        """
+        entrada = self._tabla.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return defecto
+        self._tabla.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+
+    def guardar(self, clave, valor, tam=0):
+        """
+        Guarda un valor, expulsando las entradas menos usadas si se supera la capacidad o la memoria.
+
+        Args:
+            clave (hashable): Clave de la entrada.
+            valor (object): Valor a guardar.
+            tam (int, optional): Bytes aproximados que ocupa la entrada (para max_bytes).
+        """
+        if self.capacidad <= 0:
+            return
+        anterior = self._tabla.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= anterior[1]
+        self._tabla[clave] = (valor, tam)
+        self.bytes += tam
+        while self._tabla and (len(self._tabla) > self.capacidad or
+                               (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self.bytes -= self._tabla.popitem(last=False)[1][1]
+
+    @property
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def resumen(self, nombre):
+        """
+        Devuelve una línea con el estado de la caché para el log.
+        """
+        return (f"{nombre}: {self.aciertos} aciertos, {self.fallos} fallos "
+                f"(tasa de aciertos {self.tasa_aciertos:.1%}), {len(self)}/{self.capacidad} entradas, "
+                f"{self.bytes / 1024 ** 2:.1f} MiB")
+
+
+class CacheFitness:
+    """
+    Evaluador con caché: envuelve un EvaluadorPoblacion y solo le pasa los individuos cuya
+    permutación no está en la caché LRU. Los individuos repetidos dentro de la misma población se
+    evalúan una sola vez.
+
+    Si se indica el padre de referencia de cada individuo (ver MotorReproduccion.referencias), los
+    fallos que difieren de su padre en pocas posiciones se calculan de forma incremental a partir del
+    fitness del padre (fitness_incremental_lote) y solo el resto se evalúa completo.
+
+    Args:
+        evaluador (EvaluadorPoblacion): Evaluador que calcula el fitness de los fallos.
+        capacidad (int, optional): Número máximo de permutaciones guardadas (0 desactiva la caché).
+        fraccion_incremental (float, optional): Fracción máxima de posiciones cambiadas para usar la
+            evaluación incremental (0 la desactiva).
+    """
+
+    def __init__(self, evaluador, capacidad=TAM_CACHE_FITNESS_DEFECTO, fraccion_incremental=FRACCION_INCREMENTAL_DEFECTO):
+        self.evaluador = evaluador
+        self.cache = CacheLRU(capacidad)
+        self.fraccion_incremental = fraccion_incremental
+        self.evaluaciones_completas = 0
+        self.evaluaciones_incrementales = 0
+
+    def evaluar(self, poblacion, padres=None, indices_padres=None, fitness_padres=None, contadores=None):
+        """
+        Calcula el fitness de la población reutilizando los valores ya conocidos.
+
+        Args:
+            poblacion (numpy.ndarray): Población a evaluar, shape=(poblacion, n).
+            padres (numpy.ndarray, optional): Población de la que proceden los individuos.
+            indices_padres (numpy.ndarray, optional): Fila de 'padres' de referencia de cada individuo (-1 si no tiene).
+            fitness_padres (numpy.ndarray, optional): Fitness de 'padres'.
+            contadores (dict, optional): Si se da, acumula las evaluaciones realmente calculadas
+                ('evaluaciones', suma de 'evaluaciones_completas' y 'evaluaciones_incrementales') y los
+                individuos resueltos sin calcular ('aciertos_cache').
+
+        Returns:
+            numpy.ndarray: Fitness de cada individuo, shape=(poblacion,).
+        """
+        if contadores is None:
+            return self._evaluar(poblacion, padres, indices_padres, fitness_padres)
+        completas, incrementales, aciertos = self.evaluaciones_completas, self.evaluaciones_incrementales, self.cache.aciertos
+        fitness = self._evaluar(poblacion, padres, indices_padres, fitness_padres)
+        completas = self.evaluaciones_completas - completas
+        incrementales = self.evaluaciones_incrementales - incrementales
+        for nombre, valor in (('evaluaciones', completas + incrementales), ('evaluaciones_completas', completas),
+                              ('evaluaciones_incrementales', incrementales),
+                              ('aciertos_cache', self.cache.aciertos - aciertos)):
+            contadores[nombre] = contadores.get(nombre, 0) + valor
+        return fitness
+
+    def _evaluar(self, poblacion, padres, indices_padres, fitness_padres):
+        """
+        Evaluación de evaluar, sin contadores.
+        """
+        poblacion = np.asarray(poblacion)
+        fitness = np.empty(len(poblacion), dtype=np.float64)
+
+        if self.cache.capacidad <= 0:
+            pendientes = None
+            filas = np.arange(len(poblacion))
+        else:
+            claves = claves_permutaciones(poblacion)
+            # Primera aparición de cada clave no encontrada -> filas de la población que la comparten
+            pendientes = {}
+            for i, clave in enumerate(claves):
+                if clave in pendientes:
+                    pendientes[clave].append(i)
+                    self.cache.aciertos += 1
+                    continue
+                valor = self.cache.obtener(clave)
+                if valor is None:
+                    pendientes[clave] = [i]
+                else:
+                    fitness[i] = valor
+            if not pendientes:
+                return fitness
+            filas = np.fromiter((grupo[0] for grupo in pendientes.values()), dtype=np.intp, count=len(pendientes))
+
+        valores = self._calcular(poblacion, filas, padres, indices_padres, fitness_padres)
+        if pendientes is None:
+            fitness[filas] = valores
+        else:
+            for (clave, grupo), valor in zip(pendientes.items(), valores):
+                fitness[grupo] = valor
+                self.cache.guardar(clave, float(valor))
+        return fitness
+
+    def _calcular(self, poblacion, filas, padres, indices_padres, fitness_padres):
+        """
+        Calcula el fitness de poblacion[filas]: de forma incremental los que tienen padre de referencia
+        y pocos cambios, y con el evaluador completo el resto.
+        """
+        valores = np.empty(len(filas), dtype=np.float64)
+        completos = np.ones(len(filas), dtype=np.bool_)
+        max_cambios = int(self.fraccion_incremental * poblacion.shape[1])
+        if padres is not None and max_cambios > 0 and len(filas):
+            calculado = np.empty(len(filas), dtype=np.bool_)
+            fitness_incremental_lote(poblacion[filas], np.asarray(padres), np.asarray(indices_padres)[filas],
+                                     np.asarray(fitness_padres, dtype=np.float64), self.evaluador.flow,
+                                     self.evaluador.distances, max_cambios, valores, calculado)
+            completos = ~calculado
+            self.evaluaciones_incrementales += int(calculado.sum())
+        if completos.any():
+            valores[completos] = self.evaluador.evaluar(poblacion[filas[completos]])
+            self.evaluaciones_completas += int(completos.sum())
+        return valores
+
+    __call__ = evaluar
+
+    def registrar_estadisticas(self):
+        """
+        Escribe en el log los aciertos, fallos y la tasa de aciertos de la caché, y cuántos fallos se
+        calcularon de forma incremental y cuántos con la evaluación completa.
+        """
+        if self.cache.capacidad > 0:
+            logging.info(self.cache.resumen("Caché de fitness"))
+        logging.info(f"Evaluaciones de fitness: {self.evaluaciones_incrementales} incrementales, "
+                     f"{self.evaluaciones_completas} completas")
+
+
+class MemoBusquedaLocal(CacheLRU):
+    """
+    Memoria acotada de resultados de la búsqueda local: permutación -> (permutación optimizada, coste).
+
+    Cada resultado se guarda también bajo la clave del óptimo encontrado, de modo que reenviar un
+    óptimo local ya conocido (p. ej. la élite o una copia sin mutar de un padre ya optimizado)
+    devuelve el resultado al instante. Expulsa por LRU al superar 'capacidad' entradas o 'max_bytes'.
+
+    Args:
+        capacidad (int, optional): Número máximo de entradas (0 desactiva la memoria).
+        max_bytes (int, optional): Límite aproximado de memoria.
+    """
+
+    def __init__(self, capacidad=TAM_MEMO_BUSQUEDA_LOCAL_DEFECTO, max_bytes=MAX_BYTES_MEMO_DEFECTO):
+        super().__init__(capacidad, max_bytes)
+
+    def guardar(self, clave, optimizado, coste):
+        """
+        Guarda el resultado de optimizar la permutación de 'clave'.
+
+        Args:
+            clave (bytes): Clave de la permutación original (ver claves_permutaciones).
+            optimizado (numpy.ndarray): Permutación optimizada.
+            coste (float): Coste de la permutación optimizada.
+        """
+        optimizado = np.array(optimizado, copy=True)
+        resultado = (optimizado, float(coste))
+        tam = len(clave) + optimizado.nbytes + _SOBRECARGA_ENTRADA
+        super().guardar(clave, resultado, tam)
+        clave_optimo = claves_permutaciones(optimizado[np.newaxis, :])[0]
+        if clave_optimo != clave:
+            super().guardar(clave_optimo, resultado, tam)
+
+    def registrar_estadisticas(self):
+        """
+        Escribe en el log los aciertos y fallos de la memoria de la búsqueda local.
+        """
+        logging.info(self.resumen("Memoria de búsqueda local"))
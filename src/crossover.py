@@ -3,10 +3,18 @@
 import numpy as np
 import random
 import logging
+from numba import njit, prange
+
+# Probabilidad de que cada posición pertenezca a la máscara de los cruces 'posiciones' y 'uniforme'
+PROBABILIDAD_MASCARA = 0.5
+
+# Códigos de los cruces compilados, para elegir el operador dentro de los núcleos de numba (ver hijo_cruce)
+_CODIGOS_CRUCE = {'pmx': 0, 'ox': 1, 'cx': 2, 'posiciones': 3, 'uniforme': 4}
 
 def cruce_pmx(parent1, parent2):
     """
-    Realiza el cruce PMX entre dos padres.
+    Realiza el cruce PMX entre dos padres (versión de referencia con listas; los drivers usan
+    cruzar, que aplica el núcleo compilado hijo_pmx con los mismos puntos de cruce).
 
     Args:
         parent1 (list o numpy.ndarray): Primer padre, shape=(n,).
@@ -24,13 +32,10 @@ def cruce_pmx(parent1, parent2):
 
     # Elegir dos puntos de cruce al azar
     punto1, punto2 = sorted(random.sample(range(size), 2))
-    logging.debug(f"Puntos de cruce seleccionados: {punto1}, {punto2}")
 
     # Copiar los segmentos de los padres a los hijos
     hijo1[punto1:punto2] = parent1[punto1:punto2]
     hijo2[punto1:punto2] = parent2[punto1:punto2]
-    logging.debug(f"Hijo1 después de copiar segmento: {hijo1}")
-    logging.debug(f"Hijo2 después de copiar segmento: {hijo2}")
 
     def completar_hijo(hijo, parent, parent_original):
         """
@@ -51,7 +56,6 @@ def cruce_pmx(parent1, parent2):
         size = len(hijo)
         for i in range(punto1, punto2):
             elemento = parent[i]
-            logging.debug(f"Procesando elemento: {elemento}")
             if elemento not in hijo:
                 try:
                     # Encontrar el índice donde 'parent' es igual a 'parent_original[i]'
@@ -59,7 +63,6 @@ def cruce_pmx(parent1, parent2):
                     if pos_array.size == 0:
                         raise ValueError(f"Elemento {parent_original[i]} no encontrado en 'parent'")
                     pos = pos_array[0]
-                    logging.debug(f"Posición encontrada para mapeo: {pos}")
                 except Exception as e:
                     logging.error(f"Error al encontrar posición: {e}")
                     pos = 0  # Maneja el caso donde no se encuentra
@@ -71,20 +74,17 @@ def cruce_pmx(parent1, parent2):
                         if pos_array.size == 0:
                             raise ValueError(f"Elemento {parent_original[pos]} no encontrado en 'parent'")
                         pos = pos_array[0]
-                        logging.debug(f"Posición mapeada siguiente: {pos}")
                     except Exception as e:
                         logging.error(f"Error al mapear siguiente posición: {e}")
                         pos = 0  # Maneja el caso donde no se encuentra
                         break
 
                 hijo[pos] = elemento
-                logging.debug(f"Hijo actualizado en posición {pos}: {hijo}")
 
         # Rellenar los -1 con los elementos restantes del padre
         for i in range(size):
             if hijo[i] == -1:
                 hijo[i] = parent[i]
-                logging.debug(f"Hijo completado en posición {i}: {hijo}")
 
         return hijo
 
@@ -93,4 +93,340 @@ def cruce_pmx(parent1, parent2):
     hijo2 = completar_hijo(hijo2, parent1, parent2)
 
     # Convertir hijos a arreglos de NumPy antes de retornarlos
-    return np.array(hijo1), np.array(hijo2)
\ No newline at end of file
+    return np.array(hijo1), np.array(hijo2)
+
+def generar_puntos_cruce(k, n, rng=None):
+    """
+    Genera los puntos de cruce de k cruces a la vez, con la misma distribución que
+    sorted(random.sample(range(n), 2)) en cruce_pmx: dos posiciones distintas ordenadas.
+
+    Args:
+        k (int): Número de cruces.
+        n (int): Tamaño de los individuos.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        tuple: (puntos1, puntos2), arrays de enteros shape=(k,) con puntos1 < puntos2.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    a = rng.integers(0, n, size=k)
+    b = rng.integers(0, n - 1, size=k)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
+
+@njit(cache=True)
+def hijo_pmx(donante, receptor, punto1, punto2, hijo, posicion_donante, posicion_receptor):
+    """
+    Construye en 'hijo' el descendiente PMX con el segmento [punto1, punto2) de 'donante' y el resto
+    de 'receptor', igual que completar_hijo en cruce_pmx. Las inversas de ambos padres (buffers de
+    tamaño n) sustituyen a las búsquedas 'in' y np.where, de modo que cada hijo cuesta O(n).
+    """
+    n = donante.shape[0]
+    for i in range(n):
+        hijo[i] = -1
+        posicion_donante[donante[i]] = i
+        posicion_receptor[receptor[i]] = i
+    for i in range(punto1, punto2):
+        hijo[i] = donante[i]
+    for i in range(punto1, punto2):
+        elemento = receptor[i]
+        # Los elementos ya colocados son los del segmento del donante (los del receptor no se repiten)
+        if punto1 <= posicion_donante[elemento] < punto2:
+            continue
+        pos = posicion_receptor[donante[i]]
+        while hijo[pos] != -1:
+            pos = posicion_receptor[donante[pos]]
+        hijo[pos] = elemento
+    for i in range(n):
+        if hijo[i] == -1:
+            hijo[i] = receptor[i]
+
+@njit(parallel=True, cache=True)
+def cruce_pmx_lote(padres1, padres2, puntos1, puntos2):
+    """
+    Cruce PMX de k parejas de padres a la vez, compilado con numba y en paralelo sobre las parejas.
+
+    Con los mismos puntos de cruce produce exactamente los mismos hijos que cruce_pmx.
+
+    Args:
+        padres1 (numpy.ndarray): Primeros padres, shape=(k, n).
+        padres2 (numpy.ndarray): Segundos padres, shape=(k, n).
+        puntos1 (numpy.ndarray): Inicio del segmento de cada cruce, shape=(k,).
+        puntos2 (numpy.ndarray): Fin (excluido) del segmento de cada cruce, shape=(k,).
+
+    Returns:
+        tuple: (hijos1, hijos2), cada uno shape=(k, n).
+    """
+    k, n = padres1.shape
+    hijos1 = np.empty((k, n), dtype=padres1.dtype)
+    hijos2 = np.empty((k, n), dtype=padres1.dtype)
+    for j in prange(k):
+        posicion1 = np.empty(n, dtype=np.int64)
+        posicion2 = np.empty(n, dtype=np.int64)
+        hijo_pmx(padres1[j], padres2[j], puntos1[j], puntos2[j], hijos1[j], posicion1, posicion2)
+        hijo_pmx(padres2[j], padres1[j], puntos1[j], puntos2[j], hijos2[j], posicion2, posicion1)
+    return hijos1, hijos2
+
+@njit(cache=True)
+def hijo_ox(donante, receptor, punto1, punto2, hijo, colocado):
+    """
+    Construye en 'hijo' el descendiente del cruce de orden (OX): el segmento [punto1, punto2) de
+    'donante' y, a partir de punto2 y de forma circular, los genes restantes en el orden en que
+    aparecen en 'receptor' desde punto2. 'colocado' es un buffer de tamaño n.
+    """
+    n = donante.shape[0]
+    for i in range(n):
+        colocado[i] = 0
+    for i in range(punto1, punto2):
+        hijo[i] = donante[i]
+        colocado[donante[i]] = 1
+    pos = punto2 % n
+    for t in range(n):
+        gen = receptor[(punto2 + t) % n]
+        if colocado[gen] == 0:
+            hijo[pos] = gen
+            pos = (pos + 1) % n
+
+@njit(cache=True)
+def hijo_cx(donante, receptor, hijo, posicion_donante):
+    """
+    Construye en 'hijo' el descendiente del cruce cíclico (CX): las posiciones se reparten en los
+    ciclos que forman ambos padres y cada ciclo se copia, alternando, de 'donante' (el primero) o de
+    'receptor'. Cada gen conserva la posición que tenía en alguno de los padres.
+    """
+    n = donante.shape[0]
+    for i in range(n):
+        hijo[i] = -1
+        posicion_donante[donante[i]] = i
+    del_donante = True
+    for inicio in range(n):
+        if hijo[inicio] != -1:
+            continue
+        i = inicio
+        while hijo[i] == -1:
+            hijo[i] = donante[i] if del_donante else receptor[i]
+            i = posicion_donante[receptor[i]]
+        del_donante = not del_donante
+
+@njit(cache=True)
+def hijo_posiciones(donante, receptor, mascara, hijo, colocado):
+    """
+    Construye en 'hijo' el descendiente del cruce basado en posiciones: los genes de 'donante' en las
+    posiciones de 'mascara' y las demás posiciones, de izquierda a derecha, con los genes restantes
+    en el orden de 'receptor'. 'colocado' es un buffer de tamaño n.
+    """
+    n = donante.shape[0]
+    for i in range(n):
+        colocado[i] = 0
+    for i in range(n):
+        if mascara[i]:
+            hijo[i] = donante[i]
+            colocado[donante[i]] = 1
+    t = 0
+    for i in range(n):
+        if mascara[i]:
+            continue
+        while colocado[receptor[t]] == 1:
+            t += 1
+        hijo[i] = receptor[t]
+        t += 1
+
+@njit(cache=True)
+def hijo_uniforme(donante, receptor, mascara, hijo, posicion_hijo):
+    """
+    Construye en 'hijo' el descendiente del cruce uniforme parcialmente mapeado (UPMX): parte de una
+    copia de 'receptor' y, para cada posición i de 'mascara', intercambia dentro del hijo el gen
+    donante[i] con el que ocupa la posición i. 'posicion_hijo' es un buffer de tamaño n.
+    """
+    n = donante.shape[0]
+    for i in range(n):
+        hijo[i] = receptor[i]
+        posicion_hijo[receptor[i]] = i
+    for i in range(n):
+        if mascara[i]:
+            j = posicion_hijo[donante[i]]
+            hijo[i], hijo[j] = hijo[j], hijo[i]
+            posicion_hijo[hijo[i]] = i
+            posicion_hijo[hijo[j]] = j
+
+@njit(cache=True)
+def hijo_cruce(codigo, donante, receptor, punto1, punto2, mascara, hijo, buffer1, buffer2):
+    """
+    Construye en 'hijo' el descendiente del cruce de código 'codigo' (ver _CODIGOS_CRUCE) con
+    'donante' como primer padre. buffer1 y buffer2 son buffers enteros de tamaño n.
+    """
+    if codigo == 0:
+        hijo_pmx(donante, receptor, punto1, punto2, hijo, buffer1, buffer2)
+    elif codigo == 1:
+        hijo_ox(donante, receptor, punto1, punto2, hijo, buffer1)
+    elif codigo == 2:
+        hijo_cx(donante, receptor, hijo, buffer1)
+    elif codigo == 3:
+        hijo_posiciones(donante, receptor, mascara, hijo, buffer1)
+    else:
+        hijo_uniforme(donante, receptor, mascara, hijo, buffer1)
+
+@njit(parallel=True, cache=True)
+def _cruce_lote(codigo, padres1, padres2, puntos1, puntos2, mascaras):
+    """
+    Cruce de código 'codigo' de k parejas a la vez, en paralelo sobre las parejas. El primer hijo
+    tiene a padres1 como donante y el segundo a padres2.
+    """
+    k, n = padres1.shape
+    hijos1 = np.empty((k, n), dtype=padres1.dtype)
+    hijos2 = np.empty((k, n), dtype=padres1.dtype)
+    for j in prange(k):
+        buffer1 = np.empty(n, dtype=np.int64)
+        buffer2 = np.empty(n, dtype=np.int64)
+        mascara = mascaras[j] if mascaras.shape[0] > 0 else mascaras[0:0].ravel()
+        hijo_cruce(codigo, padres1[j], padres2[j], puntos1[j], puntos2[j], mascara, hijos1[j], buffer1, buffer2)
+        hijo_cruce(codigo, padres2[j], padres1[j], puntos1[j], puntos2[j], mascara, hijos2[j], buffer1, buffer2)
+    return hijos1, hijos2
+
+def cruce_ox_lote(padres1, padres2, puntos1, puntos2, mascaras):
+    """
+    Cruce de orden (OX) de k parejas a la vez (ver hijo_ox). Usa los puntos de cruce; ignora las máscaras.
+
+    Args:
+        padres1 (numpy.ndarray): Primeros padres, shape=(k, n).
+        padres2 (numpy.ndarray): Segundos padres, shape=(k, n).
+        puntos1 (numpy.ndarray): Inicio del segmento de cada cruce, shape=(k,).
+        puntos2 (numpy.ndarray): Fin (excluido) del segmento de cada cruce, shape=(k,).
+        mascaras (numpy.ndarray): Máscara booleana de cada cruce, shape=(k, n) o (0, n).
+
+    Returns:
+        tuple: (hijos1, hijos2), cada uno shape=(k, n).
+    """
+    return _cruce_lote(_CODIGOS_CRUCE['ox'], padres1, padres2, puntos1, puntos2, mascaras)
+
+def cruce_cx_lote(padres1, padres2, puntos1, puntos2, mascaras):
+    """
+    Cruce cíclico (CX) de k parejas a la vez (ver hijo_cx). No usa puntos de cruce ni máscaras.
+    Mismos argumentos y resultado que cruce_ox_lote.
+    """
+    return _cruce_lote(_CODIGOS_CRUCE['cx'], padres1, padres2, puntos1, puntos2, mascaras)
+
+def cruce_posiciones_lote(padres1, padres2, puntos1, puntos2, mascaras):
+    """
+    Cruce basado en posiciones de k parejas a la vez (ver hijo_posiciones). Usa las máscaras.
+    Mismos argumentos y resultado que cruce_ox_lote.
+    """
+    return _cruce_lote(_CODIGOS_CRUCE['posiciones'], padres1, padres2, puntos1, puntos2, mascaras)
+
+def cruce_uniforme_lote(padres1, padres2, puntos1, puntos2, mascaras):
+    """
+    Cruce uniforme parcialmente mapeado (UPMX) de k parejas a la vez (ver hijo_uniforme). Usa las
+    máscaras. Mismos argumentos y resultado que cruce_ox_lote.
+    """
+    return _cruce_lote(_CODIGOS_CRUCE['uniforme'], padres1, padres2, puntos1, puntos2, mascaras)
+
+def _cruce_pmx_lote_registro(padres1, padres2, puntos1, puntos2, mascaras):
+    """
+    cruce_pmx_lote con la firma común del registro de cruces.
+    """
+    return cruce_pmx_lote(padres1, padres2, puntos1, puntos2)
+
+# Registro de cruces por lotes: nombre -> (función con la firma común, si usa máscaras)
+_CRUCES_LOTE = {
+    'pmx': (_cruce_pmx_lote_registro, False),
+    'ox': (cruce_ox_lote, False),
+    'cx': (cruce_cx_lote, False),
+    'posiciones': (cruce_posiciones_lote, True),
+    'uniforme': (cruce_uniforme_lote, True),
+}
+
+# Operadores de cruce disponibles: vista de las claves del registro, que refleja los que se añadan
+# con registrar_cruce también en los módulos que ya la hayan importado
+OPERADORES_CRUCE = _CRUCES_LOTE.keys()
+
+def registrar_cruce(nombre, funcion, usa_mascara=True):
+    """
+    Registra un nuevo operador de cruce por lotes, seleccionable por nombre en cruzar_lote,
+    MotorReproduccion y los drivers (parametros['cruce']).
+
+    Args:
+        nombre (str): Nombre del operador.
+        funcion (callable): Función (padres1, padres2, puntos1, puntos2, mascaras) -> (hijos1, hijos2),
+            con padres e hijos de shape=(k, n).
+        usa_mascara (bool, optional): Si hay que generarle máscaras aleatorias (shape=(k, n)).
+    """
+    _CRUCES_LOTE[nombre] = (funcion, usa_mascara)
+
+def _entrada_cruce(operador):
+    """
+    Devuelve la entrada (función, usa_mascara) del registro de cruces, o ValueError si no existe.
+    """
+    if operador not in _CRUCES_LOTE:
+        raise ValueError(f"Operador de cruce desconocido: {operador}. Opciones: {tuple(OPERADORES_CRUCE)}")
+    return _CRUCES_LOTE[operador]
+
+def funcion_cruce_lote(operador):
+    """
+    Devuelve la función por lotes del operador de cruce 'operador' (ver registrar_cruce).
+    """
+    return _entrada_cruce(operador)[0]
+
+def generar_aleatorios_cruce(operador, k, n, rng=None):
+    """
+    Genera los puntos de cruce y, si el operador las usa, las máscaras de k cruces.
+
+    Returns:
+        tuple: (puntos1, puntos2, mascaras), con mascaras de shape=(k, n) o (0, n) si el operador no las usa.
+    """
+    _, usa_mascara = _entrada_cruce(operador)
+    rng = rng if rng is not None else np.random.default_rng()
+    puntos1, puntos2 = generar_puntos_cruce(k, n, rng)
+    if usa_mascara:
+        mascaras = rng.random((k, n)) < PROBABILIDAD_MASCARA
+    else:
+        mascaras = np.zeros((0, n), dtype=np.bool_)
+    return puntos1, puntos2, mascaras
+
+def cruzar_lote(padres1, padres2, operador='pmx', rng=None):
+    """
+    Cruza k parejas de padres con el operador indicado del registro.
+
+    Args:
+        padres1 (numpy.ndarray): Primeros padres, shape=(k, n).
+        padres2 (numpy.ndarray): Segundos padres, shape=(k, n).
+        operador (str, optional): Uno de OPERADORES_CRUCE.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        tuple: (hijos1, hijos2), cada uno shape=(k, n).
+    """
+    padres1 = np.ascontiguousarray(padres1)
+    padres2 = np.ascontiguousarray(padres2, dtype=padres1.dtype)
+    k, n = padres1.shape
+    puntos1, puntos2, mascaras = generar_aleatorios_cruce(operador, k, n, rng)
+    return funcion_cruce_lote(operador)(padres1, padres2, puntos1, puntos2, mascaras)
+
+def cruzar(padre1, padre2, operador='pmx', rng=None):
+    """
+    Cruza una pareja de padres. Con 'pmx' elige los puntos de cruce con el módulo random, como
+    cruce_pmx y el bucle original, y construye los hijos con el núcleo compilado hijo_pmx (mismos
+    hijos que cruce_pmx, en O(n)); con el resto, el cruce por lotes del registro con una sola pareja.
+
+    Args:
+        padre1 (list o numpy.ndarray): Primer padre, shape=(n,).
+        padre2 (list o numpy.ndarray): Segundo padre, shape=(n,).
+        operador (str, optional): Uno de OPERADORES_CRUCE.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios. En un bucle hay que
+            pasar el del llamador: sin él, cada llamada crea uno nuevo derivado del estado global de NumPy.
+
+    Returns:
+        tuple: Dos hijos, cada uno shape=(n,).
+    """
+    if operador == 'pmx':
+        padre1, padre2 = np.asarray(padre1), np.asarray(padre2)
+        n = len(padre1)
+        punto1, punto2 = sorted(random.sample(range(n), 2))
+        hijo1, hijo2 = np.empty(n, dtype=np.int64), np.empty(n, dtype=np.int64)
+        posicion1, posicion2 = np.empty(n, dtype=np.int64), np.empty(n, dtype=np.int64)
+        hijo_pmx(padre1, padre2, punto1, punto2, hijo1, posicion1, posicion2)
+        hijo_pmx(padre2, padre1, punto1, punto2, hijo2, posicion2, posicion1)
+        return hijo1, hijo2
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(2**31 - 1))
+    hijos1, hijos2 = cruzar_lote(np.asarray(padre1)[np.newaxis, :], np.asarray(padre2)[np.newaxis, :], operador, rng)
+    return hijos1[0], hijos2[0]
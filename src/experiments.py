@@ -0,0 +1,357 @@
+# src/experiments.py
+
+"""
+Ejecutor de experimentos: recorre una rejilla declarativa (JSON) de instancias × variantes ×
+semillas × valores de opciones de src.main y ejecuta cada trabajo dentro de un pool de procesos del
+tamaño de la máquina. Cada proceso del pool importa y compila (caché de numba) una sola vez y
+ejecuta sus trabajos en proceso, con los mismos argumentos que src.main.
+
+Para no sobresuscribir la máquina, cada trabajo usa 'hilos_por_trabajo' hilos de numba (y de
+BLAS) y el pool tiene cpus // hilos_por_trabajo procesos. Los trabajos terminados dejan un
+resultado.json en su directorio y se saltan al relanzar la rejilla; al final todos los resultados
+se reúnen en una tabla (una fila por trabajo) en CSV y, si pandas tiene un motor de Parquet, en
+Parquet.
+
+Formato de la rejilla:
+    {
+        "salida": "results/experimentos",
+        "instancias": ["tai256c", "nug*"],
+        "variantes": ["standard", "lamarckian"],
+        "semillas": [0, 1, 2],
+        "opciones": {"generations": 500, "elitismo": true},
+        "rejilla": {"mutation_rate": [0.02, 0.05]},
+        "hilos_por_trabajo": 1
+    }
+'opciones' y 'rejilla' usan los nombres de los argumentos de src.main sin '--'; 'rejilla' se
+recorre como producto cartesiano.
+
+Uso:
+    python -m src.experiments scripts/experimentos.json --jobs 4
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import logging
+import multiprocessing as mp
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from numba import config as config_numba, set_num_threads
+
+from src.main import crear_parser, ejecutar
+from src.utils import (cargar_datos, resolver_instancias, _escribir_json_atomico, DIRECTORIO_CACHE_DEFECTO,
+                       DIRECTORIO_DATOS_DEFECTO)
+
+# Archivo que marca un trabajo como terminado (y guarda su fila de resultados)
+ARCHIVO_RESULTADO = 'resultado.json'
+
+# Columnas fijas de la tabla de resultados; tras 'semilla' van las claves de la rejilla
+COLUMNAS_TRABAJO = ('trabajo', 'variante', 'instancia', 'semilla')
+COLUMNAS_RESULTADO = ('estado', 'coste', 'n', 'generaciones', 'motivo_parada', 'segundos', 'salida')
+
+# Variables de entorno que limitan los hilos de las bibliotecas de álgebra lineal de NumPy
+_VARIABLES_HILOS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def cargar_rejilla(ruta):
+    """
+    Lee una rejilla de experimentos en JSON y completa los valores por defecto.
+
+    Args:
+        ruta (str): Ruta del archivo JSON.
+
+    Returns:
+        dict: Rejilla con 'salida', 'instancias', 'directorio_datos', 'variantes', 'semillas',
+            'opciones', 'rejilla' y 'hilos_por_trabajo'.
+    """
+    with open(ruta, encoding='utf-8') as f:
+        rejilla = json.load(f)
+    for clave in ('instancias', 'variantes'):
+        if not rejilla.get(clave):
+            raise ValueError(f"La rejilla {ruta} debe indicar '{clave}'")
+    rejilla.setdefault('salida', os.path.join('results', 'experimentos'))
+    rejilla.setdefault('directorio_datos', DIRECTORIO_DATOS_DEFECTO)
+    rejilla.setdefault('semillas', [0])
+    rejilla.setdefault('opciones', {})
+    rejilla.setdefault('rejilla', {})
+    rejilla.setdefault('hilos_por_trabajo', 1)
+    return rejilla
+
+
+def argumentos_opciones(opciones):
+    """
+    Convierte un diccionario de opciones de src.main en argumentos de línea de comandos: True
+    añade el indicador, False y None lo omiten, y las listas se pasan como varios valores.
+    """
+    argumentos = []
+    for nombre, valor in opciones.items():
+        if valor is None or valor is False:
+            continue
+        argumentos.append(f"--{nombre}")
+        if isinstance(valor, (list, tuple)):
+            argumentos.extend(str(v) for v in valor)
+        elif valor is not True:
+            argumentos.append(str(valor))
+    return argumentos
+
+
+def _nombre_configuracion(valores):
+    """
+    Nombre de directorio de una combinación de valores de la rejilla ('defecto' si no hay rejilla).
+    """
+    if not valores:
+        return 'defecto'
+    partes = []
+    for nombre, valor in valores.items():
+        texto = '-'.join(map(str, valor)) if isinstance(valor, (list, tuple)) else str(valor)
+        partes.append(f"{nombre}={texto}".replace(os.sep, '_').replace(' ', '_'))
+    return ','.join(partes)
+
+
+def expandir_rejilla(rejilla):
+    """
+    Genera los trabajos de la rejilla (instancias × variantes × combinaciones de 'rejilla' × semillas)
+    y comprueba sus argumentos con el parser de src.main antes de ejecutar ninguno.
+
+    Returns:
+        list: Trabajos, cada uno un diccionario con 'trabajo' (identificador), 'variante',
+            'instancia', 'semilla', 'valores' (los de la rejilla), 'datos', 'salida' y 'argumentos'
+            (de src.main).
+    """
+    parser = crear_parser()
+    rutas = resolver_instancias(rejilla['instancias'], rejilla['directorio_datos'])
+    claves = list(rejilla['rejilla'])
+    combinaciones = [dict(zip(claves, valores))
+                     for valores in itertools.product(*(rejilla['rejilla'][clave] for clave in claves))]
+    trabajos = []
+    for ruta, variante, valores, semilla in itertools.product(rutas, rejilla['variantes'], combinaciones,
+                                                              rejilla['semillas']):
+        instancia = os.path.splitext(os.path.basename(ruta))[0]
+        configuracion = _nombre_configuracion(valores)
+        salida = os.path.join(rejilla['salida'], variante, instancia, configuracion, f"semilla_{semilla}")
+        argumentos = (['--variant', variante, '--data', ruta, '--output', salida, '--seed', str(semilla)]
+                      + argumentos_opciones(dict(rejilla['opciones'], **valores)))
+        parser.parse_args(argumentos)
+        trabajos.append({'trabajo': f"{variante}/{instancia}/{configuracion}/{semilla}", 'variante': variante,
+                         'instancia': instancia, 'semilla': semilla, 'valores': valores, 'datos': ruta,
+                         'salida': salida, 'argumentos': argumentos})
+    return trabajos
+
+
+def resultado_guardado(trabajo):
+    """
+    Devuelve la fila guardada de un trabajo ya terminado, o None si hay que ejecutarlo.
+    """
+    ruta = os.path.join(trabajo['salida'], ARCHIVO_RESULTADO)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        fila = json.load(f)
+    return fila if fila.get('argumentos') == trabajo['argumentos'] else None
+
+
+def _fila(trabajo, **resultado):
+    """
+    Fila de resultados de un trabajo: sus campos, los valores de la rejilla y el resultado.
+    """
+    fila = {clave: trabajo[clave] for clave in COLUMNAS_TRABAJO}
+    fila.update(trabajo['valores'])
+    fila.update(dict.fromkeys(COLUMNAS_RESULTADO), salida=trabajo['salida'], **resultado)
+    return fila
+
+
+def _iniciar_proceso(hilos):
+    """
+    Inicializador de cada proceso del pool: limita los hilos de numba y silencia la consola (cada
+    trabajo escribe su propio log).
+    """
+    set_num_threads(min(hilos, config_numba.NUMBA_NUM_THREADS))
+    registro = logging.getLogger()
+    for manejador in list(registro.handlers):
+        registro.removeHandler(manejador)
+    registro.setLevel(logging.INFO)
+
+
+def ejecutar_trabajo(trabajo, hilos=1):
+    """
+    Ejecuta un trabajo en este proceso con src.main.ejecutar, escribiendo el log en su directorio
+    de salida. Los drivers no imprimen su progreso (como con --quiet, también en los procesos de las
+    islas) y el resto de la salida estándar va a /dev/null. Si termina, guarda su fila en
+    resultado.json.
+
+    Args:
+        trabajo (dict): Trabajo generado por expandir_rejilla.
+        hilos (int, optional): Hilos del trabajo; acota también los valores por defecto de src.main
+            que dependen del número de CPUs (--workers, --islands).
+
+    Returns:
+        dict: Fila de resultados del trabajo (estado 'ok' o 'error: ...').
+    """
+    args = crear_parser().parse_args(trabajo['argumentos'])
+    args.quiet = True
+    if args.workers is None:
+        args.workers = hilos
+    if args.islands is None:
+        args.islands = hilos
+    os.makedirs(args.output, exist_ok=True)
+
+    manejador = logging.FileHandler(os.path.join(args.output, 'ejecucion.log'), mode='w', encoding='utf-8')
+    manejador.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+    registro = logging.getLogger()
+    registro.addHandler(manejador)
+    inicio = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            mejor_solucion, historial, motivo_parada = ejecutar(args)
+    except Exception as e:
+        logging.error(traceback.format_exc())
+        return _fila(trabajo, estado=f"error: {e}", segundos=time.perf_counter() - inicio)
+    finally:
+        registro.removeHandler(manejador)
+        manejador.close()
+
+    fila = _fila(trabajo, estado='ok', coste=float(mejor_solucion[1]), n=len(mejor_solucion[0]),
+                 generaciones=len(historial) - 1, motivo_parada=motivo_parada,
+                 segundos=time.perf_counter() - inicio)
+    _escribir_json_atomico(os.path.join(args.output, ARCHIVO_RESULTADO),
+                           dict(fila, argumentos=trabajo['argumentos']))
+    return fila
+
+
+@contextlib.contextmanager
+def _limitar_hilos_blas(hilos):
+    """
+    Fija las variables de entorno de hilos de BLAS mientras dura el bloque, para que las hereden
+    los procesos del pool (se leen al importar NumPy).
+    """
+    anteriores = {variable: os.environ.get(variable) for variable in _VARIABLES_HILOS}
+    os.environ.update({variable: str(hilos) for variable in _VARIABLES_HILOS})
+    try:
+        yield
+    finally:
+        for variable, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = valor
+
+
+def ejecutar_rejilla(rejilla, trabajadores=None, cache_dir=DIRECTORIO_CACHE_DEFECTO):
+    """
+    Ejecuta los trabajos pendientes de la rejilla en un pool de procesos y devuelve las filas de
+    todos los trabajos (también las de los que ya habían terminado), en el orden de la rejilla.
+
+    Args:
+        rejilla (dict): Rejilla devuelta por cargar_rejilla.
+        trabajadores (int, optional): Procesos del pool (por defecto, cpus // hilos_por_trabajo).
+        cache_dir (str, optional): Directorio de la caché binaria de instancias, que se prepara
+            antes de lanzar los trabajos.
+
+    Returns:
+        list: Filas de resultados.
+    """
+    hilos = max(1, int(rejilla['hilos_por_trabajo']))
+    trabajadores = trabajadores or max(1, (os.cpu_count() or 1) // hilos)
+    trabajos = expandir_rejilla(rejilla)
+    filas = [resultado_guardado(trabajo) for trabajo in trabajos]
+    pendientes = [i for i, fila in enumerate(filas) if fila is None]
+    logging.info(f"Rejilla: {len(trabajos)} trabajos, {len(trabajos) - len(pendientes)} ya terminados; "
+                 f"{trabajadores} procesos × {hilos} hilos")
+    if not pendientes:
+        return filas
+
+    # La caché binaria de cada instancia se crea una vez aquí, no en paralelo en los trabajos
+    if cache_dir:
+        for ruta in sorted({trabajos[i]['datos'] for i in pendientes}):
+            cargar_datos(ruta, cache=cache_dir)
+
+    # 'spawn' como en el resto del proyecto: fork tras lanzar hilos de numba puede bloquear
+    with _limitar_hilos_blas(hilos), ProcessPoolExecutor(trabajadores, mp_context=mp.get_context('spawn'),
+                                                         initializer=_iniciar_proceso, initargs=(hilos,)) as pool:
+        futuros = {pool.submit(ejecutar_trabajo, trabajos[i], hilos): i for i in pendientes}
+        for hechos, futuro in enumerate(as_completed(futuros), 1):
+            i = futuros[futuro]
+            try:
+                filas[i] = futuro.result()
+            except Exception as e:
+                # El proceso del trabajo terminó de forma anómala (p. ej. sin memoria)
+                filas[i] = _fila(trabajos[i], estado=f"error: {e!r}")
+            logging.info(f"[{hechos}/{len(pendientes)}] {trabajos[i]['trabajo']}: {filas[i]['estado']}"
+                         + (f", coste = {filas[i]['coste']}" if filas[i]['coste'] is not None else ""))
+    return filas
+
+
+def guardar_tabla(filas, ruta_base, claves_rejilla=()):
+    """
+    Escribe las filas como tabla ordenada (una fila por trabajo, una columna por variable) en
+    '<ruta_base>.csv' y, si pandas tiene un motor de Parquet (pyarrow o fastparquet), en
+    '<ruta_base>.parquet'.
+
+    Returns:
+        list: Rutas escritas.
+    """
+    columnas = list(COLUMNAS_TRABAJO) + list(claves_rejilla) + list(COLUMNAS_RESULTADO)
+    directorio = os.path.dirname(ruta_base)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    rutas = [f"{ruta_base}.csv"]
+    with open(rutas[0], 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=columnas, extrasaction='ignore')
+        escritor.writeheader()
+        for fila in filas:
+            escritor.writerow({clave: json.dumps(valor) if isinstance(valor, list) else valor
+                               for clave, valor in fila.items()})
+    try:
+        import pandas as pd
+        pd.DataFrame(filas, columns=columnas).to_parquet(f"{ruta_base}.parquet", index=False)
+        rutas.append(f"{ruta_base}.parquet")
+    except ImportError as e:
+        logging.warning(f"No se escribe la tabla en Parquet ({e}); solo CSV")
+    return rutas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta en paralelo una rejilla de experimentos de src.main.")
+    parser.add_argument('rejilla', type=str, help='Archivo JSON con la rejilla de experimentos')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Procesos en paralelo (por defecto, número de CPUs / hilos_por_trabajo)')
+    parser.add_argument('--threads_per_job', type=int, default=None,
+                        help='Hilos de numba de cada trabajo (sustituye a hilos_por_trabajo de la rejilla)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Directorio de resultados (sustituye a salida de la rejilla)')
+    parser.add_argument('--dry_run', action='store_true', help='Lista los trabajos pendientes sin ejecutarlos')
+    parser.add_argument('--cache_dir', type=str, default=DIRECTORIO_CACHE_DEFECTO,
+                        help='Directorio de la caché binaria de instancias')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+
+    rejilla = cargar_rejilla(args.rejilla)
+    if args.threads_per_job is not None:
+        rejilla['hilos_por_trabajo'] = args.threads_per_job
+    if args.output is not None:
+        rejilla['salida'] = args.output
+
+    if args.dry_run:
+        trabajos = expandir_rejilla(rejilla)
+        pendientes = [trabajo for trabajo in trabajos if resultado_guardado(trabajo) is None]
+        for trabajo in pendientes:
+            print('python -m src.main ' + ' '.join(trabajo['argumentos']))
+        print(f"{len(pendientes)} de {len(trabajos)} trabajos pendientes")
+        return
+
+    filas = ejecutar_rejilla(rejilla, args.jobs, args.cache_dir)
+    rutas = guardar_tabla(filas, os.path.join(rejilla['salida'], 'resultados'), list(rejilla['rejilla']))
+    errores = sum(1 for fila in filas if fila['estado'] != 'ok')
+    logging.info(f"Resultados en {', '.join(rutas)}" + (f"; {errores} trabajos con error" if errores else ""))
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,16 @@
 
 import numpy as np
 import logging
+from numba import njit, prange
+from src.utils import construir_flujo_disperso
 
-def calcular_coste(individuo, flujo_matrix, distancia_matrix):
+# Presupuesto de memoria por defecto para los buffers temporales de la evaluación por bloques
+MAX_BYTES_DEFECTO = 32 * 1024 ** 2
+
+# Backends disponibles para la evaluación de poblaciones ('auto': 'disperso' si hay vista CSR, si no 'numpy')
+BACKENDS_FITNESS = ('auto', 'numpy', 'numba', 'disperso')
+
+def calcular_coste(individuo, flujo_matrix, distancia_matrix, flujo_disperso=None):
     """
     Calcula el coste total de una asignación según las matrices de flujo y distancia.
 
@@ -11,6 +19,8 @@ def calcular_coste(individuo, flujo_matrix, distancia_matrix):
         individuo (list o np.ndarray): Permutación que representa la asignación de instalaciones.
         flujo_matrix (numpy.ndarray): Matriz de flujos.
         distancia_matrix (numpy.ndarray): Matriz de distancias.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos (ver src.utils).
+            Si se proporciona, solo se recorren los flujos no nulos.
 
     Returns:
         int: Coste total de la asignación.
@@ -18,37 +28,308 @@ def calcular_coste(individuo, flujo_matrix, distancia_matrix):
     try:
         # Asegurarse de que 'individuo' es un array de NumPy
         individuo = np.array(individuo)
+        if flujo_disperso is not None:
+            return calcular_coste_disperso(individuo, flujo_disperso.indptr, flujo_disperso.indices,
+                                           flujo_disperso.datos, distancia_matrix)
         coste_total = np.sum(flujo_matrix * distancia_matrix[individuo][:, individuo])
         return coste_total
     except Exception as e:
         logging.error(f"Error al calcular el coste: {e}")
         raise
 
-def fitness_pop(population, flow, distances):
+@njit(cache=True)
+def calcular_coste_numba(individuo, flujo_matrix, distancia_matrix):
+    """
+    Calcula el coste total de una asignación sin crear arrays intermedios.
+
+    Args:
+        individuo (np.ndarray): Permutación que representa la asignación de instalaciones.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+
+    Returns:
+        float: Coste total de la asignación.
+    """
+    n = individuo.shape[0]
+    coste = 0.0
+    for i in range(n):
+        p_i = individuo[i]
+        for j in range(n):
+            coste += flujo_matrix[i, j] * distancia_matrix[p_i, individuo[j]]
+    return coste
+
+@njit(parallel=True, cache=True)
+def fitness_pop_numba(population, flow, distances, out):
+    """
+    Calcula el fitness de una población repartiendo los individuos entre todos los núcleos.
+
+    Cada coste se acumula como sum_ij F[i,j]·D[p_i,p_j] directamente sobre las matrices,
+    sin materializar distancias permutadas ni productos temporales.
+
+    Args:
+        population (np.ndarray): Matriz 2D de individuos, shape=(poblacion, n).
+        flow (np.ndarray): Matriz de flujos, shape=(n, n).
+        distances (np.ndarray): Matriz de distancias, shape=(n, n).
+        out (np.ndarray): Array de salida (float64), shape=(poblacion,).
+
+    Returns:
+        np.ndarray: El propio array 'out' con el fitness de cada individuo.
+    """
+    for k in prange(population.shape[0]):
+        out[k] = calcular_coste_numba(population[k], flow, distances)
+    return out
+
+@njit(cache=True)
+def calcular_coste_disperso(individuo, indptr, indices, datos, distancia_matrix):
+    """
+    Calcula el coste total de una asignación recorriendo solo los flujos no nulos (formato CSR).
+
+    Args:
+        individuo (np.ndarray): Permutación que representa la asignación de instalaciones.
+        indptr (np.ndarray): Punteros de fila de la matriz de flujos en formato CSR.
+        indices (np.ndarray): Columnas de los flujos no nulos.
+        datos (np.ndarray): Valores de los flujos no nulos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+
+    Returns:
+        float: Coste total de la asignación.
+    """
+    n = individuo.shape[0]
+    coste = 0.0
+    for i in range(n):
+        p_i = individuo[i]
+        for idx in range(indptr[i], indptr[i + 1]):
+            coste += datos[idx] * distancia_matrix[p_i, individuo[indices[idx]]]
+    return coste
+
+@njit(parallel=True, cache=True)
+def fitness_pop_disperso(population, indptr, indices, datos, distances, out):
+    """
+    Versión dispersa de fitness_pop_numba: O(nnz) por individuo en lugar de O(n²).
+
+    Args:
+        population (np.ndarray): Matriz 2D de individuos, shape=(poblacion, n).
+        indptr (np.ndarray): Punteros de fila de la matriz de flujos en formato CSR.
+        indices (np.ndarray): Columnas de los flujos no nulos.
+        datos (np.ndarray): Valores de los flujos no nulos.
+        distances (np.ndarray): Matriz de distancias, shape=(n, n).
+        out (np.ndarray): Array de salida (float64), shape=(poblacion,).
+
+    Returns:
+        np.ndarray: El propio array 'out' con el fitness de cada individuo.
+    """
+    for k in prange(population.shape[0]):
+        out[k] = calcular_coste_disperso(population[k], indptr, indices, datos, distances)
+    return out
+
+@njit(parallel=True, cache=True)
+def fitness_incremental_lote(population, padres, indices_padres, fitness_padres, flow, distances, max_cambios,
+                             out, calculado):
+    """
+    Calcula el fitness de cada hijo a partir del coste conocido de su padre de referencia cuando
+    difieren en pocas posiciones. Con S el conjunto de posiciones cambiadas (|S| = k), solo varían los
+    términos F[i, j]·D[p_i, p_j] con i o j en S, así que el coste del hijo se obtiene en O(n·k):
+
+        delta = Σ_{i∈S} Σ_j F[i,j]·ΔD[i,j] + Σ_{j∈S} Σ_{i∉S} F[i,j]·ΔD[i,j]
+
+    Args:
+        population (np.ndarray): Hijos, shape=(m, n).
+        padres (np.ndarray): Población de la generación anterior, shape=(poblacion, n).
+        indices_padres (np.ndarray): Fila de 'padres' de referencia de cada hijo (-1 si no tiene), shape=(m,).
+        fitness_padres (np.ndarray): Fitness de 'padres', shape=(poblacion,).
+        flow (np.ndarray): Matriz de flujos, shape=(n, n).
+        distances (np.ndarray): Matriz de distancias, shape=(n, n).
+        max_cambios (int): Número máximo de posiciones cambiadas para usar la actualización incremental.
+        out (np.ndarray): Array de salida (float64), shape=(m,).
+        calculado (np.ndarray): Array booleano de salida; False en los hijos que deben evaluarse completos.
+
+    Returns:
+        np.ndarray: El propio array 'out' (solo válido donde 'calculado' es True).
+    """
+    m, n = population.shape
+    for h in prange(m):
+        referencia = indices_padres[h]
+        calculado[h] = False
+        if referencia < 0:
+            continue
+        hijo = population[h]
+        padre = padres[referencia]
+        cambiadas = np.empty(n, dtype=np.int64)
+        k = 0
+        for i in range(n):
+            if hijo[i] != padre[i]:
+                if k == max_cambios:
+                    k = -1
+                    break
+                cambiadas[k] = i
+                k += 1
+        if k < 0:
+            continue
+        en_cambio = np.zeros(n, dtype=np.bool_)
+        for c in range(k):
+            en_cambio[cambiadas[c]] = True
+        delta = 0.0
+        for c in range(k):
+            i = cambiadas[c]
+            for j in range(n):
+                delta += flow[i, j] * (distances[hijo[i], hijo[j]] - distances[padre[i], padre[j]])
+            for r in range(n):
+                if not en_cambio[r]:
+                    delta += flow[r, i] * (distances[hijo[r], hijo[i]] - distances[padre[r], padre[i]])
+        out[h] = fitness_padres[referencia] + delta
+        calculado[h] = True
+    return out
+
+class EvaluadorPoblacion:
+    """
+    Evalúa poblaciones completas en memoria acotada.
+
+    En lugar de materializar de una vez el array (poblacion, n, n) de distancias permutadas,
+    procesa la población en bloques de individuos y reutiliza entre llamadas (generaciones)
+    los buffers temporales reservados. El resultado es idéntico bit a bit al de la versión
+    vectorizada completa, ya que cada individuo se reduce con el mismo orden de suma.
+
+    Con backend='numba' la evaluación se delega en el kernel paralelo fitness_pop_numba,
+    que no necesita buffers temporales (el orden de suma, y por tanto el redondeo, puede
+    diferir del backend NumPy en instancias con distancias no enteras).
+
+    Con backend='disperso' se usa el kernel fitness_pop_disperso, que solo recorre los flujos no
+    nulos de la vista CSR (construida aquí si no se proporciona). Con backend='auto' se elige
+    'disperso' si se proporciona la vista dispersa (src.utils.detectar_flujo_disperso) y 'numpy' si
+    no; un backend explícito se respeta aunque haya vista dispersa. El backend elegido queda en
+    'backend' y se escribe en el log.
+
+    Args:
+        flow (numpy.ndarray): Matriz de flujos, shape=(n, n).
+        distances (numpy.ndarray): Matriz de distancias, shape=(n, n).
+        tam_bloque (int, optional): Número de individuos por bloque. Si se indica, tiene prioridad sobre max_bytes.
+        max_bytes (int, optional): Presupuesto de memoria (en bytes) para los buffers temporales.
+        backend (str, optional): Uno de BACKENDS_FITNESS: 'numpy' (por bloques), 'numba' (kernel compilado
+            en paralelo), 'disperso' (kernel CSR) o 'auto'.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
+    """
+
+    def __init__(self, flow, distances, tam_bloque=None, max_bytes=MAX_BYTES_DEFECTO, backend='auto',
+                 flujo_disperso=None):
+        if backend not in BACKENDS_FITNESS:
+            raise ValueError(f"Backend de fitness desconocido: {backend}. Opciones: {BACKENDS_FITNESS}")
+        if backend == 'auto':
+            backend = 'disperso' if flujo_disperso is not None else 'numpy'
+        if backend == 'disperso' and flujo_disperso is None:
+            flujo_disperso = construir_flujo_disperso(np.asarray(flow))
+        self.backend = backend
+        self.flujo_disperso = flujo_disperso if backend == 'disperso' else None
+        logging.info(f"Evaluación de la población con el backend de fitness '{backend}'"
+                     + (f" (densidad de flujos {flujo_disperso.densidad:.3f})" if backend == 'disperso' else ""))
+        self.flow = np.asarray(flow)
+        self.distances = np.asarray(distances)
+        self.n = self.distances.shape[0]
+        self._distancias_planas = np.ascontiguousarray(self.distances).ravel()
+        self._dtype_producto = np.result_type(self.flow, self.distances)
+
+        # Bytes necesarios por individuo: índices + distancias recogidas + producto
+        bytes_por_individuo = self.n * self.n * (
+            np.dtype(np.intp).itemsize + self.distances.dtype.itemsize + self._dtype_producto.itemsize
+        )
+        if tam_bloque is None:
+            tam_bloque = max(1, int(max_bytes) // bytes_por_individuo)
+        if tam_bloque < 1:
+            raise ValueError(f"El tamaño de bloque debe ser positivo, se recibió {tam_bloque}.")
+        self.tam_bloque = int(tam_bloque)
+
+        self._indices = None
+        self._recogidas = None
+        self._producto = None
+
+    def _reservar_buffers(self, tam):
+        """
+        Reserva (o amplía) los buffers temporales para bloques de 'tam' individuos.
+
+        Args:
+            tam (int): Número de individuos del bloque.
+        """
+        if self._indices is not None and self._indices.shape[0] >= tam:
+            return
+        forma = (tam, self.n, self.n)
+        self._indices = np.empty(forma, dtype=np.intp)
+        self._recogidas = np.empty(forma, dtype=self.distances.dtype)
+        self._producto = np.empty(forma, dtype=self._dtype_producto)
+
+    def evaluar(self, population, out=None):
+        """
+        Calcula el fitness de una población bloque a bloque.
+
+        Args:
+            population (numpy.ndarray): Matriz 2D de individuos (población), shape=(poblacion, n).
+            out (numpy.ndarray, optional): Array de salida, shape=(poblacion,).
+
+        Returns:
+            numpy.ndarray: Array de fitness para cada individuo, shape=(poblacion,).
+        """
+        population = np.asarray(population)
+        tam_poblacion = population.shape[0]
+
+        if self.backend == 'disperso':
+            if out is None:
+                out = np.empty(tam_poblacion, dtype=np.float64)
+            fd = self.flujo_disperso
+            return fitness_pop_disperso(np.ascontiguousarray(population), fd.indptr, fd.indices, fd.datos,
+                                        self.distances, out)
+
+        if self.backend == 'numba':
+            if out is None:
+                out = np.empty(tam_poblacion, dtype=np.float64)
+            return fitness_pop_numba(np.ascontiguousarray(population), self.flow, self.distances, out)
+
+        if out is None:
+            out = np.empty(tam_poblacion, dtype=self._dtype_producto)
+
+        self._reservar_buffers(min(self.tam_bloque, max(tam_poblacion, 1)))
+
+        for inicio in range(0, tam_poblacion, self.tam_bloque):
+            bloque = population[inicio:inicio + self.tam_bloque]
+            m = bloque.shape[0]
+            indices = self._indices[:m]
+            recogidas = self._recogidas[:m]
+            producto = self._producto[:m]
+
+            # Índice plano de distances[p_i, p_j] para cada individuo del bloque
+            np.add((bloque * self.n)[:, :, np.newaxis], bloque[:, np.newaxis, :], out=indices)
+            np.take(self._distancias_planas, indices, out=recogidas)
+            np.multiply(self.flow, recogidas, out=producto)
+            np.sum(producto, axis=(1, 2), out=out[inicio:inicio + m])
+
+        return out
+
+    __call__ = evaluar
+
+
+def fitness_pop(population, flow, distances, tam_bloque=None, max_bytes=MAX_BYTES_DEFECTO, backend='auto',
+                flujo_disperso=None):
     """
     Calcula el fitness para una población completa de individuos de manera vectorizada.
 
+    La evaluación se realiza por bloques de individuos (ver EvaluadorPoblacion) para que la
+    memoria temporal quede acotada por 'max_bytes' independientemente del tamaño de la población.
+    Con backend='numba' se usa el kernel compilado fitness_pop_numba, paralelo sobre individuos,
+    y con 'disperso' (o 'auto' y 'flujo_disperso') el kernel disperso fitness_pop_disperso.
+
     Args:
         population (numpy.ndarray): Matriz 2D de individuos (población), shape=(poblacion, n).
         flow (numpy.ndarray): Matriz de flujos, shape=(n, n).
         distances (numpy.ndarray): Matriz de distancias, shape=(n, n).
+        tam_bloque (int, optional): Número de individuos evaluados por bloque.
+        max_bytes (int, optional): Presupuesto de memoria para los buffers temporales.
+        backend (str, optional): Uno de BACKENDS_FITNESS.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
 
     Returns:
         numpy.ndarray: Array de fitness para cada individuo, shape=(poblacion,).
     """
     try:
-        # population: shape=(poblacion, n)
-        # flow: shape=(n, n)
-        # distances: shape=(n, n)
-
-        # Expand dimensions to perform broadcasting
-        # flow[np.newaxis, :, :] -> shape=(1, n, n)
-        # population[:, :, np.newaxis] -> shape=(poblacion, n, 1)
-        # population[:, np.newaxis, :] -> shape=(poblacion, 1, n)
-        # distances[population[:, :, np.newaxis], population[:, np.newaxis, :]] -> shape=(poblacion, n, n)
-
-        fitness = np.sum(flow[np.newaxis, :, :] * distances[population[:, :, np.newaxis], population[:, np.newaxis, :]], axis=(1, 2))
-        return fitness
+        evaluador = EvaluadorPoblacion(flow, distances, tam_bloque=tam_bloque, max_bytes=max_bytes, backend=backend,
+                                       flujo_disperso=flujo_disperso)
+        return evaluador.evaluar(population)
     except Exception as e:
         logging.error(f"Error al calcular el fitness de la población: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -2,10 +2,14 @@
 
 import numpy as np
 import random
-from src.fitness import fitness_pop, calcular_coste
+from src.cache import CacheFitness, TAM_CACHE_FITNESS_DEFECTO, FRACCION_INCREMENTAL_DEFECTO
+from src.fitness import EvaluadorPoblacion, calcular_coste
 from src.selection import seleccion_torneo
-from src.crossover import cruce_pmx
+from src.crossover import cruzar
 from src.mutation import mutacion_swap
+from src.reproduccion import MotorReproduccion, MODOS_REPRODUCCION
+from src.instrumentation import obtener_instrumentacion
+from src.termination import contar_evaluaciones, obtener_control_parada
 
 
 def ejecutar_algoritmo_genetico(n, flujo_matrix, distancia_matrix, parametros=None):
@@ -30,7 +34,18 @@ def ejecutar_algoritmo_genetico(n, flujo_matrix, distancia_matrix, parametros=No
             'elitismo': True
         }
 
-    print("Inicializando población")
+    # Vista dispersa de los flujos (None si la matriz es densa), ver src.utils.cargar_datos
+    flujo_disperso = parametros.get('flujo_disperso')
+    # Tiempos por fase y contadores (src.instrumentation); sin coste si no se pide
+    instrumentacion = obtener_instrumentacion(parametros)
+    # Criterios de parada además de las generaciones (src.termination); el reloj cuenta desde aquí
+    control = obtener_control_parada(parametros)
+    # Sin progreso por la salida estándar (p. ej. en las islas y los trabajos de src.experiments)
+    mostrar_progreso = parametros.get('mostrar_progreso', True)
+    control.iniciar()
+
+    if mostrar_progreso:
+        print("Inicializando población")
     poblacion = []
     mitad_poblacion = parametros['poblacion'] // 2
 
@@ -45,15 +60,40 @@ def ejecutar_algoritmo_genetico(n, flujo_matrix, distancia_matrix, parametros=No
         poblacion.append(individuo)
 
     poblacion = np.array(poblacion)
-    fitness = fitness_pop(poblacion, flujo_matrix, distancia_matrix)
+    # Evaluador por bloques: reutiliza sus buffers temporales en todas las generaciones.
+    # La caché de fitness evita reevaluar los individuos ya vistos (p. ej. copias sin mutar de los padres)
+    evaluador = CacheFitness(
+        EvaluadorPoblacion(flujo_matrix, distancia_matrix, backend=parametros.get('backend_fitness', 'auto'),
+                           flujo_disperso=flujo_disperso),
+        parametros.get('tam_cache_fitness', TAM_CACHE_FITNESS_DEFECTO),
+        parametros.get('fraccion_incremental', FRACCION_INCREMENTAL_DEFECTO)
+    )
+    contadores_evaluacion = {}
+    fitness = evaluador.evaluar(poblacion, contadores=contadores_evaluacion)
 
     historial = []
     mejor_idx = np.argmin(fitness)
     mejor_solucion = (poblacion[mejor_idx], fitness[mejor_idx])
     historial.append(mejor_solucion[1])
-    print(f"Generación 0: Mejor fitness = {mejor_solucion[1]}")
+    control.registrar(mejor_solucion[1], contar_evaluaciones(contadores_evaluacion), poblacion)
+    if mostrar_progreso:
+        print(f"Generación 0: Mejor fitness = {mejor_solucion[1]}")
+
+    reproduccion = parametros.get('reproduccion', 'vectorizada')
+    if reproduccion not in MODOS_REPRODUCCION:
+        raise ValueError(f"Modo de reproducción desconocido: {reproduccion}. Opciones: {MODOS_REPRODUCCION}")
+    if reproduccion == 'vectorizada':
+        return _evolucionar_vectorizado(evaluador, parametros, poblacion, fitness, mejor_solucion, historial, control)
+
+    migracion = parametros.get('migracion')
+    cruce = parametros.get('cruce', 'pmx')
+    # Un único generador para todos los cruces por lotes, derivado del estado global de NumPy. 'pmx'
+    # no lo usa (sus puntos salen del módulo random) y no se crea, para no alterar la secuencia original
+    rng = np.random.default_rng(np.random.randint(2**31 - 1)) if cruce != 'pmx' else None
 
     for gen in range(parametros['generaciones']):
+        if control.detenido:
+            break
         nueva_poblacion = []
 
         # Elitismo: mantener el mejor individuo
@@ -62,25 +102,37 @@ def ejecutar_algoritmo_genetico(n, flujo_matrix, distancia_matrix, parametros=No
 
         while len(nueva_poblacion) < parametros['poblacion']:
             # Selección
-            padre1 = seleccion_torneo(poblacion, fitness)
-            padre2 = seleccion_torneo(poblacion, fitness)
+            with instrumentacion.fase('seleccion'):
+                padre1 = seleccion_torneo(poblacion, fitness)
+                padre2 = seleccion_torneo(poblacion, fitness)
 
             # Cruce
-            if random.random() < parametros['tasa_cruce']:
-                hijo1, hijo2 = cruce_pmx(padre1, padre2)
-            else:
-                hijo1, hijo2 = padre1.copy(), padre2.copy()
+            with instrumentacion.fase('cruce'):
+                if random.random() < parametros['tasa_cruce']:
+                    hijo1, hijo2 = cruzar(padre1, padre2, cruce, rng)
+                else:
+                    hijo1, hijo2 = padre1.copy(), padre2.copy()
 
             # Mutación
-            hijo1 = mutacion_swap(hijo1, parametros['tasa_mutacion'])
-            hijo2 = mutacion_swap(hijo2, parametros['tasa_mutacion'])
+            with instrumentacion.fase('mutacion'):
+                hijo1 = mutacion_swap(hijo1, parametros['tasa_mutacion'])
+                hijo2 = mutacion_swap(hijo2, parametros['tasa_mutacion'])
 
             # Añadir los hijos a la nueva población
             nueva_poblacion.extend([hijo1, hijo2])
 
         # Convertir a array de NumPy y truncar si es necesario
         poblacion = np.array(nueva_poblacion[:parametros['poblacion']])
-        fitness = fitness_pop(poblacion, flujo_matrix, distancia_matrix)
+        # Evaluaciones completas, incrementales y aciertos de la caché de esta generación
+        contadores_evaluacion = {}
+        with instrumentacion.fase('evaluacion'):
+            fitness = evaluador.evaluar(poblacion, contadores=contadores_evaluacion)
+        instrumentacion.sumar_contadores(contadores_evaluacion)
+
+        # Migración del modelo de islas (src.island_model): sustituye individuos por inmigrantes, in situ
+        if migracion is not None:
+            with instrumentacion.fase('migracion'):
+                migracion(gen, poblacion, fitness)
 
         # Actualizar el mejor individuo
         mejor_idx = np.argmin(fitness)
@@ -89,11 +141,83 @@ def ejecutar_algoritmo_genetico(n, flujo_matrix, distancia_matrix, parametros=No
 
         if mejor_gen[1] < mejor_solucion[1]:
             mejor_solucion = mejor_gen
+        instrumentacion.cerrar_generacion(gen, mejor_solucion[1])
+        control.registrar(mejor_solucion[1], contar_evaluaciones(contadores_evaluacion), poblacion)
+
+        # Imprimir progreso cada 100 generaciones y en la primera generación
+        if mostrar_progreso and ((gen + 1) % 100 == 0 or gen == 0):
+            print(f"Generación {gen + 1}: Mejor fitness = {mejor_solucion[1]}")
+
+    control.finalizar()
+    evaluador.registrar_estadisticas()
+    return mejor_solucion, historial
+
+def _evolucionar_vectorizado(evaluador, parametros, poblacion, fitness, mejor_solucion, historial, control):
+    """
+    Bucle generacional con MotorReproduccion: cada generación se produce completa con operaciones
+    sobre arrays en un buffer preasignado, en lugar de pareja a pareja.
+
+    Args:
+        evaluador (CacheFitness): Evaluador de la población con caché de fitness.
+        parametros (dict): Parámetros del Algoritmo Genético.
+        poblacion (numpy.ndarray): Población inicial.
+        fitness (numpy.ndarray): Fitness de la población inicial.
+        mejor_solucion (tuple): Mejor solución (individuo, coste) de la población inicial.
+        historial (list): Historial de fitness, con el de la población inicial.
+        control (ControlParada): Criterios de parada, con la población inicial ya registrada.
+
+    Returns:
+        tuple: Mejor solución encontrada (individuo, coste) y su historial de fitness.
+    """
+    # Generador derivado del estado global de NumPy, para que --seed siga fijando toda la ejecución
+    rng = np.random.default_rng(np.random.randint(2**31 - 1))
+    instrumentacion = obtener_instrumentacion(parametros)
+    mostrar_progreso = parametros.get('mostrar_progreso', True)
+    motor = MotorReproduccion(parametros['poblacion'], poblacion.shape[1], parametros['tasa_cruce'],
+                              parametros['tasa_mutacion'], parametros['elitismo'], rng=rng,
+                              k_torneo=parametros.get('k_torneo', 3),
+                              metodo_seleccion=parametros.get('seleccion', 'torneo'),
+                              presion_ranking=parametros.get('presion_ranking', 1.5),
+                              operador_mutacion=parametros.get('mutacion', 'swap'),
+                              operador_cruce=parametros.get('cruce', 'pmx'), dtype=poblacion.dtype,
+                              instrumentacion=instrumentacion)
+    # Los buffers del motor se reutilizan, así que la mejor solución se guarda como copia
+    mejor_solucion = (mejor_solucion[0].copy(), mejor_solucion[1])
+    migracion = parametros.get('migracion')
+
+    for gen in range(parametros['generaciones']):
+        if control.detenido:
+            break
+        padres, fitness_padres = poblacion, fitness
+        poblacion = motor.siguiente_generacion(padres, fitness_padres, elite=mejor_solucion[0])
+        # Los hijos que apenas difieren de su padre de referencia se evalúan de forma incremental;
+        # se cuentan las evaluaciones completas, las incrementales y los aciertos de la caché
+        contadores_evaluacion = {}
+        with instrumentacion.fase('evaluacion'):
+            fitness = evaluador.evaluar(poblacion, padres, motor.referencias, fitness_padres,
+                                        contadores=contadores_evaluacion)
+        instrumentacion.sumar_contadores(contadores_evaluacion)
+
+        # Migración del modelo de islas (src.island_model): sustituye individuos por inmigrantes, in situ
+        if migracion is not None:
+            with instrumentacion.fase('migracion'):
+                migracion(gen, poblacion, fitness)
+
+        # Actualizar el mejor individuo
+        mejor_idx = np.argmin(fitness)
+        historial.append(fitness[mejor_idx])
+
+        if fitness[mejor_idx] < mejor_solucion[1]:
+            mejor_solucion = (poblacion[mejor_idx].copy(), fitness[mejor_idx])
+        instrumentacion.cerrar_generacion(gen, mejor_solucion[1])
+        control.registrar(mejor_solucion[1], contar_evaluaciones(contadores_evaluacion), poblacion)
 
         # Imprimir progreso cada 100 generaciones y en la primera generación
-        if (gen + 1) % 100 == 0 or gen == 0:
+        if mostrar_progreso and ((gen + 1) % 100 == 0 or gen == 0):
             print(f"Generación {gen + 1}: Mejor fitness = {mejor_solucion[1]}")
 
+    control.finalizar()
+    evaluador.registrar_estadisticas()
     return mejor_solucion, historial
 
 def generar_individuo(n):
@@ -0,0 +1,246 @@
+# src/instrumentation.py
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+# Ganchos que envuelven una ejecución completa (ver perfilar)
+GANCHOS_PERFIL = ('cprofile', 'tracemalloc')
+
+# Contexto reutilizable de las fases cuando la instrumentación está desactivada
+_FASE_NULA = nullcontext()
+
+
+class _Fase:
+    """
+    Gestor de contexto que suma a 'instrumentacion' el tiempo de reloj de una fase.
+    """
+
+    __slots__ = ('instrumentacion', 'nombre', 'inicio')
+
+    def __init__(self, instrumentacion, nombre):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.instrumentacion.registrar_fase(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+
+class Instrumentacion:
+    """
+    Registro del tiempo de cada fase del bucle generacional (selección, cruce, mutación, evaluación,
+    búsqueda local...) y de contadores como evaluaciones de fitness o movimientos aceptados por la
+    búsqueda local, en total y por generación. Los drivers la reciben en parametros['instrumentacion'].
+
+    Uso:
+        with instrumentacion.fase('cruce'):
+            ...
+        instrumentacion.sumar_contadores(contadores_evaluacion)
+        instrumentacion.cerrar_generacion(gen, mejor_coste)
+    """
+
+    activa = True
+
+    def __init__(self):
+        self.fases = {}  # nombre -> [segundos, llamadas]
+        self.contadores = {}
+        self.generaciones = []
+        self.extra = {}
+        self._fases_generacion = {}
+        self._contadores_generacion = {}
+        self._inicio = time.perf_counter()
+        self._inicio_generacion = self._inicio
+
+    def fase(self, nombre):
+        """
+        Devuelve un gestor de contexto que mide el tiempo de la fase 'nombre'.
+        """
+        return _Fase(self, nombre)
+
+    def registrar_fase(self, nombre, segundos):
+        """
+        Suma 'segundos' y una llamada a la fase 'nombre'.
+        """
+        total = self.fases.get(nombre)
+        if total is None:
+            self.fases[nombre] = [segundos, 1]
+        else:
+            total[0] += segundos
+            total[1] += 1
+        self._fases_generacion[nombre] = self._fases_generacion.get(nombre, 0.0) + segundos
+
+    def sumar(self, nombre, valor=1):
+        """
+        Suma 'valor' al contador 'nombre'.
+        """
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + valor
+        self._contadores_generacion[nombre] = self._contadores_generacion.get(nombre, 0) + valor
+
+    def sumar_contadores(self, contadores):
+        """
+        Suma todos los contadores de un diccionario (p. ej. los de optimizar_poblacion).
+        """
+        for nombre, valor in (contadores or {}).items():
+            self.sumar(nombre, valor)
+
+    def cerrar_generacion(self, generacion, mejor_coste=None):
+        """
+        Guarda el registro de la generación (duración, instante de cierre desde el inicio, fases y
+        contadores) y empieza la siguiente.
+        """
+        ahora = time.perf_counter()
+        registro = {
+            'generacion': generacion,
+            'segundos': ahora - self._inicio_generacion,
+            'instante': ahora - self._inicio,
+            'fases': self._fases_generacion,
+            'contadores': self._contadores_generacion,
+        }
+        if mejor_coste is not None:
+            registro['mejor_coste'] = float(mejor_coste)
+        self.generaciones.append(registro)
+        self._fases_generacion = {}
+        self._contadores_generacion = {}
+        self._inicio_generacion = ahora
+
+    def informe(self):
+        """
+        Devuelve el informe completo como diccionario serializable en JSON.
+        """
+        total = time.perf_counter() - self._inicio
+        fases = {
+            nombre: {'segundos': segundos, 'llamadas': llamadas, 'fraccion': segundos / total if total > 0 else 0.0}
+            for nombre, (segundos, llamadas) in sorted(self.fases.items(), key=lambda f: -f[1][0])
+        }
+        informe = {'segundos_totales': total, 'fases': fases, 'contadores': dict(self.contadores)}
+        # Tiempo fuera de las fases medidas (inicialización, copias, registro...)
+        informe['segundos_sin_fase'] = total - sum(segundos for segundos, _ in self.fases.values())
+        # 'evaluaciones' son las calculadas (completas e incrementales), sin los aciertos de la caché
+        tiempo_evaluacion = self.fases.get('evaluacion', (0.0, 0))[0]
+        if self.contadores.get('evaluaciones') and tiempo_evaluacion > 0:
+            informe['evaluaciones_por_segundo'] = self.contadores['evaluaciones'] / tiempo_evaluacion
+        tiempo_busqueda = self.fases.get('busqueda_local', (0.0, 0))[0]
+        if self.contadores.get('iteraciones_busqueda_local') and tiempo_busqueda > 0:
+            informe['iteraciones_busqueda_local_por_segundo'] = (self.contadores['iteraciones_busqueda_local']
+                                                                 / tiempo_busqueda)
+        informe.update(self.extra)
+        informe['generaciones'] = self.generaciones
+        return informe
+
+    def guardar(self, ruta):
+        """
+        Escribe el informe en 'ruta' como JSON.
+        """
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.informe(), f, indent=4)
+
+    def registrar_resumen(self):
+        """
+        Escribe en el log el tiempo y la fracción de cada fase.
+        """
+        informe = self.informe()
+        logging.info(f"Perfil: {informe['segundos_totales']:.2f} s en total")
+        for nombre, fase in informe['fases'].items():
+            logging.info(f"  {nombre}: {fase['segundos']:.3f} s ({100 * fase['fraccion']:.1f} %), "
+                         f"{fase['llamadas']} llamadas")
+
+
+class InstrumentacionNula:
+    """
+    Instrumentación desactivada: misma interfaz que Instrumentacion, sin coste apreciable.
+    """
+
+    activa = False
+
+    def fase(self, nombre):
+        return _FASE_NULA
+
+    def registrar_fase(self, nombre, segundos):
+        pass
+
+    def sumar(self, nombre, valor=1):
+        pass
+
+    def sumar_contadores(self, contadores):
+        pass
+
+    def cerrar_generacion(self, generacion, mejor_coste=None):
+        pass
+
+
+INSTRUMENTACION_NULA = InstrumentacionNula()
+
+
+def obtener_instrumentacion(parametros):
+    """
+    Devuelve la instrumentación de parametros['instrumentacion'] o INSTRUMENTACION_NULA si no hay.
+    """
+    return parametros.get('instrumentacion') or INSTRUMENTACION_NULA
+
+
+def perfilar(funcion, gancho=None, ruta_base=None, lineas=25):
+    """
+    Ejecuta funcion() envuelta en el gancho de perfilado indicado.
+
+    Con 'cprofile' guarda las estadísticas en '<ruta_base>.prof' (legibles con pstats o snakeviz)
+    y escribe en el log las funciones con más tiempo acumulado; con 'tracemalloc' mide el pico de
+    memoria reservada desde Python y las líneas que más memoria retienen al terminar.
+
+    Args:
+        funcion (callable): Función sin argumentos a ejecutar.
+        gancho (str, optional): Uno de GANCHOS_PERFIL, o None para ejecutar sin perfilar.
+        ruta_base (str, optional): Ruta sin extensión de los archivos del perfil.
+        lineas (int, optional): Número de entradas del resumen.
+
+    Returns:
+        tuple: (resultado de funcion, diccionario con el resumen del perfil o None)
+    """
+    if gancho is None:
+        return funcion(), None
+    if gancho not in GANCHOS_PERFIL:
+        raise ValueError(f"Gancho de perfilado desconocido: {gancho}. Opciones: {GANCHOS_PERFIL}")
+
+    if gancho == 'cprofile':
+        perfil = cProfile.Profile()
+        resultado = perfil.runcall(funcion)
+        if ruta_base is not None:
+            perfil.dump_stats(f"{ruta_base}.prof")
+        texto = io.StringIO()
+        pstats.Stats(perfil, stream=texto).sort_stats('cumulative').print_stats(lineas)
+        logging.info(f"cProfile (tiempo acumulado):\n{texto.getvalue()}")
+        estadisticas = pstats.Stats(perfil).sort_stats('cumulative')
+        funciones = [
+            {'funcion': f"{archivo}:{linea}({nombre})", 'llamadas': llamadas, 'segundos_propios': propio,
+             'segundos_acumulados': acumulado}
+            for (archivo, linea, nombre), (_, llamadas, propio, acumulado, _) in estadisticas.stats.items()
+        ]
+        funciones.sort(key=lambda f: -f['segundos_acumulados'])
+        return resultado, {'gancho': gancho, 'funciones': funciones[:lineas]}
+
+    ya_activo = tracemalloc.is_tracing()
+    if not ya_activo:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        resultado = funcion()
+        _, pico = tracemalloc.get_traced_memory()
+        instantanea = tracemalloc.take_snapshot()
+    finally:
+        if not ya_activo:
+            tracemalloc.stop()
+    lineas_memoria = [
+        {'linea': str(estadistica.traceback), 'bytes': estadistica.size, 'bloques': estadistica.count}
+        for estadistica in instantanea.statistics('lineno')[:lineas]
+    ]
+    logging.info(f"tracemalloc: pico de memoria de Python = {pico / 1024 ** 2:.1f} MiB")
+    return resultado, {'gancho': gancho, 'pico_bytes': pico, 'lineas': lineas_memoria}
@@ -0,0 +1,237 @@
+# src/island_model.py
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+import traceback
+import numpy as np
+from numba import get_num_threads, set_num_threads
+from src.shared_instance import InstanciaCompartida, adjuntar_instancia
+from src.genetic_algorithm import ejecutar_algoritmo_genetico
+from src.baldwinian_ga import ejecutar_varianta_baldwiniana
+from src.lamarckian_ga import ejecutar_varianta_lamarckiana
+from src.termination import ControlParada
+
+# Topologías de migración entre islas
+TOPOLOGIAS_MIGRACION = ('anillo', 'aleatoria', 'completa')
+
+# Algoritmo que ejecuta cada isla
+VARIANTES_ISLA = {
+    'standard': ejecutar_algoritmo_genetico,
+    'baldwinian': ejecutar_varianta_baldwiniana,
+    'lamarckian': ejecutar_varianta_lamarckiana,
+}
+
+# Parámetros que no se envían a las islas: se reconstruyen en cada proceso (la instrumentación
+# mide solo el proceso principal; cada isla aplica los criterios de parada por su cuenta)
+_PARAMETROS_LOCALES = ('flujo_disperso', 'instancia_compartida', 'migracion', 'instrumentacion', 'control_parada')
+
+
+class Migracion:
+    """
+    Gancho de migración que los drivers llaman tras evaluar cada generación (parametros['migracion']).
+
+    Cada 'intervalo' generaciones envía copias de sus 'migrantes' mejores individuos (con su fitness) a
+    los buzones de las islas destino según la topología, y recoge sin esperar los inmigrantes que
+    hayan llegado a su buzón: los mejores sustituyen a los peores residentes si los mejoran. La
+    migración es asíncrona, así que una isla lenta nunca bloquea a las demás.
+
+    Args:
+        isla (int): Índice de esta isla.
+        buzones (list): Cola de entrada de cada isla (multiprocessing.Queue, sobre pipes).
+        topologia (str): Una de TOPOLOGIAS_MIGRACION.
+        intervalo (int): Generaciones entre migraciones.
+        migrantes (int): Individuos enviados en cada migración.
+        rng (numpy.random.Generator, optional): Generador para la topología aleatoria.
+    """
+
+    def __init__(self, isla, buzones, topologia='anillo', intervalo=10, migrantes=2, rng=None):
+        if topologia not in TOPOLOGIAS_MIGRACION:
+            raise ValueError(f"Topología de migración desconocida: {topologia}. Opciones: {TOPOLOGIAS_MIGRACION}")
+        self.isla = isla
+        self.buzones = buzones
+        self.topologia = topologia
+        self.intervalo = intervalo
+        self.migrantes = migrantes
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.enviados = 0
+        self.recibidos = 0
+
+    def destinos(self):
+        """
+        Devuelve las islas a las que se envían los emigrantes en esta migración.
+        """
+        otras = [j for j in range(len(self.buzones)) if j != self.isla]
+        if not otras:
+            return []
+        if self.topologia == 'anillo':
+            return [(self.isla + 1) % len(self.buzones)]
+        if self.topologia == 'aleatoria':
+            return [otras[self.rng.integers(len(otras))]]
+        return otras
+
+    def __call__(self, generacion, poblacion, fitness):
+        if self.intervalo <= 0 or (generacion + 1) % self.intervalo:
+            return
+        orden = np.argsort(fitness)
+
+        # Emigración: copias de los mejores
+        emigrantes = (poblacion[orden[:self.migrantes]].copy(), np.asarray(fitness)[orden[:self.migrantes]].copy())
+        for destino in self.destinos():
+            self.buzones[destino].put(emigrantes)
+            self.enviados += len(emigrantes[0])
+
+        # Inmigración: todo lo que haya llegado, sin esperar
+        llegados = []
+        while True:
+            try:
+                llegados.append(self.buzones[self.isla].get_nowait())
+            except queue.Empty:
+                break
+        if not llegados:
+            return
+        individuos = np.concatenate([ind for ind, _ in llegados])
+        fitness_llegados = np.concatenate([fit for _, fit in llegados])
+
+        # Los mejores inmigrantes frente a los peores residentes (nunca se sustituye al mejor residente)
+        k = min(len(individuos), len(poblacion) - 1)
+        mejores = np.argsort(fitness_llegados)[:k]
+        peores = orden[::-1][:k]
+        mejora = fitness_llegados[mejores] < fitness[peores]
+        poblacion[peores[mejora]] = individuos[mejores[mejora]]
+        fitness[peores[mejora]] = fitness_llegados[mejores[mejora]]
+        self.recibidos += int(mejora.sum())
+
+
+def _ejecutar_isla(isla, descriptor, variante, parametros, semilla, buzones, resultados, opciones_migracion, hilos):
+    """
+    Proceso de una isla: se adjunta a la instancia en memoria compartida, ejecuta la variante con el
+    gancho de migración y envía (isla, mejor solución, historial, enviados, recibidos, segundos, motivo de
+    parada) a 'resultados'.
+    """
+    try:
+        flujo_matrix, distancia_matrix, flujo_disperso, segmentos = adjuntar_instancia(descriptor)
+        set_num_threads(hilos)
+        random.seed(semilla)
+        np.random.seed(semilla)
+        # Los migrantes enviados a una isla que ya ha terminado se descartan al salir, en lugar de bloquear
+        for j, buzon in enumerate(buzones):
+            if j != isla:
+                buzon.cancel_join_thread()
+
+        migracion = Migracion(isla, buzones, rng=np.random.default_rng(semilla), **opciones_migracion)
+        control = ControlParada.desde_parametros(parametros)
+        parametros = dict(parametros, flujo_disperso=flujo_disperso, migracion=migracion, semilla_poblacion=semilla,
+                          control_parada=control)
+        inicio = time.perf_counter()
+        mejor_solucion, historial = VARIANTES_ISLA[variante](len(flujo_matrix), flujo_matrix, distancia_matrix,
+                                                             parametros)
+        resultados.put((isla, (np.array(mejor_solucion[0]), float(mejor_solucion[1])), [float(h) for h in historial],
+                        migracion.enviados, migracion.recibidos, time.perf_counter() - inicio, control.motivo))
+        del segmentos
+    except Exception:
+        resultados.put((isla, None, traceback.format_exc(), 0, 0, 0.0, None))
+
+
+def ejecutar_modelo_islas(n, flujo_matrix, distancia_matrix, parametros=None):
+    """
+    Ejecuta el modelo de islas: 'islas' subpoblaciones de la variante 'variante_isla', cada una en
+    su propio proceso, que intercambian individuos periódicamente (ver Migracion).
+
+    Las matrices se colocan una sola vez en memoria compartida (src.shared_instance) y los migrantes
+    viajan por colas (pipes), sin archivos intermedios. Los hilos de numba se reparten entre las islas
+    para no sobresuscribir la máquina.
+
+    Args:
+        n (int): Número de instalaciones/localizaciones.
+        flujo_matrix (numpy.ndarray): Matriz de flujos, shape=(n, n).
+        distancia_matrix (numpy.ndarray): Matriz de distancias, shape=(n, n).
+        parametros (dict, optional): Parámetros de la variante de cada isla y del modelo de islas
+            ('islas', 'variante_isla', 'topologia', 'intervalo_migracion', 'migrantes').
+
+    Returns:
+        tuple: Mejor solución encontrada (individuo, coste) y su historial de fitness (mejor de todas las islas por generación).
+    """
+    if parametros is None:
+        parametros = {
+            'poblacion': 100,
+            'generaciones': 500,
+            'tasa_cruce': 0.8,
+            'tasa_mutacion': 0.02,
+            'elitismo': True
+        }
+    islas = parametros.get('islas') or os.cpu_count() or 1
+    variante = parametros.get('variante_isla', 'standard')
+    if variante not in VARIANTES_ISLA:
+        raise ValueError(f"Variante de isla desconocida: {variante}. Opciones: {tuple(VARIANTES_ISLA)}")
+    opciones_migracion = {
+        'topologia': parametros.get('topologia', 'anillo'),
+        'intervalo': parametros.get('intervalo_migracion', 10),
+        'migrantes': parametros.get('migrantes', 2),
+    }
+    if opciones_migracion['topologia'] not in TOPOLOGIAS_MIGRACION:
+        raise ValueError(f"Topología de migración desconocida: {opciones_migracion['topologia']}. "
+                         f"Opciones: {TOPOLOGIAS_MIGRACION}")
+    parametros_isla = {clave: valor for clave, valor in parametros.items() if clave not in _PARAMETROS_LOCALES}
+    hilos = max(1, get_num_threads() // islas)
+    semillas = np.random.randint(0, 2 ** 31 - 1, size=islas)
+
+    instancia = parametros.get('instancia_compartida')
+    propietario = instancia is None
+    if propietario:
+        instancia = InstanciaCompartida(flujo_matrix, distancia_matrix, parametros.get('flujo_disperso'))
+
+    # 'spawn' como en crear_ejecutor_busqueda_local: fork tras lanzar hilos de numba puede bloquear
+    contexto = mp.get_context('spawn')
+    buzones = [contexto.Queue() for _ in range(islas)]
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=_ejecutar_isla, daemon=True,
+                         args=(i, instancia.descriptor, variante, parametros_isla, int(semillas[i]), buzones,
+                               resultados, opciones_migracion, hilos))
+        for i in range(islas)
+    ]
+    inicio = time.perf_counter()
+    try:
+        for proceso in procesos:
+            proceso.start()
+        recibidos = {}
+        while len(recibidos) < islas:
+            try:
+                isla, mejor, historial, enviados, inmigrantes, segundos, motivo = resultados.get(timeout=1.0)
+            except queue.Empty:
+                caidos = [i for i, p in enumerate(procesos) if i not in recibidos and not p.is_alive()]
+                if caidos:
+                    raise RuntimeError(f"Las islas {caidos} terminaron sin devolver resultado")
+                continue
+            if mejor is None:
+                raise RuntimeError(f"Error en la isla {isla}:\n{historial}")
+            recibidos[isla] = (mejor, historial, enviados, inmigrantes, segundos, motivo)
+        for proceso in procesos:
+            proceso.join()
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive():
+                proceso.terminate()
+        if propietario:
+            instancia.cerrar()
+    duracion = time.perf_counter() - inicio
+
+    for isla in range(islas):
+        mejor, _, enviados, inmigrantes, segundos, motivo = recibidos[isla]
+        logging.info(f"Isla {isla}: mejor coste = {mejor[1]}, {enviados} migrantes enviados, "
+                     f"{inmigrantes} aceptados, {segundos:.2f} s, parada por {motivo}")
+    logging.info(f"Modelo de islas: {islas} islas ({variante}, topología {opciones_migracion['topologia']}) "
+                 f"en {duracion:.2f} s")
+
+    mejor_isla = min(recibidos, key=lambda isla: recibidos[isla][0][1])
+    mejor_solucion = recibidos[mejor_isla][0]
+    # El motivo de parada del modelo es el de la isla con la mejor solución
+    if parametros.get('control_parada') is not None:
+        parametros['control_parada'].motivo = recibidos[mejor_isla][5]
+    longitud = min(len(r[1]) for r in recibidos.values())
+    historial = np.min([r[1][:longitud] for r in recibidos.values()], axis=0).tolist()
+    return mejor_solucion, historial
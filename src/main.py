@@ -9,8 +9,22 @@ import numpy as np
 from src.genetic_algorithm import ejecutar_algoritmo_genetico
 from src.baldwinian_ga import ejecutar_varianta_baldwiniana
 from src.lamarckian_ga import ejecutar_varianta_lamarckiana
-from src.utils import cargar_datos
+from src.tabu_search import ejecutar_busqueda_tabu
+from src.simulated_annealing import ejecutar_recocido_simulado, ENFRIAMIENTOS
+from src.island_model import ejecutar_modelo_islas, TOPOLOGIAS_MIGRACION, VARIANTES_ISLA
+from src.optimization import (MOTORES_BUSQUEDA_LOCAL, BACKENDS_BUSQUEDA_LOCAL, ESTRATEGIAS_BUSQUEDA_LOCAL,
+                              ITERACIONES_TABU_POR_N)
+from src.reproduccion import MODOS_REPRODUCCION
+from src.selection import METODOS_SELECCION
+from src.mutation import OPERADORES_MUTACION
+from src.crossover import OPERADORES_CRUCE
+from src.utils import cargar_datos, DIRECTORIO_CACHE_DEFECTO
+from src.fitness import BACKENDS_FITNESS
+from src.cache import (TAM_CACHE_FITNESS_DEFECTO, FRACCION_INCREMENTAL_DEFECTO, TAM_MEMO_BUSQUEDA_LOCAL_DEFECTO,
+                       MAX_BYTES_MEMO_DEFECTO)
 from src.plotting import graficar_historial, graficar_comparativa
+from src.instrumentation import Instrumentacion, perfilar, GANCHOS_PERFIL
+from src.termination import ControlParada
 
 
 def configurar_logging(ruta_salida):
@@ -31,19 +45,22 @@ def configurar_logging(ruta_salida):
     )
 
 
-def guardar_resultados(mejor_solucion, ruta_salida):
+def guardar_resultados(mejor_solucion, ruta_salida, motivo_parada=None):
     """
     Guarda la mejor solución encontrada en un archivo de texto.
 
     Args:
         mejor_solucion (tuple): Tupla que contiene la permutación y el coste.
         ruta_salida (str): Directorio donde se guardará el archivo.
+        motivo_parada (str, optional): Motivo por el que terminó el Algoritmo Genético (ver src.termination).
     """
     archivo_resultado = os.path.join(ruta_salida, 'mejor_solucion.txt')
     try:
         with open(archivo_resultado, 'w', encoding='utf-8') as f:
             f.write(f"Coste de la mejor solución: {mejor_solucion[1]}\n")
             f.write("Permutación: " + ' '.join(map(str, mejor_solucion[0])) + "\n")
+            if motivo_parada is not None:
+                f.write(f"Motivo de parada: {motivo_parada}\n")
         logging.info(f"Mejor solución guardada en {archivo_resultado}")
     except Exception as e:
         logging.error(f"Error al guardar la mejor solución: {e}")
@@ -67,6 +84,30 @@ def guardar_historial(historial, ruta_salida, variant):
         logging.error(f"Error al guardar el historial de fitness: {e}")
 
 
+def guardar_perfil(instrumentacion, perfil, mejor_solucion, args, motivo_parada=None):
+    """
+    Guarda el informe de instrumentación (y el resumen del gancho de perfilado, si lo hay) en perfil.json.
+
+    Args:
+        instrumentacion (Instrumentacion): Instrumentación de la ejecución.
+        perfil (dict o None): Resumen devuelto por src.instrumentation.perfilar.
+        mejor_solucion (tuple): Mejor solución encontrada (individuo, coste).
+        args (argparse.Namespace): Argumentos de la ejecución.
+        motivo_parada (str, optional): Motivo por el que terminó el Algoritmo Genético.
+    """
+    archivo_perfil = os.path.join(args.output, 'perfil.json')
+    instrumentacion.extra.update(variante=args.variant, datos=args.data, semilla=args.seed, n=len(mejor_solucion[0]),
+                                 mejor_coste=float(mejor_solucion[1]), motivo_parada=motivo_parada)
+    if perfil is not None:
+        instrumentacion.extra['perfil'] = perfil
+    try:
+        instrumentacion.guardar(archivo_perfil)
+        instrumentacion.registrar_resumen()
+        logging.info(f"Perfil guardado en {archivo_perfil}")
+    except Exception as e:
+        logging.error(f"Error al guardar el perfil: {e}")
+
+
 def fijar_semilla(seed):
     """
     Fija la semilla para los generadores de números aleatorios.
@@ -79,12 +120,19 @@ def fijar_semilla(seed):
     logging.info(f"Semilla fijada en: {seed}")
 
 
-def main():
-    # Definir argumentos de línea de comandos
+def crear_parser():
+    """
+    Crea el parser de los argumentos de línea de comandos (también lo usa src.experiments para
+    describir cada trabajo de una rejilla con los mismos argumentos).
+
+    Returns:
+        argparse.ArgumentParser: Parser de los argumentos.
+    """
     parser = argparse.ArgumentParser(description='Algoritmos Genéticos para el Problema de Asignación Cuadrática (QAP)')
     parser.add_argument('--variant', type=str, required=True,
-                        choices=['standard', 'baldwinian', 'lamarckian'],
-                        help='Variante del Algoritmo Genético a ejecutar')
+                        choices=['standard', 'baldwinian', 'lamarckian', 'tabu', 'sa', 'island'],
+                        help='Variante del Algoritmo Genético a ejecutar (tabu: búsqueda tabú robusta independiente; '
+                             'sa: recocido simulado con cadenas en paralelo; island: modelo de islas en varios procesos)')
     parser.add_argument('--data', type=str, required=True,
                         help='Ruta al archivo de datos (e.g., data/raw/tai256c.dat)')
     parser.add_argument('--output', type=str, required=True,
@@ -103,22 +151,122 @@ def main():
                         help='Activar elitismo')
     parser.add_argument('--seed', type=int, default=None,
                         help='Semilla para los generadores de números aleatorios')
+    parser.add_argument('--time_limit', type=float, default=None,
+                        help='Tiempo máximo en segundos del Algoritmo Genético (comprobado tras cada generación)')
+    parser.add_argument('--target_cost', type=float, default=None,
+                        help='Coste objetivo: el Algoritmo Genético para al alcanzar un coste menor o igual')
+    parser.add_argument('--max_evaluations', type=int, default=None,
+                        help='Número máximo de evaluaciones de fitness: las calculadas de la población (sin los '
+                             'aciertos de la caché) más, en las variantes híbridas, las iteraciones de la búsqueda local')
+    parser.add_argument('--stagnation', type=int, default=None,
+                        help='Generaciones sin mejorar el mejor coste tras las que para el Algoritmo Genético; la '
+                             'diversidad de la población solo se tiene en cuenta si se da --min_diversity')
+    parser.add_argument('--min_diversity', type=float, default=None,
+                        help='Con --stagnation, para solo si además la diversidad de la población (distancia de '
+                             'Hamming media normalizada, entre 0 y 1) es menor que este valor')
+    parser.add_argument('--fitness_backend', type=str, default='auto', choices=list(BACKENDS_FITNESS),
+                        help='Backend para evaluar la población (numpy por bloques, kernel numba paralelo o disperso: '
+                             'kernel CSR sobre los flujos no nulos; auto: disperso si la matriz de flujos es dispersa '
+                             'y numpy si no)')
+
+    # Opcionales: Operadores y evaluación del Algoritmo Genético
+    parser.add_argument('--selection', type=str, default='torneo', choices=list(METODOS_SELECCION),
+                        help='Método de selección de padres (torneo, ranking lineal o muestreo universal estocástico)')
+    parser.add_argument('--tournament_size', type=int, default=3,
+                        help='Número de individuos de cada torneo')
+    parser.add_argument('--rank_pressure', type=float, default=1.5,
+                        help='Presión selectiva de la selección por ranking lineal (entre 1 y 2)')
+    parser.add_argument('--mutation', type=str, default='swap', choices=list(OPERADORES_MUTACION),
+                        help='Operador de mutación por lotes (swap, insercion, scramble o inversion)')
+    parser.add_argument('--crossover', type=str, default='pmx', choices=list(OPERADORES_CRUCE),
+                        help='Operador de cruce (pmx, ox: orden, cx: cíclico, posiciones o uniforme: UPMX)')
+    parser.add_argument('--reproduction', type=str, default='vectorizada', choices=list(MODOS_REPRODUCCION),
+                        help='Generación de la siguiente población en el AG estándar (vectorizada: generación completa '
+                             'con operaciones por lotes; legacy: bucle original pareja a pareja)')
+    parser.add_argument('--fitness_cache', type=int, default=TAM_CACHE_FITNESS_DEFECTO,
+                        help='Número de permutaciones en la caché LRU de fitness (0 la desactiva)')
+    parser.add_argument('--incremental_fraction', type=float, default=FRACCION_INCREMENTAL_DEFECTO,
+                        help='Fracción máxima de genes cambiados respecto al padre para evaluar un hijo de forma '
+                             'incremental en el AG estándar (0 la desactiva)')
 
     # Opcionales: Parámetros de Búsqueda Local
     parser.add_argument('--hill_climbing_max_iter', type=int, default=1000,
                         help='Número máximo de iteraciones para Hill Climbing')
     parser.add_argument('--opt_population_size', type=int, default=50,
                         help='Tamaño de la población a optimizar mediante Búsqueda Local')
+    parser.add_argument('--local_search', type=str, default='mascara',
+                        choices=list(MOTORES_BUSQUEDA_LOCAL),
+                        help='Motor de búsqueda local (mascara: vecinos aleatorios con máscara; '
+                             'tabla_deltas: vecindario completo con tabla de deltas; '
+                             'bits_no_mirar: vecindario completo con bits de "no mirar" por instalación)')
+    parser.add_argument('--ls_strategy', type=str, default='primera', choices=list(ESTRATEGIAS_BUSQUEDA_LOCAL),
+                        help='Estrategia del motor bits_no_mirar: primera mejora o mejor mejora por instalación')
+    parser.add_argument('--ls_backend', type=str, default='secuencial',
+                        choices=list(BACKENDS_BUSQUEDA_LOCAL),
+                        help='Backend de la búsqueda local por lotes (secuencial, procesos o hilos con motores numba)')
+    parser.add_argument('--ls_memo', type=int, default=TAM_MEMO_BUSQUEDA_LOCAL_DEFECTO,
+                        help='Entradas de la memoria LRU de resultados de la búsqueda local (0 la desactiva)')
+    parser.add_argument('--ls_memo_mb', type=float, default=MAX_BYTES_MEMO_DEFECTO / 1024 ** 2,
+                        help='Memoria máxima (MiB) de la memoria de resultados de la búsqueda local')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Número de trabajadores de la búsqueda local en paralelo (por defecto, número de CPUs)')
+    parser.add_argument('--tabu_iterations', type=int, default=None,
+                        help=f'Iteraciones de la búsqueda tabú robusta (variante tabu; por defecto '
+                             f'{ITERACIONES_TABU_POR_N}·n si no hay --tabu_time_limit)')
+    parser.add_argument('--tabu_time_limit', type=float, default=None,
+                        help='Tiempo máximo en segundos de la búsqueda tabú robusta (variante tabu)')
+    parser.add_argument('--tabu_tenure', type=int, nargs=2, default=None, metavar=('MIN', 'MAX'),
+                        help='Rango de la tenencia tabú (por defecto 0.9·n y 1.1·n)')
+    parser.add_argument('--tabu_aspiration', type=int, default=None,
+                        help='Iteraciones sin usar una asignación tras las que se fuerza (por defecto 5·n²)')
+    parser.add_argument('--sa_chains', type=int, default=None,
+                        help='Cadenas de recocido simulado en paralelo (variante sa; por defecto, una por hilo de numba)')
+    parser.add_argument('--sa_moves', type=int, default=None,
+                        help='Movimientos propuestos por cadena (variante sa; por defecto 100000·n si no hay --sa_time_limit)')
+    parser.add_argument('--sa_time_limit', type=float, default=None,
+                        help='Tiempo máximo en segundos del recocido simulado (variante sa)')
+    parser.add_argument('--sa_cooling', type=str, default='geometrico', choices=list(ENFRIAMIENTOS),
+                        help='Enfriamiento del recocido simulado (geometrico o adaptativo)')
+    parser.add_argument('--sa_initial_temperature', type=float, default=None,
+                        help='Temperatura inicial (por defecto, la que acepta la mitad de los empeoramientos medios)')
+    parser.add_argument('--sa_reheat', type=int, default=200,
+                        help='Épocas sin mejora con las cadenas congeladas tras las que se recalienta (0 lo desactiva)')
+    parser.add_argument('--islands', type=int, default=None,
+                        help='Número de islas, cada una en su propio proceso (variante island; por defecto, número de CPUs)')
+    parser.add_argument('--island_variant', type=str, default='standard', choices=list(VARIANTES_ISLA),
+                        help='Variante que ejecuta cada isla; --population es el tamaño de cada subpoblación')
+    parser.add_argument('--migration_topology', type=str, default='anillo', choices=list(TOPOLOGIAS_MIGRACION),
+                        help='Topología de migración entre islas (anillo, aleatoria o completa)')
+    parser.add_argument('--migration_interval', type=int, default=10,
+                        help='Generaciones entre migraciones (0 las desactiva)')
+    parser.add_argument('--migrants', type=int, default=2,
+                        help='Individuos que envía cada isla en cada migración')
+    parser.add_argument('--cache_dir', type=str, default=DIRECTORIO_CACHE_DEFECTO,
+                        help='Directorio de la caché binaria de instancias (por defecto, data/cache)')
+    parser.add_argument('--no_cache', action='store_true',
+                        help='Lee siempre el archivo de texto sin usar la caché binaria')
+    parser.add_argument('--quiet', action='store_true',
+                        help='No imprime el progreso por generación de los drivers (tampoco en los procesos de las '
+                             'islas); el log no cambia')
+    parser.add_argument('--profile', action='store_true',
+                        help='Mide el tiempo de cada fase y los contadores por generación y los guarda en perfil.json')
+    parser.add_argument('--profile_hook', type=str, default=None, choices=list(GANCHOS_PERFIL),
+                        help='Envuelve la ejecución en cProfile (perfil.prof) o tracemalloc; implica --profile')
+    return parser
 
-    args = parser.parse_args()
 
-    # Crear directorio de salida si no existe
-    os.makedirs(args.output, exist_ok=True)
+def ejecutar(args):
+    """
+    Ejecuta la variante indicada en 'args' y guarda sus resultados en args.output (que debe existir).
+    Los errores se escriben en el log y se propagan.
 
-    # Configurar logging
-    configurar_logging(args.output)
-    logging.info("Inicio de la ejecución del Algoritmo Genético")
+    Args:
+        args (argparse.Namespace): Argumentos de la ejecución (ver crear_parser).
 
+    Returns:
+        tuple: Mejor solución encontrada (individuo, coste), su historial de fitness y el motivo de
+            parada (None en las variantes tabu y sa).
+    """
     # Fijar la semilla si se proporcionó
     if args.seed is not None:
         fijar_semilla(args.seed)
@@ -127,12 +275,26 @@ def main():
 
     # Cargar datos
     try:
-        n, flow_matrix, distance_matrix = cargar_datos(args.data)
+        n, flow_matrix, distance_matrix, flujo_disperso = cargar_datos(args.data, detectar_dispersion=True,
+                                                                       cache=not args.no_cache and args.cache_dir)
         logging.info(f"Datos cargados correctamente desde {args.data}")
         logging.info(f"Número de instalaciones/localizaciones: {n}")
     except Exception as e:
         logging.error(f"Error al cargar los datos: {e}")
-        sys.exit(1)
+        raise
+
+    # Instrumentación de las fases del bucle generacional (ver src.instrumentation)
+    instrumentacion = Instrumentacion() if args.profile or args.profile_hook else None
+
+    # Criterios de parada de las variantes del Algoritmo Genético, además de --generations (ver src.termination)
+    criterios_parada = {
+        'tiempo_limite': args.time_limit,
+        'coste_objetivo': args.target_cost,
+        'max_evaluaciones': args.max_evaluations,
+        'estancamiento': args.stagnation,
+        'diversidad_minima': args.min_diversity
+    }
+    control_parada = ControlParada.desde_parametros(criterios_parada)
 
     # Definir parámetros del Algoritmo Genético
     parametros = {
@@ -140,7 +302,21 @@ def main():
         'generaciones': args.generations,
         'tasa_cruce': args.crossover_rate,
         'tasa_mutacion': args.mutation_rate,
-        'elitismo': args.elitismo
+        'elitismo': args.elitismo,
+        'backend_fitness': args.fitness_backend,
+        'tam_cache_fitness': args.fitness_cache,
+        'fraccion_incremental': args.incremental_fraction,
+        'reproduccion': args.reproduction,
+        'seleccion': args.selection,
+        'k_torneo': args.tournament_size,
+        'presion_ranking': args.rank_pressure,
+        'mutacion': args.mutation,
+        'cruce': args.crossover,
+        'flujo_disperso': flujo_disperso,
+        'instrumentacion': instrumentacion,
+        'control_parada': control_parada,
+        'mostrar_progreso': not args.quiet,
+        **criterios_parada
     }
 
     # Definir parámetros adicionales para Baldwinian y Lamarckian
@@ -150,27 +326,95 @@ def main():
         'tasa_cruce': args.crossover_rate,
         'tasa_mutacion': args.mutation_rate,
         'elitismo': args.elitismo,
+        'backend_fitness': args.fitness_backend,
+        'tam_cache_fitness': args.fitness_cache,
+        'seleccion': args.selection,
+        'k_torneo': args.tournament_size,
+        'presion_ranking': args.rank_pressure,
+        'mutacion': args.mutation,
+        'cruce': args.crossover,
+        'flujo_disperso': flujo_disperso,
+        'instrumentacion': instrumentacion,
+        'control_parada': control_parada,
+        'mostrar_progreso': not args.quiet,
+        **criterios_parada,
         'tam_poblacion_opt': args.opt_population_size,  # Tamaño de población a optimizar
-        'hill_climbing_max_iter': args.hill_climbing_max_iter
+        'hill_climbing_max_iter': args.hill_climbing_max_iter,
+        'motor_busqueda_local': args.local_search,
+        'estrategia_busqueda_local': args.ls_strategy,
+        'backend_busqueda_local': args.ls_backend,
+        'tam_memo_busqueda_local': args.ls_memo,
+        'max_bytes_memo': int(args.ls_memo_mb * 1024 ** 2),
+        'trabajadores': args.workers
     }
 
-    # Ejecutar la variante seleccionada
-    try:
+    # Parámetros de la búsqueda tabú robusta independiente
+    parametros_tabu = {
+        'iteraciones_tabu': args.tabu_iterations,
+        'tiempo_limite_tabu': args.tabu_time_limit,
+        'tenencia_tabu': args.tabu_tenure,
+        'aspiracion_tabu': args.tabu_aspiration,
+        'instrumentacion': instrumentacion
+    }
+
+    # Parámetros del recocido simulado
+    parametros_sa = {
+        'cadenas': args.sa_chains,
+        'movimientos_sa': args.sa_moves,
+        'tiempo_limite_sa': args.sa_time_limit,
+        'enfriamiento': args.sa_cooling,
+        'temperatura_inicial': args.sa_initial_temperature,
+        'epocas_recalentamiento': args.sa_reheat,
+        'instrumentacion': instrumentacion
+    }
+
+    # Parámetros del modelo de islas, sobre los de la variante que ejecuta cada isla
+    parametros_islas = dict(parametros if args.island_variant == 'standard' else parametros2,
+                            islas=args.islands, variante_isla=args.island_variant,
+                            topologia=args.migration_topology, intervalo_migracion=args.migration_interval,
+                            migrantes=args.migrants)
+
+    def ejecutar_variante():
+        """
+        Ejecuta la variante seleccionada y devuelve (mejor solución, historial).
+        """
         if args.variant == 'standard':
-            mejor_solucion, historial = ejecutar_algoritmo_genetico(n, flow_matrix, distance_matrix, parametros)
+            resultado = ejecutar_algoritmo_genetico(n, flow_matrix, distance_matrix, parametros)
             logging.info("Algoritmo Genético Estándar ejecutado con éxito.")
         elif args.variant == 'baldwinian':
-            mejor_solucion, historial = ejecutar_varianta_baldwiniana(n, flow_matrix, distance_matrix, parametros2)
+            resultado = ejecutar_varianta_baldwiniana(n, flow_matrix, distance_matrix, parametros2)
             logging.info("Variante Baldwiniana ejecutada con éxito.")
         elif args.variant == 'lamarckian':
-            mejor_solucion, historial = ejecutar_varianta_lamarckiana(n, flow_matrix, distance_matrix, parametros2)
+            resultado = ejecutar_varianta_lamarckiana(n, flow_matrix, distance_matrix, parametros2)
             logging.info("Variante Lamarckiana ejecutada con éxito.")
+        elif args.variant == 'tabu':
+            resultado = ejecutar_busqueda_tabu(n, flow_matrix, distance_matrix, parametros_tabu)
+            logging.info("Búsqueda tabú robusta ejecutada con éxito.")
+        elif args.variant == 'sa':
+            resultado = ejecutar_recocido_simulado(n, flow_matrix, distance_matrix, parametros_sa)
+            logging.info("Recocido simulado ejecutado con éxito.")
+        elif args.variant == 'island':
+            resultado = ejecutar_modelo_islas(n, flow_matrix, distance_matrix, parametros_islas)
+            logging.info("Modelo de islas ejecutado con éxito.")
+        return resultado
+
+    # Ejecutar la variante seleccionada (con cProfile o tracemalloc si se pide)
+    try:
+        (mejor_solucion, historial), perfil = perfilar(ejecutar_variante, args.profile_hook,
+                                                       os.path.join(args.output, 'perfil'))
     except Exception as e:
         logging.error(f"Error durante la ejecución de la variante {args.variant}: {e}")
-        sys.exit(1)
+        raise
+
+    # Motivo de parada de las variantes del Algoritmo Genético (tabu y sa tienen su propio presupuesto)
+    motivo_parada = control_parada.motivo if args.variant in ('standard', 'baldwinian', 'lamarckian', 'island') else None
+
+    # Guardar el informe de instrumentación junto a la mejor solución
+    if instrumentacion is not None:
+        guardar_perfil(instrumentacion, perfil, mejor_solucion, args, motivo_parada)
 
     # Guardar resultados
-    guardar_resultados(mejor_solucion, args.output)
+    guardar_resultados(mejor_solucion, args.output, motivo_parada)
 
     # Guardar historial de fitness
     guardar_historial(historial, args.output, variant=args.variant)
@@ -182,6 +426,24 @@ def main():
     except Exception as e:
         logging.error(f"Error al graficar el historial de fitness: {e}")
 
+    return mejor_solucion, historial, motivo_parada
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    # Crear directorio de salida si no existe
+    os.makedirs(args.output, exist_ok=True)
+
+    # Configurar logging
+    configurar_logging(args.output)
+    logging.info("Inicio de la ejecución del Algoritmo Genético")
+
+    try:
+        ejecutar(args)
+    except Exception:
+        sys.exit(1)
+
     logging.info("Ejecución finalizada exitosamente.")
 
 
@@ -3,6 +3,9 @@
 import numpy as np
 import random
 
+# Operadores de mutación por lotes disponibles en mutar_poblacion
+OPERADORES_MUTACION = ('swap', 'insercion', 'scramble', 'inversion')
+
 def mutacion_swap(individuo, tasa_mutacion):
     """
     Realiza una mutación de intercambio en el individuo con una cierta probabilidad.
@@ -18,4 +21,160 @@ def mutacion_swap(individuo, tasa_mutacion):
     if random.random() < tasa_mutacion:
         i, j = random.sample(range(len(individuo)), 2)
         individuo_mutado[i], individuo_mutado[j] = individuo_mutado[j], individuo_mutado[i]
-    return individuo_mutado
\ No newline at end of file
+    return individuo_mutado
+
+def mutacion_swap_poblacion(poblacion, tasa_mutacion, rng=None):
+    """
+    Aplica la mutación de intercambio a toda la población, in situ.
+
+    Cada individuo muta con probabilidad 'tasa_mutacion' (máscara de Bernoulli); a los que mutan se
+    les intercambian dos posiciones distintas elegidas al azar, todo ello con indexado avanzado y sin
+    copiar los individuos que no mutan.
+
+    Args:
+        poblacion (numpy.ndarray): Población a mutar, shape=(poblacion, n). Se modifica in situ.
+        tasa_mutacion (float): Probabilidad de que cada individuo mute.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos mutados.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    tam_poblacion, n = poblacion.shape
+    mutados = np.flatnonzero(rng.random(tam_poblacion) < tasa_mutacion)
+    if mutados.size == 0 or n < 2:
+        return mutados
+    i = rng.integers(0, n, size=mutados.size)
+    j = rng.integers(0, n - 1, size=mutados.size)
+    j += j >= i
+    valores_i = poblacion[mutados, i]
+    poblacion[mutados, i] = poblacion[mutados, j]
+    poblacion[mutados, j] = valores_i
+    return mutados
+
+
+def _segmentos_aleatorios(num, n, rng):
+    """
+    Genera 'num' segmentos [inicio, fin] (ambos incluidos) con inicio < fin.
+    """
+    a = rng.integers(0, n, size=num)
+    b = rng.integers(0, n - 1, size=num)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def _reordenar_filas(poblacion, filas, origen):
+    """
+    Sustituye cada fila 'filas[f]' de la población por poblacion[filas[f], origen[f]].
+    """
+    poblacion[filas] = poblacion[filas[:, np.newaxis], origen]
+
+
+def mutacion_insercion_poblacion(poblacion, tasa_mutacion, rng=None):
+    """
+    Mutación de inserción por lotes, in situ: en cada individuo que muta (máscara de Bernoulli) se
+    extrae el elemento de una posición i y se inserta en otra posición j, desplazando los intermedios.
+
+    Args:
+        poblacion (numpy.ndarray): Población a mutar, shape=(poblacion, n). Se modifica in situ.
+        tasa_mutacion (float): Probabilidad de que cada individuo mute.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos mutados.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    tam_poblacion, n = poblacion.shape
+    mutados = np.flatnonzero(rng.random(tam_poblacion) < tasa_mutacion)
+    if mutados.size == 0 or n < 2:
+        return mutados
+    i = rng.integers(0, n, size=mutados.size)[:, np.newaxis]
+    j = rng.integers(0, n - 1, size=mutados.size)[:, np.newaxis]
+    j += j >= i
+    posiciones = np.arange(n)[np.newaxis, :]
+    # Hacia delante (i < j) los elementos de [i, j) avanzan una posición; hacia atrás, los de (j, i] retroceden
+    origen = posiciones + ((posiciones >= i) & (posiciones < j)) - ((posiciones > j) & (posiciones <= i))
+    origen = np.where(posiciones == j, i, origen)
+    _reordenar_filas(poblacion, mutados, origen)
+    return mutados
+
+
+def mutacion_inversion_poblacion(poblacion, tasa_mutacion, rng=None):
+    """
+    Mutación de inversión por lotes, in situ: invierte un segmento aleatorio de cada individuo que muta.
+
+    Args:
+        poblacion (numpy.ndarray): Población a mutar, shape=(poblacion, n). Se modifica in situ.
+        tasa_mutacion (float): Probabilidad de que cada individuo mute.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos mutados.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    tam_poblacion, n = poblacion.shape
+    mutados = np.flatnonzero(rng.random(tam_poblacion) < tasa_mutacion)
+    if mutados.size == 0 or n < 2:
+        return mutados
+    inicio, fin = _segmentos_aleatorios(mutados.size, n, rng)
+    inicio, fin = inicio[:, np.newaxis], fin[:, np.newaxis]
+    posiciones = np.arange(n)[np.newaxis, :]
+    origen = np.where((posiciones >= inicio) & (posiciones <= fin), inicio + fin - posiciones, posiciones)
+    _reordenar_filas(poblacion, mutados, origen)
+    return mutados
+
+
+def mutacion_scramble_poblacion(poblacion, tasa_mutacion, rng=None):
+    """
+    Mutación scramble por lotes, in situ: baraja un segmento aleatorio de cada individuo que muta.
+
+    Las posiciones fuera del segmento reciben como clave su propio índice y las del segmento una
+    clave aleatoria dentro de [inicio, fin + 1), de modo que un único argsort por filas baraja solo
+    el segmento.
+
+    Args:
+        poblacion (numpy.ndarray): Población a mutar, shape=(poblacion, n). Se modifica in situ.
+        tasa_mutacion (float): Probabilidad de que cada individuo mute.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos mutados.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    tam_poblacion, n = poblacion.shape
+    mutados = np.flatnonzero(rng.random(tam_poblacion) < tasa_mutacion)
+    if mutados.size == 0 or n < 2:
+        return mutados
+    inicio, fin = _segmentos_aleatorios(mutados.size, n, rng)
+    inicio, fin = inicio[:, np.newaxis], fin[:, np.newaxis]
+    posiciones = np.arange(n)[np.newaxis, :]
+    aleatorias = inicio + rng.random((mutados.size, n)) * (fin - inicio + 1)
+    claves = np.where((posiciones >= inicio) & (posiciones <= fin), aleatorias, posiciones)
+    _reordenar_filas(poblacion, mutados, np.argsort(claves, axis=1))
+    return mutados
+
+
+def mutar_poblacion(poblacion, tasa_mutacion, operador='swap', rng=None):
+    """
+    Aplica in situ a la población la mutación por lotes indicada.
+
+    Args:
+        poblacion (numpy.ndarray): Población a mutar, shape=(poblacion, n). Se modifica in situ.
+        tasa_mutacion (float): Probabilidad de que cada individuo mute.
+        operador (str, optional): Uno de OPERADORES_MUTACION.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos mutados.
+    """
+    if operador not in _MUTACIONES_POBLACION:
+        raise ValueError(f"Operador de mutación desconocido: {operador}. Opciones: {OPERADORES_MUTACION}")
+    return _MUTACIONES_POBLACION[operador](poblacion, tasa_mutacion, rng)
+
+
+_MUTACIONES_POBLACION = {
+    'swap': mutacion_swap_poblacion,
+    'insercion': mutacion_insercion_poblacion,
+    'scramble': mutacion_scramble_poblacion,
+    'inversion': mutacion_inversion_poblacion
+}
@@ -1,7 +1,32 @@
 import numpy as np
 import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from numba import njit
-from src.fitness import fitness_pop, calcular_coste
+from src.shared_instance import InstanciaCompartida, adjuntar_instancia
+from src.fitness import fitness_pop, calcular_coste, calcular_coste_numba
+from src.cache import claves_permutaciones
+from src.instrumentation import INSTRUMENTACION_NULA
+
+# Motores de búsqueda local disponibles en optimizar_individuo_busqueda_local
+MOTORES_BUSQUEDA_LOCAL = ('mascara', 'mascara_jit', 'tabla_deltas', 'bits_no_mirar', 'tabu')
+
+# Estrategias de aceptación del motor 'bits_no_mirar': primera mejora o mejor mejora por instalación
+ESTRATEGIAS_BUSQUEDA_LOCAL = ('primera', 'mejor')
+
+# Backends de ejecución de optimizar_poblacion
+BACKENDS_BUSQUEDA_LOCAL = ('secuencial', 'procesos', 'hilos')
+
+# Motores compilados con nogil=True, que pueden ejecutarse en paralelo desde hilos
+MOTORES_NOGIL = ('mascara_jit', 'tabla_deltas', 'bits_no_mirar', 'tabu')
+
+# Iteraciones por defecto de la búsqueda tabú robusta sin límite de tiempo, por instalación
+ITERACIONES_TABU_POR_N = 1000
+
+# Matrices de la instancia en cada proceso trabajador (ver _inicializar_trabajador)
+_INSTANCIA_TRABAJADOR = {}
 
 @njit
 def calcular_delta_coste_numba(individuo, flujo_matrix, distancia_matrix, r, s):
@@ -34,6 +59,72 @@ def calcular_delta_coste_numba(individuo, flujo_matrix, distancia_matrix, r, s):
             )
     return delta
 
+@njit
+def calcular_delta_coste_disperso(individuo, indptr, indices, datos, indptr_t, indices_t, datos_t, distancia_matrix, r, s):
+    """
+    Versión dispersa de calcular_delta_coste_numba: solo recorre los flujos no nulos de las
+    filas y columnas r y s de la matriz de flujos (vista CSR, ver src.utils.construir_flujo_disperso).
+
+    Args:
+        individuo (np.ndarray): Permutación actual.
+        indptr, indices, datos (np.ndarray): Matriz de flujos en formato CSR (por filas).
+        indptr_t, indices_t, datos_t (np.ndarray): Traspuesta de la matriz de flujos en formato CSR (por columnas).
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        r (int): Índice de la primera posición a intercambiar.
+        s (int): Índice de la segunda posición a intercambiar.
+
+    Returns:
+        float: Diferencia en el coste tras el intercambio.
+    """
+    delta = 0.0
+    p_r, p_s = individuo[r], individuo[s]
+
+    # Flujos salientes de r y s: F[r, k] y F[s, k]
+    for idx in range(indptr[r], indptr[r + 1]):
+        k = indices[idx]
+        if k != r and k != s:
+            p_k = individuo[k]
+            delta += datos[idx] * (distancia_matrix[p_s, p_k] - distancia_matrix[p_r, p_k])
+    for idx in range(indptr[s], indptr[s + 1]):
+        k = indices[idx]
+        if k != r and k != s:
+            p_k = individuo[k]
+            delta += datos[idx] * (distancia_matrix[p_r, p_k] - distancia_matrix[p_s, p_k])
+
+    # Flujos entrantes en r y s: F[k, r] y F[k, s]
+    for idx in range(indptr_t[r], indptr_t[r + 1]):
+        k = indices_t[idx]
+        if k != r and k != s:
+            p_k = individuo[k]
+            delta += datos_t[idx] * (distancia_matrix[p_k, p_s] - distancia_matrix[p_k, p_r])
+    for idx in range(indptr_t[s], indptr_t[s + 1]):
+        k = indices_t[idx]
+        if k != r and k != s:
+            p_k = individuo[k]
+            delta += datos_t[idx] * (distancia_matrix[p_k, p_r] - distancia_matrix[p_k, p_s])
+    return delta
+
+def calcular_delta_intercambio(individuo, flujo_matrix, distancia_matrix, r, s, flujo_disperso=None):
+    """
+    Calcula el delta de un intercambio usando la vista dispersa de los flujos si está disponible.
+
+    Args:
+        individuo (np.ndarray): Permutación actual.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        r (int): Índice de la primera posición a intercambiar.
+        s (int): Índice de la segunda posición a intercambiar.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
+
+    Returns:
+        float: Diferencia en el coste tras el intercambio.
+    """
+    if flujo_disperso is not None:
+        fd = flujo_disperso
+        return calcular_delta_coste_disperso(individuo, fd.indptr, fd.indices, fd.datos,
+                                             fd.indptr_t, fd.indices_t, fd.datos_t, distancia_matrix, r, s)
+    return calcular_delta_coste_numba(individuo, flujo_matrix, distancia_matrix, r, s)
+
 @njit
 def actualizar_coste_incremental(coste_actual, flujo_matrix, distancia_matrix, individuo, r, s):
     """
@@ -53,7 +144,8 @@ def actualizar_coste_incremental(coste_actual, flujo_matrix, distancia_matrix, i
     delta = calcular_delta_coste_numba(individuo, flujo_matrix, distancia_matrix, r, s)
     return coste_actual + delta
 
-def mejor_vecino_con_mascara(individuo, flujo_matrix, distancia_matrix, mascara, mascara_permutacion, coste_actual, max_vecinos=100):
+def mejor_vecino_con_mascara(individuo, flujo_matrix, distancia_matrix, mascara, mascara_permutacion, coste_actual, max_vecinos=100,
+                             flujo_disperso=None):
     """
     Encuentra el mejor vecino evitando combinaciones ya probadas usando una máscara booleana
     y limitando el número de vecinos evaluados a un subconjunto aleatorio.
@@ -66,6 +158,7 @@ def mejor_vecino_con_mascara(individuo, flujo_matrix, distancia_matrix, mascara,
         mascara_permutacion (np.ndarray): Máscara 1D para índices bloqueados.
         coste_actual (float): Coste actual del individuo.
         max_vecinos (int): Número máximo de vecinos a evaluar.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
 
     Returns:
         tuple: (nueva permutación, nuevo coste, nueva máscara, nueva máscara_permutacion)
@@ -83,7 +176,7 @@ def mejor_vecino_con_mascara(individuo, flujo_matrix, distancia_matrix, mascara,
         if not mascara_permutacion[r] or not mascara_permutacion[s]:
             continue
 
-        delta = calcular_delta_coste_numba(individuo, flujo_matrix, distancia_matrix, r, s)
+        delta = calcular_delta_intercambio(individuo, flujo_matrix, distancia_matrix, r, s, flujo_disperso)
         if delta < mejor_delta:
             mejor_delta = delta
             mejor_swap = (r, s)
@@ -92,7 +185,7 @@ def mejor_vecino_con_mascara(individuo, flujo_matrix, distancia_matrix, mascara,
         r, s = mejor_swap
         nuevo_individuo = individuo.copy()
         nuevo_individuo[r], nuevo_individuo[s] = nuevo_individuo[s], nuevo_individuo[r]
-        nuevo_coste = actualizar_coste_incremental(coste_actual, flujo_matrix, distancia_matrix, individuo, r, s)
+        nuevo_coste = coste_actual + mejor_delta
         mascara[r, s] = True  # Marcar la combinación como probada
 
         # Reactivar los índices afectados
@@ -105,7 +198,17 @@ def mejor_vecino_con_mascara(individuo, flujo_matrix, distancia_matrix, mascara,
             mascara_permutacion[i] = False
         return individuo, coste_actual, mascara, mascara_permutacion
 
-def calcula_busqueda_local_con_mascara(individuo, flujo_matrix, distancia_matrix, max_iter=50000, max_vecinos=100):
+def _sumar_contadores(contadores, iteraciones, movimientos):
+    """
+    Suma una búsqueda, sus iteraciones y sus movimientos aceptados a 'contadores' (si no es None).
+    """
+    if contadores is not None:
+        contadores['busquedas_locales'] = contadores.get('busquedas_locales', 0) + 1
+        contadores['iteraciones_busqueda_local'] = contadores.get('iteraciones_busqueda_local', 0) + int(iteraciones)
+        contadores['movimientos_aceptados'] = contadores.get('movimientos_aceptados', 0) + int(movimientos)
+
+def calcula_busqueda_local_con_mascara(individuo, flujo_matrix, distancia_matrix, max_iter=50000, max_vecinos=100,
+                                       flujo_disperso=None, contadores=None):
     """
     Realiza una búsqueda local con una máscara booleana para evitar probar combinaciones repetidas
     y una máscara de exclusión para la permutación.
@@ -116,34 +219,592 @@ def calcula_busqueda_local_con_mascara(individuo, flujo_matrix, distancia_matrix
         distancia_matrix (np.ndarray): Matriz de distancias.
         max_iter (int): Número máximo de iteraciones.
         max_vecinos (int): Número máximo de vecinos a evaluar por iteración.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos; si se proporciona,
+            el coste inicial y los deltas solo recorren los flujos no nulos.
+        contadores (dict, optional): Si se da, acumula búsquedas, iteraciones y movimientos aceptados.
 
     Returns:
         tuple: (mejor permutación encontrada, coste asociado)
     """
     n = len(individuo)
     mejor_individuo = individuo.copy()
-    mejor_coste = calcular_coste(mejor_individuo, flujo_matrix, distancia_matrix)
+    mejor_coste = calcular_coste(mejor_individuo, flujo_matrix, distancia_matrix, flujo_disperso)
 
     # Inicializa las máscaras
     mascara = np.zeros((n, n), dtype=bool)
     mascara_permutacion = np.ones(n, dtype=bool)  # Todos los índices inicialmente desbloqueados
 
+    iteraciones = movimientos = 0
     for _ in range(max_iter):
+        iteraciones += 1
         nuevo_individuo, nuevo_coste, mascara, mascara_permutacion = mejor_vecino_con_mascara(
-            mejor_individuo, flujo_matrix, distancia_matrix, mascara, mascara_permutacion, mejor_coste, max_vecinos
+            mejor_individuo, flujo_matrix, distancia_matrix, mascara, mascara_permutacion, mejor_coste, max_vecinos,
+            flujo_disperso
         )
 
         if nuevo_coste < mejor_coste:  # Si hay mejora, actualizar
             mejor_individuo = nuevo_individuo
             mejor_coste = nuevo_coste
+            movimientos += 1
         else:  # Si no hay mejoras, detener
             break
 
+    _sumar_contadores(contadores, iteraciones, movimientos)
+    return mejor_individuo, mejor_coste
+
+@njit(cache=True, nogil=True)
+def busqueda_local_mascara_numba(individuo, flujo_matrix, distancia_matrix, coste, max_iter, max_vecinos, semilla,
+                                 indptr, indices, datos, indptr_t, indices_t, datos_t, disperso):
+    """
+    Versión compilada completa de calcula_busqueda_local_con_mascara.
+
+    Cada iteración muestrea sin reemplazo hasta 'max_vecinos' pares (r, s) no marcados en la máscara,
+    aplica el de menor delta si mejora y marca el par; se detiene en cuanto ninguna muestra mejora.
+    El muestreo usa el generador interno de numba, sembrado con 'semilla' (si es >= 0): por rechazo
+    cuando quedan muchos pares libres y por enumeración + Fisher-Yates parcial cuando quedan pocos.
+
+    Args:
+        individuo (np.ndarray): Permutación inicial (no se modifica).
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        coste (float): Coste de la permutación inicial.
+        max_iter (int): Número máximo de iteraciones.
+        max_vecinos (int): Número máximo de vecinos a evaluar por iteración.
+        semilla (int): Semilla del generador interno (negativa para no resembrar).
+        indptr, indices, datos, indptr_t, indices_t, datos_t (np.ndarray): Vista CSR de los flujos (ver FlujoDisperso).
+        disperso (bool): Si es True, los deltas se calculan con la vista CSR.
+
+    Returns:
+        tuple: (permutación final, coste asociado, número de movimientos aceptados)
+    """
+    if semilla >= 0:
+        np.random.seed(semilla)
+
+    n = individuo.shape[0]
+    actual = individuo.copy()
+    mascara = np.zeros((n, n), dtype=np.bool_)
+    visto = np.full((n, n), -1, dtype=np.int64)
+    total_pares = n * (n - 1) // 2
+    pares_r = np.empty(total_pares, dtype=np.int64)
+    pares_s = np.empty(total_pares, dtype=np.int64)
+    marcados = 0
+
+    iteraciones = 0
+    for it in range(max_iter):
+        libres = total_pares - marcados
+        num_vecinos = min(max_vecinos, libres)
+        mejor_delta = 0.0
+        mejor_r, mejor_s = -1, -1
+
+        if libres <= 2 * max_vecinos:
+            # Quedan pocos pares libres: enumerarlos y barajar parcialmente
+            m = 0
+            for r in range(n - 1):
+                for s in range(r + 1, n):
+                    if not mascara[r, s]:
+                        pares_r[m] = r
+                        pares_s[m] = s
+                        m += 1
+            for k in range(num_vecinos):
+                j = k + np.random.randint(0, m - k)
+                pares_r[k], pares_r[j] = pares_r[j], pares_r[k]
+                pares_s[k], pares_s[j] = pares_s[j], pares_s[k]
+        else:
+            # Muestreo por rechazo de pares distintos y no marcados
+            k = 0
+            while k < num_vecinos:
+                r = np.random.randint(0, n)
+                s = np.random.randint(0, n)
+                if r == s:
+                    continue
+                if r > s:
+                    r, s = s, r
+                if mascara[r, s] or visto[r, s] == it:
+                    continue
+                visto[r, s] = it
+                pares_r[k] = r
+                pares_s[k] = s
+                k += 1
+
+        for k in range(num_vecinos):
+            r, s = pares_r[k], pares_s[k]
+            if disperso:
+                delta = calcular_delta_coste_disperso(actual, indptr, indices, datos, indptr_t, indices_t, datos_t,
+                                                      distancia_matrix, r, s)
+            else:
+                delta = calcular_delta_coste_numba(actual, flujo_matrix, distancia_matrix, r, s)
+            if delta < mejor_delta:
+                mejor_delta = delta
+                mejor_r, mejor_s = r, s
+
+        if mejor_r < 0:
+            break
+
+        actual[mejor_r], actual[mejor_s] = actual[mejor_s], actual[mejor_r]
+        coste += mejor_delta
+        mascara[mejor_r, mejor_s] = True
+        marcados += 1
+        iteraciones += 1
+
+    return actual, coste, iteraciones
+
+def calcula_busqueda_local_mascara_jit(individuo, flujo_matrix, distancia_matrix, max_iter=50000, max_vecinos=100,
+                                       flujo_disperso=None, semilla=None, contadores=None):
+    """
+    Búsqueda local con máscara booleana compilada por completo con numba (ver busqueda_local_mascara_numba).
+
+    Args:
+        individuo (np.ndarray): Permutación inicial.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        max_iter (int): Número máximo de iteraciones.
+        max_vecinos (int): Número máximo de vecinos a evaluar por iteración.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
+        semilla (int, optional): Semilla del generador interno. Si es None se toma de np.random,
+            de modo que la ejecución sigue siendo reproducible con fijar_semilla.
+        contadores (dict, optional): Si se da, acumula búsquedas, iteraciones y movimientos aceptados.
+
+    Returns:
+        tuple: (mejor permutación encontrada, coste asociado)
+    """
+    individuo = np.asarray(individuo)
+    if semilla is None:
+        semilla = np.random.randint(0, 2 ** 31 - 1)
+    coste = calcular_coste(individuo, flujo_matrix, distancia_matrix, flujo_disperso)
+
+    if flujo_disperso is not None:
+        fd = flujo_disperso
+        csr = (fd.indptr, fd.indices, fd.datos, fd.indptr_t, fd.indices_t, fd.datos_t)
+    else:
+        vacio = np.zeros(1, dtype=np.int64)
+        csr = (vacio, vacio, np.zeros(1, dtype=flujo_matrix.dtype), vacio, vacio, np.zeros(1, dtype=flujo_matrix.dtype))
+
+    mejor_individuo, mejor_coste, iteraciones = busqueda_local_mascara_numba(
+        individuo, flujo_matrix, distancia_matrix, float(coste), max_iter, max_vecinos, semilla,
+        *csr, flujo_disperso is not None
+    )
+    # El núcleo solo cuenta las iteraciones que aplican un movimiento
+    _sumar_contadores(contadores, iteraciones, iteraciones)
     return mejor_individuo, mejor_coste
 
-def optimizar_individuo_busqueda_local(individuo, flujo_matrix, distancia_matrix, max_iter=50000, max_vecinos=100):
+@njit(cache=True)
+def calcular_delta_exacto_numba(individuo, flujo_matrix, distancia_matrix, r, s):
+    """
+    Calcula el delta exacto de intercambiar las posiciones r y s (fórmula de Taillard).
+
+    A diferencia de calcular_delta_coste_numba, incluye los términos de la pareja (r, s)
+    y de la diagonal, por lo que también es exacto con matrices asimétricas o con diagonal no nula.
+
+    Args:
+        individuo (np.ndarray): Permutación actual.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        r (int): Índice de la primera posición a intercambiar.
+        s (int): Índice de la segunda posición a intercambiar.
+
+    Returns:
+        float: Diferencia en el coste tras el intercambio.
+    """
+    p_r, p_s = individuo[r], individuo[s]
+    delta = (
+        (flujo_matrix[r, r] - flujo_matrix[s, s]) * (distancia_matrix[p_s, p_s] - distancia_matrix[p_r, p_r]) +
+        (flujo_matrix[r, s] - flujo_matrix[s, r]) * (distancia_matrix[p_s, p_r] - distancia_matrix[p_r, p_s])
+    )
+    for k in range(individuo.shape[0]):
+        if k != r and k != s:
+            p_k = individuo[k]
+            delta += (
+                (flujo_matrix[k, r] - flujo_matrix[k, s]) * (distancia_matrix[p_k, p_s] - distancia_matrix[p_k, p_r]) +
+                (flujo_matrix[r, k] - flujo_matrix[s, k]) * (distancia_matrix[p_s, p_k] - distancia_matrix[p_r, p_k])
+            )
+    return delta
+
+@njit(cache=True)
+def inicializar_tabla_deltas(individuo, flujo_matrix, distancia_matrix, tabla):
+    """
+    Rellena la tabla de deltas (triángulo superior) de todos los intercambios de la permutación. Coste O(n³).
+
+    Args:
+        individuo (np.ndarray): Permutación actual.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        tabla (np.ndarray): Matriz (n, n) de salida; tabla[r, s] con r < s es el delta del intercambio (r, s).
+    """
+    n = individuo.shape[0]
+    for r in range(n - 1):
+        for s in range(r + 1, n):
+            tabla[r, s] = calcular_delta_exacto_numba(individuo, flujo_matrix, distancia_matrix, r, s)
+
+@njit(cache=True)
+def actualizar_tabla_deltas(individuo, flujo_matrix, distancia_matrix, tabla, r, s):
+    """
+    Actualiza la tabla de deltas tras aplicar el intercambio (r, s) a 'individuo'.
+
+    Los pares disjuntos de {r, s} se actualizan en O(1) a partir de su delta anterior
+    (Taillard, 1991); los pares que contienen r o s se recalculan en O(n). En total O(n²).
+
+    Args:
+        individuo (np.ndarray): Permutación tras el intercambio.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        tabla (np.ndarray): Tabla de deltas de la permutación anterior, se modifica in situ.
+        r (int): Primera posición intercambiada.
+        s (int): Segunda posición intercambiada.
+    """
+    n = individuo.shape[0]
+    p_r, p_s = individuo[r], individuo[s]
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            if i == r or i == s or j == r or j == s:
+                tabla[i, j] = calcular_delta_exacto_numba(individuo, flujo_matrix, distancia_matrix, i, j)
+            else:
+                p_i, p_j = individuo[i], individuo[j]
+                tabla[i, j] += (
+                    (flujo_matrix[r, i] - flujo_matrix[r, j] + flujo_matrix[s, j] - flujo_matrix[s, i]) *
+                    (distancia_matrix[p_s, p_i] - distancia_matrix[p_s, p_j] + distancia_matrix[p_r, p_j] - distancia_matrix[p_r, p_i]) +
+                    (flujo_matrix[i, r] - flujo_matrix[j, r] + flujo_matrix[j, s] - flujo_matrix[i, s]) *
+                    (distancia_matrix[p_i, p_s] - distancia_matrix[p_j, p_s] + distancia_matrix[p_j, p_r] - distancia_matrix[p_i, p_r])
+                )
+
+@njit(cache=True, nogil=True)
+def busqueda_local_tabla_deltas_numba(individuo, flujo_matrix, distancia_matrix, coste, max_iter):
     """
-    Aplica la optimización local a un único individuo utilizando búsqueda local con máscara booleana.
+    Búsqueda local de mejor mejora en el vecindario 2-exchange completo usando la tabla de deltas.
+
+    Args:
+        individuo (np.ndarray): Permutación inicial (no se modifica).
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        coste (float): Coste de la permutación inicial.
+        max_iter (int): Número máximo de movimientos aceptados.
+
+    Returns:
+        tuple: (permutación final, coste asociado, número de movimientos aceptados)
+    """
+    n = individuo.shape[0]
+    actual = individuo.copy()
+    tabla = np.zeros((n, n))
+    inicializar_tabla_deltas(actual, flujo_matrix, distancia_matrix, tabla)
+
+    iteraciones = 0
+    while iteraciones < max_iter:
+        mejor_delta = 0.0
+        mejor_r, mejor_s = -1, -1
+        for r in range(n - 1):
+            for s in range(r + 1, n):
+                if tabla[r, s] < mejor_delta:
+                    mejor_delta = tabla[r, s]
+                    mejor_r, mejor_s = r, s
+
+        # Óptimo local: ningún intercambio mejora (tolerancia para errores de redondeo)
+        if mejor_r < 0 or mejor_delta > -1e-9:
+            break
+
+        actual[mejor_r], actual[mejor_s] = actual[mejor_s], actual[mejor_r]
+        coste += mejor_delta
+        actualizar_tabla_deltas(actual, flujo_matrix, distancia_matrix, tabla, mejor_r, mejor_s)
+        iteraciones += 1
+
+    return actual, coste, iteraciones
+
+def calcula_busqueda_local_tabla_deltas(individuo, flujo_matrix, distancia_matrix, max_iter=50000, contadores=None):
+    """
+    Realiza una búsqueda local de mejor mejora manteniendo la tabla de deltas de todos los intercambios.
+
+    Cada iteración evalúa el vecindario 2-exchange completo en O(n²) (consulta de la tabla)
+    y actualiza la tabla en O(n²) tras el movimiento, frente a O(n³) si se recalculara cada delta.
+
+    Args:
+        individuo (np.ndarray): Permutación inicial.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        max_iter (int): Número máximo de iteraciones.
+        contadores (dict, optional): Si se da, acumula búsquedas, iteraciones y movimientos aceptados.
+
+    Returns:
+        tuple: (mejor permutación encontrada, coste asociado)
+    """
+    individuo = np.asarray(individuo)
+    coste = calcular_coste_numba(individuo, flujo_matrix, distancia_matrix)
+    mejor_individuo, mejor_coste, iteraciones = busqueda_local_tabla_deltas_numba(
+        individuo, flujo_matrix, distancia_matrix, coste, max_iter
+    )
+    _sumar_contadores(contadores, iteraciones, iteraciones)
+    return mejor_individuo, mejor_coste
+
+@njit(cache=True, nogil=True)
+def busqueda_local_bits_no_mirar_numba(individuo, flujo_matrix, distancia_matrix, coste, max_iter, primera_mejora,
+                                       semilla):
+    """
+    Búsqueda local 2-exchange con bits de "no mirar" por instalación.
+
+    Se recorren las instalaciones en un orden aleatorio (fijado por 'semilla'); para cada una con el
+    bit apagado se evalúan sus intercambios con todas las demás. Con primera mejora se aplica el primer
+    intercambio que mejora y con mejor mejora el mejor intercambio de esa instalación. Si no hay
+    ninguno, se enciende su bit y no se vuelve a mirar hasta que un movimiento aceptado la toque: solo
+    se apagan los bits de las dos instalaciones intercambiadas. Como un movimiento también cambia los
+    deltas de las demás instalaciones, cuando todos los bits están encendidos se apagan todos y se hace
+    una pasada de comprobación; la búsqueda termina cuando una pasada completa no encuentra mejora
+    (óptimo local del vecindario completo) o tras 'max_iter' movimientos.
+
+    Args:
+        individuo (np.ndarray): Permutación inicial (no se modifica).
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        coste (float): Coste de la permutación inicial.
+        max_iter (int): Número máximo de movimientos aceptados.
+        primera_mejora (bool): True para primera mejora, False para mejor mejora.
+        semilla (int): Semilla del orden de recorrido (negativa para no resembrar).
+
+    Returns:
+        tuple: (permutación final, coste asociado, movimientos aceptados, deltas evaluados)
+    """
+    if semilla >= 0:
+        np.random.seed(semilla)
+
+    n = individuo.shape[0]
+    actual = individuo.copy()
+    no_mirar = np.zeros(n, dtype=np.bool_)
+    orden = np.random.permutation(n)
+
+    iteraciones = 0
+    evaluaciones = 0
+    pendientes = n  # Instalaciones con el bit apagado
+    movimientos_pasada = 0  # Movimientos aceptados desde el último apagado de todos los bits
+    k = 0
+    while iteraciones < max_iter:
+        if pendientes == 0:
+            if movimientos_pasada == 0:
+                break
+            no_mirar[:] = False
+            pendientes = n
+            movimientos_pasada = 0
+        r = orden[k]
+        k = (k + 1) % n
+        if no_mirar[r]:
+            continue
+
+        mejor_delta = -1e-9  # Tolerancia para errores de redondeo
+        mejor_s = -1
+        for j in range(1, n):
+            s = orden[(k - 1 + j) % n]
+            delta = calcular_delta_exacto_numba(actual, flujo_matrix, distancia_matrix, r, s)
+            evaluaciones += 1
+            if delta < mejor_delta:
+                mejor_delta = delta
+                mejor_s = s
+                if primera_mejora:
+                    break
+
+        if mejor_s < 0:
+            no_mirar[r] = True
+            pendientes -= 1
+            continue
+
+        actual[r], actual[mejor_s] = actual[mejor_s], actual[r]
+        coste += mejor_delta
+        iteraciones += 1
+        movimientos_pasada += 1
+        # r sigue apagado; se apaga también la otra instalación tocada por el movimiento
+        if no_mirar[mejor_s]:
+            no_mirar[mejor_s] = False
+            pendientes += 1
+
+    return actual, coste, iteraciones, evaluaciones
+
+def calcula_busqueda_local_bits_no_mirar(individuo, flujo_matrix, distancia_matrix, max_iter=50000, estrategia='primera',
+                                         semilla=None, contadores=None):
+    """
+    Búsqueda local 2-exchange con bits de "no mirar" y estrategia de primera o mejor mejora
+    (ver busqueda_local_bits_no_mirar_numba). Devuelve un óptimo local del vecindario completo
+    sin recorrerlo entero en cada movimiento: solo se revisan las instalaciones afectadas.
+
+    Args:
+        individuo (np.ndarray): Permutación inicial.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        max_iter (int): Número máximo de movimientos aceptados.
+        estrategia (str): Una de ESTRATEGIAS_BUSQUEDA_LOCAL ('primera' o 'mejor').
+        semilla (int, optional): Semilla del orden de recorrido. Si es None se toma de np.random.
+        contadores (dict, optional): Si se da, acumula búsquedas, movimientos aceptados y, como
+            iteraciones, los intercambios evaluados.
+
+    Returns:
+        tuple: (mejor permutación encontrada, coste asociado)
+    """
+    if estrategia not in ESTRATEGIAS_BUSQUEDA_LOCAL:
+        raise ValueError(f"Estrategia de búsqueda local desconocida: {estrategia}. Opciones: {ESTRATEGIAS_BUSQUEDA_LOCAL}")
+    individuo = np.asarray(individuo)
+    if semilla is None:
+        semilla = np.random.randint(0, 2 ** 31 - 1)
+    coste = calcular_coste_numba(individuo, flujo_matrix, distancia_matrix)
+    mejor_individuo, mejor_coste, movimientos, evaluaciones = busqueda_local_bits_no_mirar_numba(
+        individuo, flujo_matrix, distancia_matrix, float(coste), max_iter, estrategia == 'primera', semilla
+    )
+    _sumar_contadores(contadores, evaluaciones, movimientos)
+    return mejor_individuo, mejor_coste
+
+@njit(cache=True, nogil=True)
+def iteraciones_tabu_robusta(actual, coste, tabla, tabu, mejor, mejor_coste, iteracion, num_iteraciones, flujo_matrix,
+                             distancia_matrix, tenencia_min, tenencia_max, aspiracion, semilla):
+    """
+    Ejecuta un bloque de iteraciones de la búsqueda tabú robusta (Taillard, 1991) sobre un estado
+    que se modifica in situ, de modo que la búsqueda puede continuar en varias llamadas.
+
+    En cada iteración se aplica el mejor intercambio permitido según la tabla de deltas, aunque
+    empeore. Un intercambio (r, s) es tabú si asigna r a la localización de s y s a la de r cuando
+    ambas asignaciones siguen prohibidas. Se acepta aunque sea tabú si mejora la mejor solución
+    (aspiración por coste) y se fuerza si alguna de las dos asignaciones lleva más de 'aspiracion'
+    iteraciones sin usarse (aspiración a largo plazo). Tras cada movimiento, volver a la localización
+    anterior queda prohibido durante un número de iteraciones aleatorio en [tenencia_min, tenencia_max].
+
+    Args:
+        actual (np.ndarray): Permutación actual, se modifica in situ.
+        coste (float): Coste de 'actual'.
+        tabla (np.ndarray): Tabla de deltas de 'actual' (ver inicializar_tabla_deltas), se modifica in situ.
+        tabu (np.ndarray): tabu[i, l] es la última iteración en la que asignar i a l está prohibido, shape=(n, n).
+        mejor (np.ndarray): Mejor permutación encontrada, se modifica in situ.
+        mejor_coste (float): Coste de 'mejor'.
+        iteracion (int): Número de iteraciones ya realizadas.
+        num_iteraciones (int): Iteraciones de este bloque.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        tenencia_min (int): Duración mínima de la prohibición.
+        tenencia_max (int): Duración máxima de la prohibición.
+        aspiracion (int): Iteraciones sin usar una asignación a partir de las cuales se fuerza.
+        semilla (int): Semilla del generador interno (negativa para no resembrar).
+
+    Returns:
+        tuple: (coste de 'actual', coste de 'mejor')
+    """
+    if semilla >= 0:
+        np.random.seed(semilla)
+
+    n = actual.shape[0]
+    for it in range(iteracion, iteracion + num_iteraciones):
+        mejor_delta = np.inf
+        mejor_r, mejor_s = -1, -1
+        ya_aspirado = False
+        for r in range(n - 1):
+            for s in range(r + 1, n):
+                delta = tabla[r, s]
+                prohibido_r = tabu[r, actual[s]]
+                prohibido_s = tabu[s, actual[r]]
+                permitido = prohibido_r < it or prohibido_s < it
+                aspirado = (prohibido_r < it - aspiracion or prohibido_s < it - aspiracion or
+                            coste + delta < mejor_coste - 1e-9)
+                if ((aspirado and not ya_aspirado) or
+                        (aspirado == ya_aspirado and delta < mejor_delta and (aspirado or permitido))):
+                    mejor_delta = delta
+                    mejor_r, mejor_s = r, s
+                    ya_aspirado = aspirado
+
+        # Todos los movimientos son tabú y ninguno se aspira: se deja pasar la iteración
+        if mejor_r < 0:
+            continue
+
+        actual[mejor_r], actual[mejor_s] = actual[mejor_s], actual[mejor_r]
+        coste += mejor_delta
+        # Prohibir que r y s vuelvan a sus localizaciones anteriores (ahora ocupadas por el otro)
+        tabu[mejor_r, actual[mejor_s]] = it + np.random.randint(tenencia_min, tenencia_max + 1)
+        tabu[mejor_s, actual[mejor_r]] = it + np.random.randint(tenencia_min, tenencia_max + 1)
+        if coste < mejor_coste - 1e-9:
+            mejor[:] = actual
+            mejor_coste = coste
+        actualizar_tabla_deltas(actual, flujo_matrix, distancia_matrix, tabla, mejor_r, mejor_s)
+
+    return coste, mejor_coste
+
+def calcula_busqueda_tabu_robusta(individuo, flujo_matrix, distancia_matrix, max_iter=None, tiempo_limite=None,
+                                  tenencia_min=None, tenencia_max=None, aspiracion=None, semilla=None, historial=None,
+                                  contadores=None, instrumentacion=None):
+    """
+    Búsqueda tabú robusta (RoTS) con tabla de deltas: cada iteración cuesta O(n²) (consulta y
+    actualización de la tabla), frente a O(n³) si se recalculara cada delta.
+
+    Las iteraciones se ejecutan en bloques compilados de unos 10⁷ accesos a la tabla; entre bloques se
+    comprueba el límite de tiempo, por lo que se respeta con una precisión de unos milisegundos.
+
+    Args:
+        individuo (np.ndarray): Permutación inicial.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        max_iter (int, optional): Número máximo de iteraciones (por defecto ITERACIONES_TABU_POR_N·n si no
+            hay límite de tiempo).
+        tiempo_limite (float, optional): Tiempo máximo en segundos.
+        tenencia_min (int, optional): Duración mínima de la prohibición (por defecto 0.9·n).
+        tenencia_max (int, optional): Duración máxima de la prohibición (por defecto 1.1·n).
+        aspiracion (int, optional): Iteraciones para la aspiración a largo plazo (por defecto 5·n²).
+        semilla (int, optional): Semilla del generador interno. Si es None se toma de np.random.
+        historial (list, optional): Si se da, se le añade (iteraciones, mejor coste, segundos) tras cada bloque.
+        contadores (dict, optional): Si se da, acumula búsquedas, iteraciones y movimientos (uno por iteración).
+        instrumentacion (Instrumentacion, optional): Si se da, cada bloque se registra como una generación
+            (ver src.instrumentation), con sus iteraciones y su mejor coste.
+
+    Returns:
+        tuple: (mejor permutación encontrada, coste asociado)
+    """
+    individuo = np.asarray(individuo)
+    n = individuo.shape[0]
+    if max_iter is None:
+        max_iter = ITERACIONES_TABU_POR_N * n if tiempo_limite is None else np.iinfo(np.int64).max
+    tenencia_min = max(1, int(0.9 * n)) if tenencia_min is None else tenencia_min
+    tenencia_max = max(tenencia_min, int(np.ceil(1.1 * n))) if tenencia_max is None else tenencia_max
+    if tenencia_min < 0 or tenencia_max < tenencia_min:
+        raise ValueError(f"Rango de tenencia tabú no válido: [{tenencia_min}, {tenencia_max}]")
+    aspiracion = 5 * n * n if aspiracion is None else aspiracion
+    if semilla is None:
+        semilla = np.random.randint(0, 2 ** 31 - 1)
+
+    actual = individuo.copy()
+    coste = float(calcular_coste_numba(actual, flujo_matrix, distancia_matrix))
+    mejor = actual.copy()
+    mejor_coste = coste
+    tabla = np.zeros((n, n))
+    inicializar_tabla_deltas(actual, flujo_matrix, distancia_matrix, tabla)
+    # Valores iniciales distintos y negativos: nada es tabú y la aspiración a largo plazo desempata
+    tabu = -(n * np.arange(n)[:, np.newaxis] + np.arange(n)[np.newaxis, :]).astype(np.int64) - 1
+
+    # Un bloque vacío compila el núcleo antes de empezar a contar el tiempo
+    iteraciones_tabu_robusta(actual, coste, tabla, tabu, mejor, mejor_coste, 0, 0, flujo_matrix, distancia_matrix,
+                             tenencia_min, tenencia_max, aspiracion, -1)
+
+    instrumentacion = instrumentacion or INSTRUMENTACION_NULA
+    inicio = time.perf_counter()
+    bloque = max(1, 10 ** 7 // (n * n))
+    iteracion = 0
+    while iteracion < max_iter:
+        num_iteraciones = min(bloque, max_iter - iteracion)
+        with instrumentacion.fase('busqueda_local'):
+            coste, mejor_coste = iteraciones_tabu_robusta(
+                actual, coste, tabla, tabu, mejor, mejor_coste, iteracion, num_iteraciones, flujo_matrix,
+                distancia_matrix, tenencia_min, tenencia_max, aspiracion, semilla
+            )
+        instrumentacion.sumar('iteraciones_busqueda_local', num_iteraciones)
+        instrumentacion.cerrar_generacion(iteracion // bloque, mejor_coste)
+        semilla = -1
+        iteracion += num_iteraciones
+        transcurrido = time.perf_counter() - inicio
+        if historial is not None:
+            historial.append((iteracion, mejor_coste, transcurrido))
+        if tiempo_limite is not None and transcurrido >= tiempo_limite:
+            break
+    _sumar_contadores(contadores, iteracion, iteracion)
+
+    # El coste acumulado por deltas puede arrastrar errores de redondeo: se recalcula el de la mejor solución
+    return mejor, float(calcular_coste_numba(mejor, flujo_matrix, distancia_matrix))
+
+def optimizar_individuo_busqueda_local(individuo, flujo_matrix, distancia_matrix, max_iter=50000, max_vecinos=100,
+                                       flujo_disperso=None, motor='mascara', estrategia='primera', contadores=None):
+    """
+    Aplica la optimización local a un único individuo.
+
+    El motor 'mascara' usa la búsqueda local con máscara booleana sobre un subconjunto aleatorio
+    de vecinos y 'mascara_jit' la misma búsqueda compilada por completo con numba;
+    'tabla_deltas' explora el vecindario completo con la tabla de deltas de Taillard y 'bits_no_mirar'
+    llega a un óptimo local del vecindario completo revisando solo las instalaciones afectadas por
+    cada movimiento, con primera o mejor mejora según 'estrategia'. 'tabu' no se detiene en el primer
+    óptimo local: ejecuta 'max_iter' iteraciones de búsqueda tabú robusta.
 
     Args:
         individuo (np.ndarray): Individuo a optimizar.
@@ -151,11 +812,273 @@ def optimizar_individuo_busqueda_local(individuo, flujo_matrix, distancia_matrix
         distancia_matrix (np.ndarray): Matriz de distancias.
         max_iter (int): Número máximo de iteraciones para la búsqueda local.
         max_vecinos (int): Número máximo de vecinos a evaluar por iteración.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos (motores 'mascara' y 'mascara_jit').
+        motor (str): Motor de búsqueda local, uno de MOTORES_BUSQUEDA_LOCAL.
+        estrategia (str): Estrategia del motor 'bits_no_mirar', una de ESTRATEGIAS_BUSQUEDA_LOCAL.
+        contadores (dict, optional): Si se da, acumula búsquedas, iteraciones y movimientos aceptados.
 
     Returns:
         tuple: (Individuo optimizado, coste asociado)
     """
-    return calcula_busqueda_local_con_mascara(individuo, flujo_matrix, distancia_matrix, max_iter, max_vecinos)
+    if motor == 'bits_no_mirar':
+        return calcula_busqueda_local_bits_no_mirar(individuo, flujo_matrix, distancia_matrix, max_iter, estrategia,
+                                                    contadores=contadores)
+    if motor == 'tabu':
+        return calcula_busqueda_tabu_robusta(individuo, flujo_matrix, distancia_matrix, max_iter, contadores=contadores)
+    if motor == 'tabla_deltas':
+        return calcula_busqueda_local_tabla_deltas(individuo, flujo_matrix, distancia_matrix, max_iter, contadores)
+    if motor == 'mascara_jit':
+        return calcula_busqueda_local_mascara_jit(individuo, flujo_matrix, distancia_matrix, max_iter, max_vecinos,
+                                                  flujo_disperso, contadores=contadores)
+    if motor != 'mascara':
+        raise ValueError(f"Motor de búsqueda local desconocido: {motor}. Opciones: {MOTORES_BUSQUEDA_LOCAL}")
+    return calcula_busqueda_local_con_mascara(individuo, flujo_matrix, distancia_matrix, max_iter, max_vecinos,
+                                              flujo_disperso, contadores)
+
+def _optimizar_con_semilla(individuo, flujo_matrix, distancia_matrix, semilla, max_iter, max_vecinos, flujo_disperso, motor,
+                           estrategia='primera', contadores=None):
+    """
+    Optimiza un individuo con una semilla propia, de modo que el resultado no depende
+    del orden ni del trabajador en el que se ejecute.
+    """
+    if motor == 'mascara_jit':
+        return calcula_busqueda_local_mascara_jit(individuo, flujo_matrix, distancia_matrix, max_iter, max_vecinos,
+                                                  flujo_disperso, semilla=semilla, contadores=contadores)
+    if motor == 'bits_no_mirar':
+        return calcula_busqueda_local_bits_no_mirar(individuo, flujo_matrix, distancia_matrix, max_iter, estrategia,
+                                                    semilla=semilla, contadores=contadores)
+    if motor == 'tabu':
+        return calcula_busqueda_tabu_robusta(individuo, flujo_matrix, distancia_matrix, max_iter, semilla=semilla,
+                                             contadores=contadores)
+    if motor == 'mascara':
+        # El motor en Python usa el generador global de NumPy
+        np.random.seed(semilla)
+    return optimizar_individuo_busqueda_local(individuo, flujo_matrix, distancia_matrix, max_iter, max_vecinos,
+                                              flujo_disperso, motor, contadores=contadores)
+
+def _fusionar_contadores(contadores, parciales):
+    """
+    Suma a 'contadores' los contadores parciales de cada tarea.
+    """
+    for parcial in parciales:
+        for nombre, valor in parcial.items():
+            contadores[nombre] = contadores.get(nombre, 0) + valor
+
+def _inicializar_trabajador(descriptor):
+    """
+    Inicializador de los procesos trabajadores: se adjunta por nombre a la InstanciaCompartida,
+    de modo que las matrices se usan como vistas sin copia en lugar de serializarse.
+    """
+    flujo_matrix, distancia_matrix, flujo_disperso, segmentos = adjuntar_instancia(descriptor)
+    _INSTANCIA_TRABAJADOR['flujo_matrix'] = flujo_matrix
+    _INSTANCIA_TRABAJADOR['distancia_matrix'] = distancia_matrix
+    _INSTANCIA_TRABAJADOR['flujo_disperso'] = flujo_disperso
+    _INSTANCIA_TRABAJADOR['segmentos'] = segmentos
+
+def _optimizar_en_trabajador(tarea):
+    """
+    Ejecuta en un proceso trabajador la búsqueda local de una tarea
+    (individuo, semilla, max_iter, max_vecinos, motor, estrategia, medir). Devuelve
+    (individuo optimizado, coste, contadores), con contadores None si no se pide medir.
+    """
+    individuo, semilla, max_iter, max_vecinos, motor, estrategia, medir = tarea
+    contadores = {} if medir else None
+    optimizado, coste = _optimizar_con_semilla(
+        individuo, _INSTANCIA_TRABAJADOR['flujo_matrix'], _INSTANCIA_TRABAJADOR['distancia_matrix'], semilla, max_iter,
+        max_vecinos, _INSTANCIA_TRABAJADOR['flujo_disperso'], motor, estrategia, contadores
+    )
+    return optimizado, coste, contadores
+
+class _PoolProcesosCompartido(ProcessPoolExecutor):
+    """
+    Pool de procesos cuyos trabajadores leen la instancia de memoria compartida. Si el pool creó
+    la InstanciaCompartida, la libera al cerrarse. Guarda el número de trabajadores en 'trabajadores'
+    para repartir las tareas en bloques.
+    """
+
+    def __init__(self, instancia, propietario, trabajadores, **kwargs):
+        super().__init__(max_workers=trabajadores, initializer=_inicializar_trabajador,
+                         initargs=(instancia.descriptor,), **kwargs)
+        self.trabajadores = trabajadores
+        self.instancia = instancia
+        self._propietario = propietario
+
+    def shutdown(self, wait=True, **kwargs):
+        try:
+            super().shutdown(wait=wait, **kwargs)
+        finally:
+            if self._propietario:
+                self.instancia.cerrar()
+
+def crear_ejecutor_busqueda_local(backend, flujo_matrix, distancia_matrix, flujo_disperso=None, trabajadores=None,
+                                  instancia=None):
+    """
+    Crea el ejecutor reutilizable para optimizar_poblacion según el backend.
+
+    Con 'procesos' los trabajadores se adjuntan a una InstanciaCompartida (src.shared_instance) y
+    nunca reciben las matrices serializadas; con 'hilos' se comparten directamente, ya que los motores
+    compilados liberan el GIL. El ejecutor devuelto es un gestor de contexto que libera los
+    trabajadores (y la memoria compartida que haya creado) al salir.
+
+    Args:
+        backend (str): Uno de BACKENDS_BUSQUEDA_LOCAL.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
+        trabajadores (int, optional): Número de trabajadores (por defecto, número de CPUs).
+        instancia (InstanciaCompartida, optional): Instancia ya en memoria compartida. Si no se da y el
+            backend es 'procesos', se crea una a partir de las matrices y se libera con el pool.
+
+    Returns:
+        Executor o nullcontext: Pool de procesos, pool de hilos o un contexto nulo para 'secuencial'.
+    """
+    if backend not in BACKENDS_BUSQUEDA_LOCAL:
+        raise ValueError(f"Backend de búsqueda local desconocido: {backend}. Opciones: {BACKENDS_BUSQUEDA_LOCAL}")
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if backend == 'procesos':
+        # 'spawn' en todas las plataformas: hacer fork de un proceso que ya ha lanzado hilos de numba
+        # (p. ej. desde fitness_pop_numba) puede bloquear a los hijos
+        propietario = instancia is None
+        if propietario:
+            instancia = InstanciaCompartida(flujo_matrix, distancia_matrix, flujo_disperso)
+        try:
+            return _PoolProcesosCompartido(instancia, propietario, trabajadores, mp_context=mp.get_context('spawn'))
+        except Exception:
+            if propietario:
+                instancia.cerrar()
+            raise
+    if backend == 'hilos':
+        return ThreadPoolExecutor(max_workers=trabajadores)
+    return nullcontext(None)
+
+def optimizar_poblacion(poblacion, flujo_matrix, distancia_matrix, indices=None, max_iter=50000, max_vecinos=100,
+                        flujo_disperso=None, motor='mascara', backend='secuencial', trabajadores=None, semilla=None,
+                        ejecutor=None, memo=None, estrategia='primera', contadores=None):
+    """
+    Aplica la búsqueda local a varios individuos de la población a la vez.
+
+    Cada individuo recibe una semilla derivada de 'semilla' según su posición en 'indices', por lo
+    que el resultado es el mismo con cualquier backend y número de trabajadores.
+
+    Con 'memo' (src.cache.MemoBusquedaLocal), los individuos cuya permutación ya se optimizó (o que
+    son un óptimo local ya encontrado) devuelven el resultado guardado sin repetir la búsqueda, y los
+    repetidos dentro del lote se optimizan una sola vez.
+
+    Args:
+        poblacion (np.ndarray): Población, shape=(poblacion, n).
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        indices (np.ndarray, optional): Índices de los individuos a optimizar (por defecto, todos).
+        max_iter (int): Número máximo de iteraciones para la búsqueda local.
+        max_vecinos (int): Número máximo de vecinos a evaluar por iteración.
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
+        motor (str): Motor de búsqueda local, uno de MOTORES_BUSQUEDA_LOCAL.
+        backend (str): 'secuencial', 'procesos' o 'hilos' (este último solo con MOTORES_NOGIL).
+        trabajadores (int, optional): Número de trabajadores si hay que crear el ejecutor.
+        semilla (int, optional): Semilla base. Si es None se toma de np.random.
+        ejecutor (Executor, optional): Ejecutor creado con crear_ejecutor_busqueda_local para reutilizarlo.
+        memo (MemoBusquedaLocal, optional): Memoria de resultados de búsquedas anteriores.
+        estrategia (str, optional): Estrategia del motor 'bits_no_mirar' ('primera' o 'mejor').
+        contadores (dict, optional): Si se da, acumula las búsquedas ejecutadas (sin contar las
+            resueltas por 'memo'), sus iteraciones y sus movimientos aceptados.
+
+    Returns:
+        tuple: (individuos optimizados, shape=(len(indices), n); costes asociados, shape=(len(indices),))
+    """
+    if motor not in MOTORES_BUSQUEDA_LOCAL:
+        raise ValueError(f"Motor de búsqueda local desconocido: {motor}. Opciones: {MOTORES_BUSQUEDA_LOCAL}")
+    if backend == 'hilos' and motor not in MOTORES_NOGIL:
+        raise ValueError(f"El backend 'hilos' requiere un motor compilado sin GIL: {MOTORES_NOGIL}")
+
+    poblacion = np.asarray(poblacion)
+    if indices is None:
+        indices = np.arange(len(poblacion))
+    indices = np.asarray(indices)
+    if semilla is None:
+        semilla = np.random.randint(0, 2 ** 31 - 1)
+    semillas = np.random.default_rng(semilla).integers(0, 2 ** 31 - 1, size=len(indices))
+
+    optimizados = np.empty((len(indices), poblacion.shape[1]), dtype=poblacion.dtype)
+    costes = np.empty(len(indices), dtype=np.float64)
+    if len(indices) == 0:
+        return optimizados, costes
+
+    # Posiciones de 'indices' que hay que optimizar (las demás salen de la memoria)
+    pendientes = np.arange(len(indices))
+    if memo is not None:
+        claves = claves_permutaciones(poblacion[indices])
+        primera_posicion = {}
+        repetidas = []
+        for k, clave in enumerate(claves):
+            if clave in primera_posicion:
+                repetidas.append((k, primera_posicion[clave]))
+                continue
+            resultado = memo.obtener(clave)
+            if resultado is None:
+                primera_posicion[clave] = k
+            else:
+                optimizados[k], costes[k] = resultado
+        pendientes = np.fromiter(primera_posicion.values(), dtype=np.intp, count=len(primera_posicion))
+
+    resultados = _optimizar_posiciones(poblacion, indices[pendientes], semillas[pendientes], flujo_matrix,
+                                       distancia_matrix, max_iter, max_vecinos, flujo_disperso, motor, backend,
+                                       trabajadores, ejecutor, estrategia, contadores)
+    for k, (individuo, coste) in zip(pendientes, resultados):
+        optimizados[k] = individuo
+        costes[k] = coste
+
+    if memo is not None:
+        for k in pendientes:
+            memo.guardar(claves[k], optimizados[k], costes[k])
+        for k, origen in repetidas:
+            optimizados[k], costes[k] = optimizados[origen], costes[origen]
+            memo.aciertos += 1
+    return optimizados, costes
+
+def _optimizar_posiciones(poblacion, indices, semillas, flujo_matrix, distancia_matrix, max_iter, max_vecinos,
+                          flujo_disperso, motor, backend, trabajadores, ejecutor, estrategia, contadores=None):
+    """
+    Ejecuta la búsqueda local de poblacion[indices] con las semillas dadas en el backend indicado.
+    Cada tarea usa sus propios contadores, que se suman a 'contadores' al terminar.
+
+    Returns:
+        list: Pares (individuo optimizado, coste) en el orden de 'indices'.
+    """
+    if len(indices) == 0:
+        return []
+    if backend == 'secuencial':
+        # Conservar el estado global de np.random, que el motor 'mascara' resiembra por individuo
+        estado = np.random.get_state()
+        try:
+            return [
+                _optimizar_con_semilla(poblacion[idx], flujo_matrix, distancia_matrix, int(sem), max_iter, max_vecinos,
+                                       flujo_disperso, motor, estrategia, contadores)
+                for idx, sem in zip(indices, semillas)
+            ]
+        finally:
+            np.random.set_state(estado)
+
+    contexto = nullcontext(ejecutor) if ejecutor is not None else crear_ejecutor_busqueda_local(
+        backend, flujo_matrix, distancia_matrix, flujo_disperso, trabajadores)
+    with contexto as pool:
+        if isinstance(pool, ProcessPoolExecutor):
+            tareas = [(poblacion[idx], int(sem), max_iter, max_vecinos, motor, estrategia, contadores is not None)
+                      for idx, sem in zip(indices, semillas)]
+            bloque = max(1, len(tareas) // (4 * getattr(pool, 'trabajadores', 1)))
+            resultados = list(pool.map(_optimizar_en_trabajador, tareas, chunksize=bloque))
+            if contadores is not None:
+                _fusionar_contadores(contadores, [parcial for _, _, parcial in resultados])
+            return [(individuo, coste) for individuo, coste, _ in resultados]
+        # Con hilos, cada tarea suma en su propio diccionario
+        parciales = [{} if contadores is not None else None for _ in indices]
+        resultados = list(pool.map(
+            lambda tarea: _optimizar_con_semilla(tarea[0], flujo_matrix, distancia_matrix, tarea[1], max_iter,
+                                                 max_vecinos, flujo_disperso, motor, estrategia, tarea[2]),
+            [(poblacion[idx], int(sem), parcial) for idx, sem, parcial in zip(indices, semillas, parciales)]
+        ))
+        if contadores is not None:
+            _fusionar_contadores(contadores, parciales)
+        return resultados
 
 def generar_individuo(n, seed=None):
     """
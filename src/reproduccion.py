@@ -0,0 +1,172 @@
+# src/reproduccion.py
+
+import numpy as np
+from numba import njit, prange
+from src.selection import seleccionar_indices
+from src.crossover import hijo_cruce, generar_aleatorios_cruce, funcion_cruce_lote, _CODIGOS_CRUCE
+from src.mutation import mutar_poblacion
+from src.instrumentation import INSTRUMENTACION_NULA
+
+# Formas de generar la siguiente generación en ejecutar_algoritmo_genetico
+MODOS_REPRODUCCION = ('vectorizada', 'legacy')
+
+# Cruces cuyo hijo conserva sobre todo las posiciones del receptor (el otro padre); en el resto,
+# las del donante. Solo orienta la evaluación incremental de CacheFitness (ver referencias)
+_CRUCES_REFERENCIA_RECEPTOR = ('pmx', 'ox', 'uniforme')
+
+
+@njit(parallel=True, cache=True)
+def _cruzar_en_buffer(poblacion, padres, cruza, codigo, puntos1, puntos2, mascaras, destino, inicio, posiciones):
+    """
+    Escribe en destino[inicio:] los hijos de cada pareja de padres: el par del cruce de código
+    'codigo' (ver src.crossover.hijo_cruce) si cruza[j] es True o una copia de los padres en caso
+    contrario. Si el número de huecos es impar, el segundo hijo de la última pareja se descarta
+    (como al truncar la población en el bucle original).
+
+    Args:
+        poblacion (np.ndarray): Población actual, shape=(poblacion, n).
+        padres (np.ndarray): Índices de los padres de cada pareja, shape=(parejas, 2).
+        cruza (np.ndarray): Si cada pareja se cruza, shape=(parejas,).
+        codigo (int): Código del operador de cruce (src.crossover._CODIGOS_CRUCE).
+        puntos1 (np.ndarray): Inicio del segmento de cada pareja, shape=(parejas,).
+        puntos2 (np.ndarray): Fin (excluido) del segmento de cada pareja, shape=(parejas,).
+        mascaras (np.ndarray): Máscara de cada pareja, shape=(parejas, n), o (0, n) si el cruce no las usa.
+        destino (np.ndarray): Buffer de la siguiente generación, shape=(poblacion, n).
+        inicio (int): Primera fila de destino a rellenar (tras la élite).
+        posiciones (np.ndarray): Buffer de trabajo para las inversas de los padres, shape=(parejas, 2, n).
+    """
+    filas = destino.shape[0]
+    for j in prange(padres.shape[0]):
+        padre1 = poblacion[padres[j, 0]]
+        padre2 = poblacion[padres[j, 1]]
+        fila1 = inicio + 2 * j
+        fila2 = fila1 + 1
+        if cruza[j]:
+            mascara = mascaras[j] if mascaras.shape[0] > 0 else mascaras[0:0].ravel()
+            hijo_cruce(codigo, padre1, padre2, puntos1[j], puntos2[j], mascara, destino[fila1],
+                       posiciones[j, 0], posiciones[j, 1])
+            if fila2 < filas:
+                hijo_cruce(codigo, padre2, padre1, puntos1[j], puntos2[j], mascara, destino[fila2],
+                           posiciones[j, 1], posiciones[j, 0])
+        else:
+            destino[fila1] = padre1
+            if fila2 < filas:
+                destino[fila2] = padre2
+
+
+class MotorReproduccion:
+    """
+    Genera cada nueva generación completa con operaciones sobre arrays: selección de todos los padres
+    a la vez (ver src.selection.seleccionar_indices), cruce compilado escrito directamente en un buffer preasignado y mutación
+    por lotes in situ (ver src.mutation.mutar_poblacion).
+
+    Usa dos buffers (poblacion, n) que se alternan: la generación nueva se escribe en el buffer que no
+    contiene la población actual, así que no se reserva memoria en cada generación. El array devuelto
+    por siguiente_generacion se sobrescribe dos llamadas después; quien necesite conservar un individuo
+    (p. ej. la mejor solución) debe copiarlo.
+
+    Tras cada generación, 'referencias' indica para cada hijo la fila de la población anterior de la
+    que procede en mayor parte (p. ej. el receptor en el PMX o el padre copiado si no hay cruce; -1
+    para la élite), lo que permite a CacheFitness calcular su fitness de forma incremental.
+
+    Args:
+        tam_poblacion (int): Tamaño de la población.
+        n (int): Número de instalaciones/localizaciones.
+        tasa_cruce (float): Probabilidad de cruce de cada pareja.
+        tasa_mutacion (float): Probabilidad de mutación de cada hijo.
+        elitismo (bool): Si es True, la primera fila de cada generación es el individuo élite.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+        k_torneo (int, optional): Número de individuos de cada torneo.
+        metodo_seleccion (str, optional): Uno de METODOS_SELECCION ('torneo', 'ranking' o 'sus').
+        presion_ranking (float, optional): Presión selectiva de la selección por ranking lineal.
+        operador_mutacion (str, optional): Uno de OPERADORES_MUTACION.
+        operador_cruce (str, optional): Uno de OPERADORES_CRUCE (incluidos los registrados con registrar_cruce).
+        dtype (numpy.dtype, optional): Tipo entero de los individuos.
+        instrumentacion (Instrumentacion, optional): Registro de los tiempos de selección, cruce y mutación.
+    """
+
+    def __init__(self, tam_poblacion, n, tasa_cruce, tasa_mutacion, elitismo, rng=None, k_torneo=3,
+                 metodo_seleccion='torneo', presion_ranking=1.5, operador_mutacion='swap', operador_cruce='pmx', dtype=np.int64,
+                 instrumentacion=None):
+        self.tam_poblacion = tam_poblacion
+        self.n = n
+        self.tasa_cruce = tasa_cruce
+        self.tasa_mutacion = tasa_mutacion
+        self.elitismo = elitismo
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.k_torneo = k_torneo
+        self.metodo_seleccion = metodo_seleccion
+        self.presion_ranking = presion_ranking
+        self.operador_mutacion = operador_mutacion
+        self.operador_cruce = operador_cruce
+        # Los operadores registrados desde fuera no tienen núcleo fusionado: se usa su función por lotes
+        self._codigo_cruce = _CODIGOS_CRUCE.get(operador_cruce, -1)
+        self._funcion_cruce = funcion_cruce_lote(operador_cruce)
+        self._referencia_receptor = operador_cruce in _CRUCES_REFERENCIA_RECEPTOR
+        self.instrumentacion = instrumentacion or INSTRUMENTACION_NULA
+
+        self.inicio = 1 if elitismo else 0
+        self.parejas = (tam_poblacion - self.inicio + 1) // 2
+        self._buffers = (np.empty((tam_poblacion, n), dtype=dtype), np.empty((tam_poblacion, n), dtype=dtype))
+        self._posiciones = np.empty((self.parejas, 2, n), dtype=np.int64)
+        self.referencias = np.full(tam_poblacion, -1, dtype=np.int64)
+
+    def siguiente_generacion(self, poblacion, fitness, elite=None):
+        """
+        Genera la siguiente generación a partir de la población actual.
+
+        Args:
+            poblacion (numpy.ndarray): Población actual, shape=(poblacion, n).
+            fitness (numpy.ndarray): Fitness de la población actual, shape=(poblacion,).
+            elite (numpy.ndarray, optional): Individuo que ocupa la primera fila si hay elitismo.
+
+        Returns:
+            numpy.ndarray: Nueva población (uno de los dos buffers internos), shape=(poblacion, n).
+        """
+        # Se escribe en el buffer que no contiene la población actual
+        destino = self._buffers[1] if poblacion is self._buffers[0] else self._buffers[0]
+
+        if self.elitismo:
+            destino[0] = elite if elite is not None else poblacion[np.argmin(fitness)]
+
+        with self.instrumentacion.fase('seleccion'):
+            padres = seleccionar_indices(fitness, 2 * self.parejas, self.metodo_seleccion, self.rng, self.k_torneo,
+                                         self.presion_ranking).reshape(self.parejas, 2)
+        with self.instrumentacion.fase('cruce'):
+            cruza = self.rng.random(self.parejas) < self.tasa_cruce
+            puntos1, puntos2, mascaras = generar_aleatorios_cruce(self.operador_cruce, self.parejas, self.n, self.rng)
+            if self._codigo_cruce >= 0:
+                _cruzar_en_buffer(poblacion, padres, cruza, self._codigo_cruce, puntos1, puntos2, mascaras, destino,
+                                  self.inicio, self._posiciones)
+            else:
+                self._cruzar_con_funcion(poblacion, padres, cruza, puntos1, puntos2, mascaras, destino)
+
+        # Padre de referencia de cada hijo: el receptor (el otro padre) o el donante según el cruce
+        intercambia = cruza & self._referencia_receptor
+        referencias = np.empty((self.parejas, 2), dtype=np.int64)
+        referencias[:, 0] = np.where(intercambia, padres[:, 1], padres[:, 0])
+        referencias[:, 1] = np.where(intercambia, padres[:, 0], padres[:, 1])
+        self.referencias[self.inicio:] = referencias.ravel()[:self.tam_poblacion - self.inicio]
+
+        # La élite no muta
+        with self.instrumentacion.fase('mutacion'):
+            mutar_poblacion(destino[self.inicio:], self.tasa_mutacion, self.operador_mutacion, self.rng)
+        return destino
+
+    def _cruzar_con_funcion(self, poblacion, padres, cruza, puntos1, puntos2, mascaras, destino):
+        """
+        Equivalente a _cruzar_en_buffer para los operadores registrados con registrar_cruce: cruza las
+        parejas seleccionadas con la función por lotes y copia los hijos en destino.
+        """
+        hijos = np.empty((2 * self.parejas, self.n), dtype=destino.dtype)
+        hijos[0::2] = poblacion[padres[:, 0]]
+        hijos[1::2] = poblacion[padres[:, 1]]
+        cruzan = np.flatnonzero(cruza)
+        if cruzan.size:
+            hijos1, hijos2 = self._funcion_cruce(
+                np.ascontiguousarray(poblacion[padres[cruzan, 0]]), np.ascontiguousarray(poblacion[padres[cruzan, 1]]),
+                puntos1[cruzan], puntos2[cruzan], mascaras[cruzan] if mascaras.shape[0] else mascaras
+            )
+            hijos[2 * cruzan] = hijos1
+            hijos[2 * cruzan + 1] = hijos2
+        destino[self.inicio:] = hijos[:self.tam_poblacion - self.inicio]
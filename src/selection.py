@@ -3,6 +3,9 @@
 import numpy as np
 import random
 
+# Métodos de selección por lotes disponibles en seleccionar_indices
+METODOS_SELECCION = ('torneo', 'ranking', 'sus')
+
 def seleccion_torneo(poblacion, fitness, k=3):
     """
     Selecciona un individuo de la población usando la selección por torneo.
@@ -19,4 +22,118 @@ def seleccion_torneo(poblacion, fitness, k=3):
     seleccionados = np.random.choice(len(poblacion), size=k, replace=False)
     # Encontrar el índice del individuo con el mejor fitness (menor coste)
     mejor_idx = seleccionados[np.argmin(fitness[seleccionados])]
-    return poblacion[mejor_idx]
\ No newline at end of file
+    return poblacion[mejor_idx]
+
+def seleccion_torneo_indices(fitness, num_seleccionados, k=3, rng=None):
+    """
+    Realiza 'num_seleccionados' torneos a la vez y devuelve los índices de los ganadores.
+
+    Los participantes de todos los torneos se sortean de una vez, con reemplazo, en una matriz de
+    (num_seleccionados, k) índices, y los ganadores salen de un único argmin por filas: O(num_seleccionados·k).
+    A diferencia de seleccion_torneo, un individuo puede aparecer varias veces en el mismo torneo; con
+    k mucho menor que la población la diferencia es despreciable.
+
+    Args:
+        fitness (numpy.ndarray): Fitness de cada individuo, shape=(poblacion,).
+        num_seleccionados (int): Número de torneos (individuos a seleccionar).
+        k (int, optional): Número de individuos de cada torneo.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos seleccionados, shape=(num_seleccionados,).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    tam_poblacion = len(fitness)
+    if not 0 < k <= tam_poblacion:
+        raise ValueError(f"El tamaño del torneo k={k} debe estar entre 1 y el tamaño de la población ({tam_poblacion}).")
+    participantes = rng.integers(0, tam_poblacion, size=(num_seleccionados, k))
+    ganadores = np.argmin(np.asarray(fitness)[participantes], axis=1)
+    return participantes[np.arange(num_seleccionados), ganadores]
+
+
+def seleccion_ranking_lineal_indices(fitness, num_seleccionados, presion=1.5, rng=None):
+    """
+    Selección por ranking lineal: la probabilidad de cada individuo depende solo de su posición en
+    el orden por coste (el mejor recibe presion/N y el peor (2 - presion)/N).
+
+    Args:
+        fitness (numpy.ndarray): Fitness de cada individuo, shape=(poblacion,).
+        num_seleccionados (int): Número de individuos a seleccionar.
+        presion (float, optional): Presión selectiva, entre 1 (uniforme) y 2.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos seleccionados, shape=(num_seleccionados,).
+    """
+    if not 1.0 <= presion <= 2.0:
+        raise ValueError(f"La presión selectiva del ranking lineal debe estar entre 1 y 2 y es {presion}.")
+    rng = rng if rng is not None else np.random.default_rng()
+    acumulada = np.cumsum(_probabilidades_ranking_lineal(fitness, presion))
+    seleccionados = np.searchsorted(acumulada, rng.random(num_seleccionados) * acumulada[-1], side='right')
+    return np.minimum(seleccionados, len(fitness) - 1)
+
+
+def seleccion_sus_indices(fitness, num_seleccionados, rng=None):
+    """
+    Muestreo universal estocástico (SUS) proporcional a la calidad: el peso de cada individuo es
+    su distancia al peor coste de la población. Todos los punteros salen de un único número
+    aleatorio, por lo que cada individuo se elige un número de veces que difiere en menos de uno
+    de su valor esperado. El resultado se baraja para que las parejas consecutivas no sean vecinos
+    en la ruleta.
+
+    Args:
+        fitness (numpy.ndarray): Fitness de cada individuo, shape=(poblacion,).
+        num_seleccionados (int): Número de individuos a seleccionar.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+
+    Returns:
+        numpy.ndarray: Índices de los individuos seleccionados, shape=(num_seleccionados,).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    fitness = np.asarray(fitness, dtype=np.float64)
+    pesos = fitness.max() - fitness
+    if pesos.sum() <= 0:
+        # Todos los individuos tienen el mismo coste
+        pesos = np.ones_like(fitness)
+    acumulada = np.cumsum(pesos)
+    paso = acumulada[-1] / num_seleccionados
+    punteros = rng.random() * paso + paso * np.arange(num_seleccionados)
+    seleccionados = np.minimum(np.searchsorted(acumulada, punteros, side='right'), len(fitness) - 1)
+    return rng.permutation(seleccionados)
+
+
+def seleccionar_indices(fitness, num_seleccionados, metodo='torneo', rng=None, k=3, presion=1.5):
+    """
+    Selecciona los padres de una generación completa con el método indicado.
+
+    Args:
+        fitness (numpy.ndarray): Fitness de cada individuo, shape=(poblacion,).
+        num_seleccionados (int): Número de individuos a seleccionar.
+        metodo (str, optional): Uno de METODOS_SELECCION.
+        rng (numpy.random.Generator, optional): Generador de números aleatorios.
+        k (int, optional): Tamaño del torneo (solo 'torneo').
+        presion (float, optional): Presión selectiva (solo 'ranking').
+
+    Returns:
+        numpy.ndarray: Índices de los individuos seleccionados, shape=(num_seleccionados,).
+    """
+    if metodo == 'torneo':
+        return seleccion_torneo_indices(fitness, num_seleccionados, k, rng)
+    if metodo == 'ranking':
+        return seleccion_ranking_lineal_indices(fitness, num_seleccionados, presion, rng)
+    if metodo == 'sus':
+        return seleccion_sus_indices(fitness, num_seleccionados, rng)
+    raise ValueError(f"Método de selección desconocido: {metodo}. Opciones: {METODOS_SELECCION}")
+
+
+def _probabilidades_ranking_lineal(fitness, presion):
+    """
+    Probabilidades del ranking lineal de Baker para minimización: el individuo de rango r (0 el peor,
+    N - 1 el mejor) recibe (2 - presion)/N + 2·r·(presion - 1)/(N·(N - 1)).
+    """
+    tam_poblacion = len(fitness)
+    if tam_poblacion == 1:
+        return np.ones(1)
+    rangos = np.empty(tam_poblacion, dtype=np.float64)
+    rangos[np.argsort(fitness, kind='stable')[::-1]] = np.arange(tam_poblacion)
+    return (2 - presion) / tam_poblacion + 2 * rangos * (presion - 1) / (tam_poblacion * (tam_poblacion - 1))
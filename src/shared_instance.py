@@ -0,0 +1,147 @@
+# src/shared_instance.py
+
+import logging
+import weakref
+import numpy as np
+from multiprocessing import shared_memory
+from src.utils import cargar_datos, FlujoDisperso
+
+# Campos de FlujoDisperso que son arrays (el último, 'densidad', es un escalar)
+_CAMPOS_DISPERSOS = FlujoDisperso._fields[:-1]
+
+
+def _liberar_segmentos(segmentos, propietario):
+    """
+    Cierra los segmentos de memoria compartida y, si el proceso es su propietario, los elimina del sistema.
+
+    Args:
+        segmentos (list): Objetos SharedMemory.
+        propietario (bool): Si es True, además de cerrarlos se hace unlink.
+    """
+    for segmento in segmentos:
+        if propietario:
+            try:
+                segmento.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            segmento.close()
+        except BufferError:
+            # Aún hay vistas NumPy vivas sobre el segmento; el mapeo se libera cuando desaparezcan
+            logging.debug(f"El segmento {segmento.name} sigue en uso por vistas activas")
+    segmentos.clear()
+
+
+class InstanciaCompartida:
+    """
+    Contenedor de una instancia QAP cuyas matrices viven en multiprocessing.shared_memory.
+
+    El proceso que la crea copia una sola vez las matrices de flujo y distancia (y la vista dispersa
+    de los flujos, si existe) a segmentos de memoria compartida. Los procesos trabajadores reciben
+    únicamente el descriptor (nombres, formas y tipos, que se serializan en unos pocos bytes) y se
+    adjuntan con adjuntar_instancia, obteniendo vistas NumPy sin copia.
+
+    Es un gestor de contexto: al salir del bloque 'with' se liberan los segmentos. Si no se cierra
+    explícitamente (p. ej. por una excepción no capturada), se liberan al recolectar el objeto o al
+    terminar el intérprete; si el proceso muere sin ejecutar los finalizadores, el resource_tracker
+    de multiprocessing elimina los segmentos huérfanos.
+
+    Args:
+        flujo_matrix (numpy.ndarray): Matriz de flujos, shape=(n, n).
+        distancia_matrix (numpy.ndarray): Matriz de distancias, shape=(n, n).
+        flujo_disperso (FlujoDisperso, optional): Vista CSR de la matriz de flujos.
+    """
+
+    def __init__(self, flujo_matrix, distancia_matrix, flujo_disperso=None):
+        self._segmentos = []
+        self._finalizador = weakref.finalize(self, _liberar_segmentos, self._segmentos, True)
+
+        arrays = {'flujo_matrix': flujo_matrix, 'distancia_matrix': distancia_matrix}
+        if flujo_disperso is not None:
+            arrays.update({campo: getattr(flujo_disperso, campo) for campo in _CAMPOS_DISPERSOS})
+
+        self.descriptor = {
+            'arrays': {},
+            'densidad': None if flujo_disperso is None else flujo_disperso.densidad
+        }
+        self._vistas = {}
+        for clave, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            segmento = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._segmentos.append(segmento)
+            vista = np.ndarray(array.shape, dtype=array.dtype, buffer=segmento.buf)
+            vista[...] = array
+            self._vistas[clave] = vista
+            self.descriptor['arrays'][clave] = (segmento.name, array.shape, array.dtype.str)
+
+        self.n = self._vistas['distancia_matrix'].shape[0]
+
+    @classmethod
+    def desde_archivo(cls, ruta_archivo):
+        """
+        Carga una instancia con cargar_datos y la coloca en memoria compartida.
+
+        Args:
+            ruta_archivo (str): Ruta al archivo de datos.
+
+        Returns:
+            InstanciaCompartida: Instancia con sus matrices en memoria compartida.
+        """
+        _, flujo_matrix, distancia_matrix, flujo_disperso = cargar_datos(ruta_archivo, detectar_dispersion=True)
+        return cls(flujo_matrix, distancia_matrix, flujo_disperso)
+
+    @property
+    def flujo_matrix(self):
+        return self._vistas['flujo_matrix']
+
+    @property
+    def distancia_matrix(self):
+        return self._vistas['distancia_matrix']
+
+    @property
+    def flujo_disperso(self):
+        if self.descriptor['densidad'] is None:
+            return None
+        return FlujoDisperso(*(self._vistas[campo] for campo in _CAMPOS_DISPERSOS), self.descriptor['densidad'])
+
+    @property
+    def cerrada(self):
+        return not self._finalizador.alive
+
+    def cerrar(self):
+        """
+        Libera (close + unlink) los segmentos de memoria compartida. Es idempotente.
+        """
+        self._vistas.clear()
+        self._finalizador()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cerrar()
+        return False
+
+
+def adjuntar_instancia(descriptor):
+    """
+    Se adjunta desde otro proceso a una InstanciaCompartida a partir de su descriptor.
+
+    Args:
+        descriptor (dict): Atributo 'descriptor' de la InstanciaCompartida.
+
+    Returns:
+        tuple: (matriz de flujos, matriz de distancias, FlujoDisperso o None, segmentos). Las matrices son
+            vistas sin copia de la memoria compartida; 'segmentos' debe mantenerse vivo mientras se usen.
+    """
+    segmentos = []
+    vistas = {}
+    for clave, (nombre, forma, dtype) in descriptor['arrays'].items():
+        segmento = shared_memory.SharedMemory(name=nombre)
+        segmentos.append(segmento)
+        vistas[clave] = np.ndarray(forma, dtype=np.dtype(dtype), buffer=segmento.buf)
+
+    flujo_disperso = None
+    if descriptor['densidad'] is not None:
+        flujo_disperso = FlujoDisperso(*(vistas[campo] for campo in _CAMPOS_DISPERSOS), descriptor['densidad'])
+    return vistas['flujo_matrix'], vistas['distancia_matrix'], flujo_disperso, segmentos
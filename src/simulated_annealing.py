@@ -0,0 +1,235 @@
+# src/simulated_annealing.py
+
+import logging
+import time
+import numpy as np
+from numba import njit, prange, get_num_threads
+from src.fitness import calcular_coste_numba
+from src.optimization import calcular_delta_coste_numba, calcular_delta_exacto_numba
+from src.instrumentation import obtener_instrumentacion
+
+# Esquemas de enfriamiento de ejecutar_recocido_simulado
+ENFRIAMIENTOS = ('geometrico', 'adaptativo')
+
+
+@njit(cache=True, nogil=True)
+def recocido_cadena(actual, coste, mejor, mejor_coste, flujo_matrix, distancia_matrix, temperatura, num_movimientos,
+                    exacto):
+    """
+    Ejecuta 'num_movimientos' propuestas de intercambio aleatorio a temperatura constante (criterio de
+    Metropolis) sobre una cadena de recocido simulado, modificando su estado in situ.
+
+    Args:
+        actual (np.ndarray): Permutación actual de la cadena, se modifica in situ.
+        coste (float): Coste de 'actual'.
+        mejor (np.ndarray): Mejor permutación de la cadena, se modifica in situ.
+        mejor_coste (float): Coste de 'mejor'.
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        temperatura (float): Temperatura de este bloque de movimientos.
+        num_movimientos (int): Número de intercambios propuestos.
+        exacto (bool): Si es True los deltas se calculan con calcular_delta_exacto_numba (matrices
+            asimétricas o con diagonal no nula); si no, con calcular_delta_coste_numba.
+
+    Returns:
+        tuple: (coste de 'actual', coste de 'mejor', movimientos aceptados)
+    """
+    n = actual.shape[0]
+    aceptados = 0
+    for _ in range(num_movimientos):
+        r = np.random.randint(0, n)
+        s = np.random.randint(0, n - 1)
+        if s >= r:
+            s += 1
+        if exacto:
+            delta = calcular_delta_exacto_numba(actual, flujo_matrix, distancia_matrix, r, s)
+        else:
+            delta = calcular_delta_coste_numba(actual, flujo_matrix, distancia_matrix, r, s)
+        if delta <= 0.0 or np.random.random() < np.exp(-delta / temperatura):
+            actual[r], actual[s] = actual[s], actual[r]
+            coste += delta
+            aceptados += 1
+            if coste < mejor_coste - 1e-9:
+                mejor[:] = actual
+                mejor_coste = coste
+    return coste, mejor_coste, aceptados
+
+
+@njit(parallel=True, cache=True)
+def epoca_cadenas(actuales, costes, mejores, mejores_costes, temperaturas, flujo_matrix, distancia_matrix,
+                  num_movimientos, exacto, semillas, aceptados):
+    """
+    Avanza todas las cadenas 'num_movimientos' movimientos en paralelo (una cadena por hilo).
+
+    Cada cadena siembra el generador de su hilo con su propia semilla, por lo que el resultado no
+    depende del número de hilos ni del reparto de las cadenas.
+
+    Args:
+        actuales (np.ndarray): Permutación actual de cada cadena, shape=(cadenas, n).
+        costes (np.ndarray): Coste actual de cada cadena, shape=(cadenas,).
+        mejores (np.ndarray): Mejor permutación de cada cadena, shape=(cadenas, n).
+        mejores_costes (np.ndarray): Mejor coste de cada cadena, shape=(cadenas,).
+        temperaturas (np.ndarray): Temperatura de cada cadena, shape=(cadenas,).
+        flujo_matrix (np.ndarray): Matriz de flujos.
+        distancia_matrix (np.ndarray): Matriz de distancias.
+        num_movimientos (int): Movimientos propuestos por cadena.
+        exacto (bool): Ver recocido_cadena.
+        semillas (np.ndarray): Semilla de cada cadena para esta época, shape=(cadenas,).
+        aceptados (np.ndarray): Salida con los movimientos aceptados por cadena, shape=(cadenas,).
+    """
+    for c in prange(actuales.shape[0]):
+        np.random.seed(semillas[c])
+        costes[c], mejores_costes[c], aceptados[c] = recocido_cadena(
+            actuales[c], costes[c], mejores[c], mejores_costes[c], flujo_matrix, distancia_matrix, temperaturas[c],
+            num_movimientos, exacto
+        )
+
+
+def temperatura_inicial(individuo, flujo_matrix, distancia_matrix, aceptacion, exacto, muestras=1000, rng=None):
+    """
+    Estima la temperatura a la que un intercambio que empeora se acepta con probabilidad 'aceptacion',
+    a partir del delta positivo medio de 'muestras' intercambios aleatorios.
+
+    Returns:
+        float: Temperatura inicial.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(individuo)
+    deltas = []
+    delta_fn = calcular_delta_exacto_numba if exacto else calcular_delta_coste_numba
+    for _ in range(muestras):
+        r, s = rng.choice(n, size=2, replace=False)
+        delta = delta_fn(individuo, flujo_matrix, distancia_matrix, r, s)
+        if delta > 0:
+            deltas.append(delta)
+    if not deltas:
+        return 1.0
+    return float(np.mean(deltas) / -np.log(aceptacion))
+
+
+def ejecutar_recocido_simulado(n, flujo_matrix, distancia_matrix, parametros=None):
+    """
+    Ejecuta el recocido simulado con varias cadenas independientes en paralelo.
+
+    Las cadenas avanzan por épocas de 'movimientos_epoca' propuestas a temperatura constante. En cada
+    punto de sincronización (fin de época) se actualiza la temperatura y la cadena con peor coste
+    actual se reinicia desde la mejor solución global. Si la mejor global lleva 'epocas_recalentamiento'
+    épocas sin mejorar y las cadenas están congeladas (tasa de aceptación por debajo de
+    'aceptacion_final'), se recalienta multiplicando la temperatura por 'factor_recalentamiento'.
+
+    Enfriamiento 'geometrico': la temperatura baja de forma geométrica según la fracción del
+    presupuesto consumida (movimientos o tiempo), de T0 a Tf; tras un recalentamiento, desde la nueva
+    temperatura hasta Tf en el presupuesto restante. 'adaptativo': en cada época la temperatura de
+    cada cadena baja si su tasa de aceptación supera un objetivo, que decrece geométricamente de
+    'aceptacion_inicial' a 'aceptacion_final', y sube en caso contrario.
+
+    Args:
+        n (int): Número de instalaciones/localizaciones.
+        flujo_matrix (numpy.ndarray): Matriz de flujos, shape=(n, n).
+        distancia_matrix (numpy.ndarray): Matriz de distancias, shape=(n, n).
+        parametros (dict, optional): Parámetros del recocido simulado.
+
+    Returns:
+        tuple: Mejor solución encontrada (individuo, coste) y su historial de fitness (mejor coste global por época).
+    """
+    if parametros is None:
+        parametros = {}
+    cadenas = parametros.get('cadenas') or get_num_threads()
+    enfriamiento = parametros.get('enfriamiento', 'geometrico')
+    if enfriamiento not in ENFRIAMIENTOS:
+        raise ValueError(f"Enfriamiento desconocido: {enfriamiento}. Opciones: {ENFRIAMIENTOS}")
+    tiempo_limite = parametros.get('tiempo_limite_sa')
+    movimientos_totales = parametros.get('movimientos_sa') or (None if tiempo_limite else 100000 * n)
+    movimientos_epoca = parametros.get('movimientos_epoca') or 50 * n
+    aceptacion_inicial = parametros.get('aceptacion_inicial', 0.5)
+    aceptacion_final = parametros.get('aceptacion_final', 1e-3)
+    epocas_recalentamiento = parametros.get('epocas_recalentamiento', 200)
+    factor_recalentamiento = parametros.get('factor_recalentamiento', 10.0)
+
+    instrumentacion = obtener_instrumentacion(parametros)
+
+    rng = np.random.default_rng(np.random.randint(2 ** 31 - 1))
+    flujo_matrix = np.ascontiguousarray(flujo_matrix)
+    distancia_matrix = np.ascontiguousarray(distancia_matrix)
+    # calcular_delta_coste_numba omite los términos del par (r, s) y de la diagonal, que se anulan con
+    # matrices simétricas y diagonal nula; en otro caso se usa el delta exacto
+    exacto = not (np.array_equal(flujo_matrix, flujo_matrix.T) and np.array_equal(distancia_matrix, distancia_matrix.T)
+                  and not np.diagonal(flujo_matrix).any() and not np.diagonal(distancia_matrix).any())
+
+    actuales = np.array([rng.permutation(n) for _ in range(cadenas)], dtype=np.int64)
+    costes = np.array([calcular_coste_numba(ind, flujo_matrix, distancia_matrix) for ind in actuales], dtype=np.float64)
+    mejores = actuales.copy()
+    mejores_costes = costes.copy()
+    t0 = parametros.get('temperatura_inicial') or temperatura_inicial(actuales[0], flujo_matrix, distancia_matrix,
+                                                                        aceptacion_inicial, exacto, rng=rng)
+    tf = parametros.get('temperatura_final') or t0 * 1e-3
+    temperaturas = np.full(cadenas, t0)
+    # Inicio del tramo geométrico actual (temperatura y progreso), que se reinicia al recalentar
+    t_tramo, progreso_tramo = t0, 0.0
+    aceptados = np.zeros(cadenas, dtype=np.int64)
+
+    # Época vacía para compilar los núcleos antes de empezar a contar el tiempo
+    epoca_cadenas(actuales, costes, mejores, mejores_costes, temperaturas, flujo_matrix, distancia_matrix, 0, exacto,
+                  rng.integers(0, 2 ** 31 - 1, size=cadenas), aceptados)
+
+    historial = []
+    mejor_global = int(np.argmin(mejores_costes))
+    mejor_solucion = (mejores[mejor_global].copy(), float(mejores_costes[mejor_global]))
+    epocas_sin_mejora = 0
+    recalentamientos = 0
+    movimientos = 0
+    progreso = 0.0
+    inicio = time.perf_counter()
+    while progreso < 1.0:
+        num_movimientos = movimientos_epoca
+        if movimientos_totales is not None:
+            num_movimientos = min(num_movimientos, movimientos_totales - movimientos)
+        with instrumentacion.fase('recocido'):
+            epoca_cadenas(actuales, costes, mejores, mejores_costes, temperaturas, flujo_matrix, distancia_matrix,
+                          num_movimientos, exacto, rng.integers(0, 2 ** 31 - 1, size=cadenas), aceptados)
+        instrumentacion.sumar('movimientos_propuestos', num_movimientos * cadenas)
+        instrumentacion.sumar('movimientos_aceptados', int(aceptados.sum()))
+        movimientos += num_movimientos
+        transcurrido = time.perf_counter() - inicio
+        progreso = max(movimientos / movimientos_totales if movimientos_totales else 0.0,
+                       transcurrido / tiempo_limite if tiempo_limite else 0.0)
+
+        # Punto de sincronización: mejor global y reinicio de la peor cadena desde ella
+        c = int(np.argmin(mejores_costes))
+        if mejores_costes[c] < mejor_solucion[1] - 1e-9:
+            mejor_solucion = (mejores[c].copy(), float(mejores_costes[c]))
+            epocas_sin_mejora = 0
+        else:
+            epocas_sin_mejora += 1
+        historial.append(mejor_solucion[1])
+        instrumentacion.cerrar_generacion(len(historial) - 1, mejor_solucion[1])
+        peor = int(np.argmax(costes))
+        if cadenas > 1 and peor != c:
+            actuales[peor] = mejor_solucion[0]
+            costes[peor] = mejor_solucion[1]
+
+        # Enfriamiento
+        tasa = aceptados / max(num_movimientos, 1)
+        if enfriamiento == 'geometrico':
+            fraccion = (min(progreso, 1.0) - progreso_tramo) / max(1.0 - progreso_tramo, 1e-12)
+            temperaturas[:] = t_tramo * (tf / t_tramo) ** fraccion
+        else:
+            objetivo = aceptacion_inicial * (aceptacion_final / aceptacion_inicial) ** min(progreso, 1.0)
+            temperaturas = np.where(tasa > objetivo, temperaturas * 0.9, temperaturas / 0.9)
+
+        # Recalentamiento tras un estancamiento de la mejor global con las cadenas congeladas
+        if (epocas_recalentamiento and epocas_sin_mejora >= epocas_recalentamiento
+                and tasa.mean() < aceptacion_final and progreso < 1.0):
+            temperaturas = np.minimum(temperaturas * factor_recalentamiento, t0)
+            t_tramo, progreso_tramo = float(temperaturas.max()), progreso
+            epocas_sin_mejora = 0
+            recalentamientos += 1
+
+    duracion = time.perf_counter() - inicio
+    # El coste acumulado por deltas puede arrastrar errores de redondeo
+    mejor_solucion = (mejor_solucion[0], float(calcular_coste_numba(mejor_solucion[0], flujo_matrix, distancia_matrix)))
+    total = movimientos * cadenas
+    logging.info(f"Recocido simulado: {cadenas} cadenas, {total} movimientos en {duracion:.2f} s "
+                 f"({total / max(duracion, 1e-9):.0f} movimientos/s), {recalentamientos} recalentamientos, "
+                 f"T0 = {t0:.4g}, mejor coste = {mejor_solucion[1]}")
+    return mejor_solucion, historial
@@ -0,0 +1,47 @@
+# src/tabu_search.py
+
+import logging
+from src.optimization import ITERACIONES_TABU_POR_N, calcula_busqueda_tabu_robusta, generar_individuo
+from src.instrumentation import obtener_instrumentacion
+
+
+def ejecutar_busqueda_tabu(n, flujo_matrix, distancia_matrix, parametros=None):
+    """
+    Ejecuta la búsqueda tabú robusta (ver src.optimization.calcula_busqueda_tabu_robusta) como
+    algoritmo independiente, desde una permutación aleatoria.
+
+    Args:
+        n (int): Número de instalaciones/localizaciones.
+        flujo_matrix (numpy.ndarray): Matriz de flujos, shape=(n, n).
+        distancia_matrix (numpy.ndarray): Matriz de distancias, shape=(n, n).
+        parametros (dict, optional): Parámetros de la búsqueda tabú.
+
+    Returns:
+        tuple: Mejor solución encontrada (individuo, coste) y su historial de fitness (mejor coste tras cada bloque de iteraciones).
+    """
+    if parametros is None:
+        parametros = {
+            'iteraciones_tabu': ITERACIONES_TABU_POR_N * n,
+            'tiempo_limite_tabu': None,
+            'tenencia_tabu': None,  # (mínimo, máximo); por defecto (0.9·n, 1.1·n)
+            'aspiracion_tabu': None  # Por defecto 5·n²
+        }
+
+    tenencia_min, tenencia_max = parametros.get('tenencia_tabu') or (None, None)
+    # Sin iteraciones ni límite de tiempo, calcula_busqueda_tabu_robusta usa ITERACIONES_TABU_POR_N·n
+    max_iter = parametros.get('iteraciones_tabu') or None
+    tiempo_limite = parametros.get('tiempo_limite_tabu')
+
+    individuo = generar_individuo(n)
+    seguimiento = []
+    mejor_individuo, mejor_coste = calcula_busqueda_tabu_robusta(
+        individuo, flujo_matrix, distancia_matrix, max_iter=max_iter, tiempo_limite=tiempo_limite,
+        tenencia_min=tenencia_min, tenencia_max=tenencia_max, aspiracion=parametros.get('aspiracion_tabu'),
+        historial=seguimiento, instrumentacion=obtener_instrumentacion(parametros)
+    )
+
+    iteraciones, _, duracion = seguimiento[-1] if seguimiento else (0, mejor_coste, 0.0)
+    logging.info(f"Búsqueda tabú robusta: {iteraciones} iteraciones en {duracion:.2f} s "
+                 f"({iteraciones / max(duracion, 1e-9):.0f} iteraciones/s), mejor coste = {mejor_coste}")
+    historial = [float(coste) for _, coste, _ in seguimiento]
+    return (mejor_individuo, mejor_coste), historial
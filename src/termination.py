@@ -0,0 +1,202 @@
+# src/termination.py
+
+import logging
+import time
+import numpy as np
+
+# Motivos de parada que registra ControlParada (además de 'generaciones': se completaron todas)
+MOTIVOS_PARADA = ('generaciones', 'tiempo_limite', 'coste_objetivo', 'max_evaluaciones', 'estancamiento')
+
+# Claves de los contadores que cuentan para el presupuesto de evaluaciones: las evaluaciones reales
+# de CacheFitness.evaluar y las iteraciones de búsqueda local de optimizar_poblacion
+CLAVES_EVALUACIONES = ('evaluaciones', 'iteraciones_busqueda_local')
+
+
+def contar_evaluaciones(*contadores):
+    """
+    Suma las evaluaciones de fitness de los diccionarios de contadores dados (los None se ignoran):
+    las completas e incrementales de CacheFitness.evaluar y las iteraciones de la búsqueda local de
+    optimizar_poblacion, que cuentan como una evaluación cada una.
+
+    Returns:
+        int: Evaluaciones para ControlParada.registrar.
+    """
+    return sum(parciales.get(clave, 0) for parciales in contadores if parciales is not None
+               for clave in CLAVES_EVALUACIONES)
+
+
+def diversidad_poblacion(poblacion):
+    """
+    Calcula la diversidad de una población de permutaciones: la distancia de Hamming media entre
+    todas las parejas de individuos, normalizada por n (0 si todos son iguales, cerca de 1 si no
+    comparten ninguna asignación). Se obtiene de las frecuencias de cada valor en cada posición,
+    en O(poblacion·n) en lugar de O(poblacion²·n).
+
+    Args:
+        poblacion (numpy.ndarray): Población, shape=(tam, n).
+
+    Returns:
+        float: Diversidad de la población en [0, 1].
+    """
+    tam, n = poblacion.shape
+    if tam < 2:
+        return 0.0
+    # Frecuencia de cada (posición, valor): clave posición·n + valor
+    claves = (np.arange(n) * n + poblacion).ravel()
+    frecuencias = np.bincount(claves, minlength=n * n) / tam
+    # Fracción media de parejas (sin reemplazo) que coinciden en cada posición
+    coincidencia = (tam * np.dot(frecuencias, frecuencias) / n - 1) / (tam - 1)
+    return float(min(1.0, max(0.0, 1.0 - coincidencia)))
+
+
+class ControlParada:
+    """
+    Criterios de parada compartidos por los drivers del Algoritmo Genético, además del número de
+    generaciones: tiempo de reloj, coste objetivo, evaluaciones de fitness y estancamiento. Los
+    drivers lo obtienen con obtener_control_parada y lo consultan una vez por generación; el motivo
+    de la parada queda en 'motivo' (uno de MOTIVOS_PARADA).
+
+    Las evaluaciones son las realmente calculadas (los aciertos de la caché de fitness no cuentan)
+    más, en las variantes híbridas, las iteraciones de la búsqueda local (ver contar_evaluaciones).
+
+    Hay estancamiento cuando el mejor coste no mejora durante 'estancamiento' generaciones seguidas.
+    Con 'diversidad_minima' además la población debe haber convergido (diversidad_poblacion por
+    debajo del umbral): una población diversa que no mejora sigue explorando.
+
+    Uso:
+        control.iniciar()
+        for gen in range(parametros['generaciones']):
+            if control.detenido:
+                break
+            contadores_evaluacion, contadores_busqueda_local = {}, {}
+            ...  # optimizar_poblacion(..., contadores=contadores_busqueda_local)
+            fitness = evaluador.evaluar(poblacion, contadores=contadores_evaluacion)
+            ...
+            control.registrar(mejor_coste, contar_evaluaciones(contadores_evaluacion, contadores_busqueda_local),
+                              poblacion)
+        control.finalizar()
+
+    Args:
+        tiempo_limite (float, optional): Segundos de reloj máximos desde iniciar().
+        coste_objetivo (float, optional): Se para al alcanzar un coste menor o igual.
+        max_evaluaciones (int, optional): Evaluaciones de fitness máximas (con búsqueda local).
+        estancamiento (int, optional): Generaciones sin mejora tras las que se para.
+        diversidad_minima (float, optional): Diversidad por debajo de la cual la población ha convergido.
+    """
+
+    def __init__(self, tiempo_limite=None, coste_objetivo=None, max_evaluaciones=None, estancamiento=None,
+                 diversidad_minima=None):
+        self.tiempo_limite = tiempo_limite
+        self.coste_objetivo = coste_objetivo
+        self.max_evaluaciones = max_evaluaciones
+        self.estancamiento = estancamiento
+        self.diversidad_minima = diversidad_minima
+        self.iniciar()
+
+    @classmethod
+    def desde_parametros(cls, parametros):
+        """
+        Crea el control con las claves 'tiempo_limite', 'coste_objetivo', 'max_evaluaciones',
+        'estancamiento' y 'diversidad_minima' de los parámetros (ausentes: sin ese criterio).
+        """
+        return cls(parametros.get('tiempo_limite'), parametros.get('coste_objetivo'),
+                   parametros.get('max_evaluaciones'), parametros.get('estancamiento'),
+                   parametros.get('diversidad_minima'))
+
+    def iniciar(self):
+        """
+        Reinicia el reloj, los contadores y el motivo de parada.
+        """
+        self.motivo = None
+        self.generaciones = 0
+        self.evaluaciones = 0
+        self.sin_mejora = 0
+        self.mejor_coste = np.inf
+        self.diversidad = None
+        self._poblacion = None
+        self._inicio = time.perf_counter()
+        self._fin = None
+
+    @property
+    def detenido(self):
+        return self.motivo is not None
+
+    @property
+    def segundos(self):
+        return (self._fin if self._fin is not None else time.perf_counter()) - self._inicio
+
+    def registrar(self, mejor_coste, evaluaciones, poblacion=None):
+        """
+        Registra una generación (o la población inicial) y comprueba los criterios de parada.
+
+        Args:
+            mejor_coste (float): Mejor coste encontrado hasta ahora.
+            evaluaciones (int): Evaluaciones de fitness calculadas en esta generación (ver
+                contar_evaluaciones), no el tamaño de la población.
+            poblacion (numpy.ndarray, optional): Población actual, para medir su diversidad.
+
+        Returns:
+            bool: True si hay que parar (el motivo queda en 'motivo').
+        """
+        self.evaluaciones += evaluaciones
+        if mejor_coste < self.mejor_coste:
+            self.mejor_coste = mejor_coste
+            self.sin_mejora = 0
+        else:
+            self.sin_mejora += 1
+        self.generaciones += 1
+        self._poblacion = poblacion
+
+        if self.coste_objetivo is not None and self.mejor_coste <= self.coste_objetivo:
+            self.motivo = 'coste_objetivo'
+        elif self.max_evaluaciones is not None and self.evaluaciones >= self.max_evaluaciones:
+            self.motivo = 'max_evaluaciones'
+        elif self.tiempo_limite is not None and self.segundos >= self.tiempo_limite:
+            self.motivo = 'tiempo_limite'
+        elif self.estancamiento and self.sin_mejora >= self.estancamiento and self._convergida(poblacion):
+            self.motivo = 'estancamiento'
+        return self.detenido
+
+    def _convergida(self, poblacion):
+        """
+        Indica si la población ha convergido (siempre, si no hay umbral de diversidad).
+        """
+        if self.diversidad_minima is None or poblacion is None:
+            return True
+        self.diversidad = diversidad_poblacion(poblacion)
+        return self.diversidad < self.diversidad_minima
+
+    def finalizar(self):
+        """
+        Fija el motivo 'generaciones' si no se ha parado antes, mide la diversidad de la última
+        población registrada y escribe el motivo en el log.
+
+        Returns:
+            str: Motivo de la parada.
+        """
+        if self.motivo is None:
+            self.motivo = 'generaciones'
+        self._fin = time.perf_counter()
+        if self._poblacion is not None:
+            self.diversidad = diversidad_poblacion(self._poblacion)
+            self._poblacion = None
+        logging.info(f"Parada por {self.motivo}: {self.generaciones - 1} generaciones, "
+                     f"{self.evaluaciones} evaluaciones, {self.segundos:.2f} s, mejor coste = {self.mejor_coste}"
+                     + (f", diversidad = {self.diversidad:.3f}" if self.diversidad is not None else ""))
+        return self.motivo
+
+    def resumen(self):
+        """
+        Devuelve el motivo de la parada y el estado del control como diccionario serializable en JSON.
+        """
+        return {'motivo_parada': self.motivo, 'generaciones_completadas': max(0, self.generaciones - 1),
+                'evaluaciones': self.evaluaciones, 'segundos_hasta_parada': self.segundos,
+                'generaciones_sin_mejora': self.sin_mejora, 'diversidad': self.diversidad}
+
+
+def obtener_control_parada(parametros):
+    """
+    Devuelve el control de parametros['control_parada'] o uno nuevo creado con los criterios de los
+    parámetros (ver ControlParada.desde_parametros).
+    """
+    return parametros.get('control_parada') or ControlParada.desde_parametros(parametros)
@@ -2,41 +2,354 @@
 
 import numpy as np
 import os
+import glob
+import json
+import hashlib
 import logging
+from collections import namedtuple
+from numba import njit
 
+# Densidad máxima (fracción de flujos no nulos) para usar la vista dispersa de la matriz de flujos
+UMBRAL_DENSIDAD_DISPERSA = 0.25
 
-def cargar_datos(ruta_archivo):
+# Directorio por defecto de la caché binaria de instancias (ver cargar_datos_cache)
+DIRECTORIO_CACHE_DEFECTO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache')
+
+# Directorio por defecto de las instancias (ver resolver_instancias)
+DIRECTORIO_DATOS_DEFECTO = os.path.join('data', 'raw')
+
+# Versión del formato de la caché; al cambiarla se regeneran todas las cachés existentes
+VERSION_CACHE = 1
+
+# Vista CSR de la matriz de flujos: filas (flujos salientes) y columnas (flujos entrantes, CSR de la traspuesta)
+FlujoDisperso = namedtuple('FlujoDisperso', ['indptr', 'indices', 'datos', 'indptr_t', 'indices_t', 'datos_t', 'densidad'])
+
+
+def construir_flujo_disperso(flujo_matrix):
+    """
+    Construye la vista CSR (lista de adyacencia) de la matriz de flujos y de su traspuesta.
+
+    Args:
+        flujo_matrix (numpy.ndarray): Matriz de flujos, shape=(n, n).
+
+    Returns:
+        FlujoDisperso: indptr/indices/datos por filas y por columnas, y la densidad de la matriz.
+    """
+    flujo_matrix = np.asarray(flujo_matrix)
+
+    def csr(matriz):
+        filas, columnas = np.nonzero(matriz)
+        indptr = np.zeros(matriz.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=matriz.shape[0]), out=indptr[1:])
+        return indptr, columnas.astype(np.int64), np.ascontiguousarray(matriz[filas, columnas])
+
+    indptr, indices, datos = csr(flujo_matrix)
+    indptr_t, indices_t, datos_t = csr(flujo_matrix.T)
+    densidad = datos.size / flujo_matrix.size if flujo_matrix.size else 1.0
+    return FlujoDisperso(indptr, indices, datos, indptr_t, indices_t, datos_t, densidad)
+
+
+def detectar_flujo_disperso(flujo_matrix, umbral_densidad=UMBRAL_DENSIDAD_DISPERSA):
+    """
+    Devuelve la vista dispersa de la matriz de flujos si su densidad no supera el umbral.
+
+    Args:
+        flujo_matrix (numpy.ndarray): Matriz de flujos, shape=(n, n).
+        umbral_densidad (float, optional): Fracción máxima de flujos no nulos para considerarla dispersa.
+
+    Returns:
+        FlujoDisperso o None: Vista CSR si la matriz es dispersa, None en caso contrario.
+    """
+    densidad = np.count_nonzero(flujo_matrix) / max(np.size(flujo_matrix), 1)
+    if densidad > umbral_densidad:
+        return None
+    flujo_disperso = construir_flujo_disperso(flujo_matrix)
+    logging.info(f"Matriz de flujos dispersa (densidad {densidad:.3f}): se usará la evaluación dispersa")
+    return flujo_disperso
+
+
+@njit(cache=True)
+def _leer_numeros(buf, posicion, out):
+    """
+    Lee números separados por espacios en blanco (cualquier disposición de líneas) de un buffer de bytes.
+
+    Acepta enteros y decimales con signo y exponente opcionales. La mantisa se acumula como entero y
+    se escala con una única operación, por lo que el resultado coincide con el de strtod en los
+    valores de QAPLIB.
+
+    Args:
+        buf (np.ndarray): Contenido del archivo como uint8.
+        posicion (int): Desplazamiento en bytes desde el que empezar a leer.
+        out (np.ndarray): Array float64 que se rellena; se leen como máximo out.size números.
+
+    Returns:
+        tuple: (números leídos, desplazamiento tras el último número, desplazamiento del primer token
+            inválido o -1 si no lo hay).
+    """
+    n = buf.size
+    leidos = 0
+    while leidos < out.size:
+        # Saltar espacios en blanco (espacio, \t, \n, \v, \f, \r)
+        while posicion < n and (buf[posicion] == 32 or 9 <= buf[posicion] <= 13):
+            posicion += 1
+        if posicion >= n:
+            break
+        inicio = posicion
+        negativo = False
+        if buf[posicion] == 45 or buf[posicion] == 43:
+            negativo = buf[posicion] == 45
+            posicion += 1
+        mantisa = 0.0
+        decimales = 0
+        digitos = 0
+        while posicion < n and 48 <= buf[posicion] <= 57:
+            mantisa = mantisa * 10.0 + (buf[posicion] - 48)
+            digitos += 1
+            posicion += 1
+        if posicion < n and buf[posicion] == 46:
+            posicion += 1
+            while posicion < n and 48 <= buf[posicion] <= 57:
+                mantisa = mantisa * 10.0 + (buf[posicion] - 48)
+                decimales += 1
+                digitos += 1
+                posicion += 1
+        if digitos == 0:
+            return leidos, posicion, inicio
+        exponente = 0
+        if posicion < n and (buf[posicion] == 101 or buf[posicion] == 69):
+            posicion += 1
+            negativo_exp = False
+            if posicion < n and (buf[posicion] == 45 or buf[posicion] == 43):
+                negativo_exp = buf[posicion] == 45
+                posicion += 1
+            if posicion >= n or not (48 <= buf[posicion] <= 57):
+                return leidos, posicion, inicio
+            while posicion < n and 48 <= buf[posicion] <= 57:
+                exponente = exponente * 10 + (buf[posicion] - 48)
+                posicion += 1
+            if negativo_exp:
+                exponente = -exponente
+        # El token debe terminar en un espacio en blanco o en el final del archivo
+        if posicion < n and not (buf[posicion] == 32 or 9 <= buf[posicion] <= 13):
+            return leidos, posicion, inicio
+        escala = exponente - decimales
+        valor = mantisa * 10.0 ** escala if escala >= 0 else mantisa / 10.0 ** (-escala)
+        out[leidos] = -valor if negativo else valor
+        leidos += 1
+    return leidos, posicion, -1
+
+
+def _posicion_en_texto(datos, desplazamiento):
+    """
+    Convierte un desplazamiento en bytes en (línea, columna, token), con línea y columna desde 1.
+    """
+    linea = datos.count(b'\n', 0, desplazamiento) + 1
+    columna = desplazamiento - (datos.rfind(b'\n', 0, desplazamiento) + 1) + 1
+    token = datos[desplazamiento:].split(maxsplit=1)
+    return linea, columna, token[0].decode('ascii', errors='replace')[:20] if token else ''
+
+
+def _leer_instancia_texto(ruta_archivo):
+    """
+    Lee una instancia en formato de texto QAPLIB.
+
+    Tras el tamaño n se leen exactamente 2n² números (la matriz de flujos y la de distancias, por
+    filas) sin depender de cómo estén repartidos en líneas: se admiten filas partidas en varias
+    líneas y líneas en blanco entre bloques. El archivo se lee de una vez como bytes y se convierte
+    con _leer_numeros, sin pasar por cadenas de Python.
+
+    Args:
+        ruta_archivo (str): Ruta al archivo de datos.
+
+    Returns:
+        tuple: Número de instalaciones, matriz de flujos (int32) y matriz de distancias (float32).
+
+    Raises:
+        ValueError: Si n no es un entero positivo, hay un token no numérico o el número de valores
+            no es 2n². El mensaje indica la línea y columna del problema.
+    """
+    with open(ruta_archivo, 'rb') as f:
+        datos = f.read()
+    buf = np.frombuffer(datos, dtype=np.uint8)
+
+    def error(mensaje, desplazamiento):
+        linea, columna, token = _posicion_en_texto(datos, desplazamiento)
+        return ValueError(f"{ruta_archivo}, línea {linea}, columna {columna} ('{token}'): {mensaje}")
+
+    cabecera = np.empty(1, dtype=np.float64)
+    leidos, posicion, invalido = _leer_numeros(buf, 0, cabecera)
+    if invalido >= 0:
+        raise error("el tamaño n no es numérico", invalido)
+    if leidos == 0:
+        raise ValueError(f"El archivo {ruta_archivo} está vacío.")
+    n = int(cabecera[0])
+    if n != cabecera[0] or n <= 0:
+        raise error(f"el tamaño n debe ser un entero positivo y es {cabecera[0]}", len(datos) - len(datos.lstrip()))
+
+    valores = np.empty(2 * n * n, dtype=np.float64)
+    leidos, posicion, invalido = _leer_numeros(buf, posicion, valores)
+    if invalido >= 0:
+        raise error(f"valor no numérico tras leer {leidos} de los {2 * n * n} valores esperados", invalido)
+    if leidos < valores.size:
+        raise ValueError(f"El archivo {ruta_archivo} no tiene las dimensiones esperadas: se esperaban "
+                         f"2n² = {valores.size} valores para n = {n} y solo hay {leidos}.")
+    resto = datos[posicion:]
+    if resto.strip():
+        raise error(f"sobran valores tras los 2n² = {valores.size} esperados para n = {n}",
+                    posicion + len(resto) - len(resto.lstrip()))
+
+    # Separar las matrices de flujo y distancia
+    flow = valores[:n * n].reshape(n, n).astype(np.int32)
+    distances = valores[n * n:].reshape(n, n).astype(np.float32)
+    return n, flow, distances
+
+
+def _hash_archivo(ruta_archivo, tam_bloque=1 << 20):
+    """
+    Calcula el SHA-256 del contenido de un archivo.
+    """
+    resumen = hashlib.sha256()
+    with open(ruta_archivo, 'rb') as f:
+        for bloque in iter(lambda: f.read(tam_bloque), b''):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+def _rutas_cache(ruta_archivo, directorio_cache):
+    """
+    Devuelve las rutas de los archivos de caché (flujos, distancias, metadatos) de una instancia.
+
+    El nombre incluye un resumen de la ruta absoluta para que dos instancias homónimas en
+    directorios distintos no compartan caché.
+    """
+    ruta_absoluta = os.path.abspath(ruta_archivo)
+    nombre = os.path.splitext(os.path.basename(ruta_absoluta))[0]
+    prefijo = os.path.join(directorio_cache, f"{nombre}-{hashlib.sha1(ruta_absoluta.encode()).hexdigest()[:8]}")
+    return f"{prefijo}.flujo.npy", f"{prefijo}.distancias.npy", f"{prefijo}.meta.json"
+
+
+def _escribir_json_atomico(ruta, contenido):
+    """
+    Escribe un JSON en un archivo temporal y lo renombra, para no dejar nunca un archivo a medias.
+    """
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, indent=4)
+    os.replace(temporal, ruta)
+
+
+def cargar_datos_cache(ruta_archivo, directorio_cache=DIRECTORIO_CACHE_DEFECTO):
+    """
+    Carga una instancia desde la caché binaria, convirtiendo el archivo de texto solo si hace falta.
+
+    La primera carga guarda las matrices como .npy (int32/float32) junto a un JSON con el tamaño,
+    la fecha de modificación y el SHA-256 del archivo original. Las siguientes se sirven con
+    np.load(mmap_mode='r'), sin parsear ni copiar. Si cambian el tamaño o la fecha se recalcula el
+    hash: si coincide solo se actualizan los metadatos; si no, se regenera la caché.
+
+    Args:
+        ruta_archivo (str): Ruta al archivo de datos.
+        directorio_cache (str, optional): Directorio donde se guardan los archivos binarios.
+
+    Returns:
+        tuple: Número de instalaciones, matriz de flujos (int32) y matriz de distancias (float32),
+            ambas de solo lectura.
+    """
+    ruta_flujo, ruta_distancias, ruta_meta = _rutas_cache(ruta_archivo, directorio_cache)
+    estado = os.stat(ruta_archivo)
+    meta = None
+    if os.path.isfile(ruta_meta) and os.path.isfile(ruta_flujo) and os.path.isfile(ruta_distancias):
+        try:
+            with open(ruta_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Metadatos de caché ilegibles en {ruta_meta}: {e}")
+
+    valida = meta is not None and meta.get('version') == VERSION_CACHE
+    if valida and (meta['tamano'] != estado.st_size or meta['mtime_ns'] != estado.st_mtime_ns):
+        valida = meta['sha256'] == _hash_archivo(ruta_archivo)
+        if valida:
+            meta.update(tamano=estado.st_size, mtime_ns=estado.st_mtime_ns)
+            _escribir_json_atomico(ruta_meta, meta)
+
+    if valida:
+        flow = np.load(ruta_flujo, mmap_mode='r')
+        distances = np.load(ruta_distancias, mmap_mode='r')
+        logging.info(f"Instancia {ruta_archivo} cargada desde la caché {directorio_cache}")
+        return flow.shape[0], flow, distances
+
+    n, flow, distances = _leer_instancia_texto(ruta_archivo)
+    try:
+        os.makedirs(directorio_cache, exist_ok=True)
+        for ruta, matriz in ((ruta_flujo, flow), (ruta_distancias, distances)):
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, 'wb') as f:
+                np.save(f, matriz)
+            os.replace(temporal, ruta)
+        # Los metadatos se escriben al final: sin ellos la caché nunca se considera válida
+        _escribir_json_atomico(ruta_meta, {
+            'version': VERSION_CACHE,
+            'origen': os.path.abspath(ruta_archivo),
+            'tamano': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            'sha256': _hash_archivo(ruta_archivo)
+        })
+        logging.info(f"Caché binaria de {ruta_archivo} creada en {directorio_cache}")
+    except OSError as e:
+        logging.warning(f"No se pudo escribir la caché de {ruta_archivo}: {e}")
+    return n, flow, distances
+
+
+def resolver_instancias(nombres, directorio=DIRECTORIO_DATOS_DEFECTO):
+    """
+    Devuelve las rutas de las instancias pedidas: nombres ('nug30'), patrones ('tai*') o 'all'.
+    La usan benchmarks/suite.py y src.experiments.
+    """
+    if nombres == ['all']:
+        nombres = ['*']
+    rutas = []
+    for nombre in nombres:
+        encontradas = sorted(glob.glob(os.path.join(directorio, f"{nombre}.dat")))
+        if not encontradas:
+            raise ValueError(f"No hay instancias que coincidan con '{nombre}' en {directorio}")
+        rutas.extend(ruta for ruta in encontradas if ruta not in rutas)
+    return rutas
+
+def cargar_datos(ruta_archivo, detectar_dispersion=False, cache=None):
     """
     Carga los datos del archivo especificado.
 
     El archivo debe tener el siguiente formato:
     n
-    A (matriz de flujos) - n líneas de n enteros
-    B (matriz de distancias) - n líneas de n números (pueden ser flotantes)
+    A (matriz de flujos) - n filas de n enteros
+    B (matriz de distancias) - n filas de n números (pueden ser flotantes)
+    Las filas pueden estar partidas en varias líneas y los bloques separados por líneas en blanco.
 
     Args:
         ruta_archivo (str): Ruta al archivo de datos.
+        detectar_dispersion (bool, optional): Si es True, devuelve además la vista dispersa
+            de la matriz de flujos (o None si la matriz no es suficientemente dispersa).
+        cache (bool o str, optional): Si es True usa la caché binaria en DIRECTORIO_CACHE_DEFECTO; si es
+            una ruta, la usa como directorio de caché (ver cargar_datos_cache). Por defecto lee el texto.
 
     Returns:
-        tuple: Número de instalaciones, matriz de flujos (int32), matriz de distancias (float32).
+        tuple: Número de instalaciones, matriz de flujos (int32), matriz de distancias (float32)
+            y, si detectar_dispersion es True, el FlujoDisperso correspondiente. Con caché, las
+            matrices son mapas de memoria de solo lectura.
     """
     try:
         # Verificar si el archivo existe
         if not os.path.isfile(ruta_archivo):
             raise FileNotFoundError(f"El archivo {ruta_archivo} no existe.")
 
-        # Cargar todos los datos excepto la primera línea (n)
-        data = np.loadtxt(ruta_archivo, skiprows=1)
-
-        # Verificar que hay 2n líneas después de la primera línea
-        n = int(data.shape[0] / 2)
-        if data.shape[0] != 2 * n or data.shape[1] != n:
-            raise ValueError(f"El archivo {ruta_archivo} no tiene las dimensiones esperadas.")
-
-        # Separar las matrices de flujo y distancia
-        flow = np.int32(data[:n, :])
-        distances = np.float32(data[n:, :])
+        if cache:
+            directorio_cache = DIRECTORIO_CACHE_DEFECTO if cache is True else cache
+            n, flow, distances = cargar_datos_cache(ruta_archivo, directorio_cache)
+        else:
+            n, flow, distances = _leer_instancia_texto(ruta_archivo)
 
+        if detectar_dispersion:
+            return n, flow, distances, detectar_flujo_disperso(flow)
         return n, flow, distances
 
     except Exception as e:
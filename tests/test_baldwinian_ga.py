@@ -0,0 +1,32 @@
+# tests/test_baldwinian_ga.py
+
+import unittest
+import numpy as np
+from src.baldwinian_ga import ejecutar_varianta_baldwiniana
+from src.instrumentation import Instrumentacion
+
+class TestBaldwinianGA(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.n = 10
+        self.flujo_matrix = rng.integers(0, 10, size=(self.n, self.n))
+        self.distancia_matrix = rng.integers(1, 20, size=(self.n, self.n)).astype(np.float64)
+
+    def test_busqueda_tabu_respeta_max_iter(self):
+        np.random.seed(0)
+        instrumentacion = Instrumentacion()
+        parametros = {'poblacion': 10, 'generaciones': 2, 'tasa_cruce': 0.8, 'tasa_mutacion': 0.05,
+                      'elitismo': True, 'tam_poblacion_opt': 3, 'hill_climbing_max_iter': 7,
+                      'motor_busqueda_local': 'tabu', 'tam_memo_busqueda_local': 0,
+                      'instrumentacion': instrumentacion}
+        (mejor, coste), historial = ejecutar_varianta_baldwiniana(self.n, self.flujo_matrix, self.distancia_matrix,
+                                                                  parametros)
+        self.assertEqual(sorted(mejor), list(range(self.n)))
+        self.assertEqual(len(historial), 3)
+        contadores = instrumentacion.informe()['contadores']
+        # La búsqueda tabú no para antes: cada búsqueda hace exactamente hill_climbing_max_iter iteraciones
+        self.assertGreater(contadores['busquedas_locales'], 0)
+        self.assertEqual(contadores['iteraciones_busqueda_local'], 7 * contadores['busquedas_locales'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/test_benchmark_suite.py
+
+import glob
+import os
+import tempfile
+import unittest
+from benchmarks.suite import (cargar_mejores_conocidos, cargar_resultados, comparar, guardar_resultados,
+                              tiempo_hasta_objetivo, COLUMNAS)
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def _fila(self, semilla, evaluaciones_por_segundo, desviacion):
+        return {'variante': 'standard', 'instancia': 'nug12', 'semilla': semilla, 'estado': 'ok',
+                'evaluaciones_por_segundo': evaluaciones_por_segundo, 'movimientos_por_segundo': None,
+                'segundos': 1.0, 'tiempo_objetivo': None, 'desviacion': desviacion, 'rss_pico_mb': 200.0}
+
+    def test_mejores_conocidos_cubren_data_raw(self):
+        mejores = cargar_mejores_conocidos()
+        instancias = {os.path.splitext(os.path.basename(r))[0] for r in glob.glob(os.path.join('data', 'raw', '*.dat'))}
+        self.assertEqual(instancias - set(mejores), set())
+        self.assertEqual(mejores['nug12'], 578)
+
+    def test_tiempo_hasta_objetivo(self):
+        generaciones = [{'instante': 0.5, 'mejor_coste': 700}, {'instante': 1.0, 'mejor_coste': 590},
+                        {'instante': 1.5, 'mejor_coste': 578}]
+        self.assertEqual(tiempo_hasta_objetivo(generaciones, 600), 1.0)
+        self.assertIsNone(tiempo_hasta_objetivo(generaciones, 500))
+
+    def test_comparar_detecta_regresiones(self):
+        base = [self._fila(0, 1000.0, 1.0), self._fila(1, 1200.0, 2.0)]
+        igual = [self._fila(0, 1080.0, 1.0), self._fila(1, 1100.0, 2.0)]
+        peor = [self._fila(0, 800.0, 1.0), self._fila(1, 900.0, 2.0)]
+        _, regresiones = comparar(base, igual, tolerancia=5.0)
+        self.assertEqual(regresiones, [])
+        comparacion, regresiones = comparar(base, peor, tolerancia=5.0)
+        self.assertEqual([r[2] for r in regresiones], ['evaluaciones_por_segundo'])
+        self.assertAlmostEqual(regresiones[0][3], -22.727, places=2)
+
+    def test_comparar_desde_csv(self):
+        filas = [dict(dict.fromkeys(COLUMNAS), motivo_parada='generaciones', n=12, **self._fila(semilla, eps, 1.0))
+                 for semilla, eps in ((0, 1000.0), (1, 1200.0))]
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_base = os.path.join(directorio, 'resultados')
+            guardar_resultados(filas, ruta_base, {})
+            leidas = cargar_resultados(f"{ruta_base}.csv")
+        self.assertEqual(leidas[0]['motivo_parada'], 'generaciones')
+        self.assertEqual(leidas[1]['evaluaciones_por_segundo'], 1200.0)
+        self.assertIsNone(leidas[0]['tiempo_objetivo'])
+        _, regresiones = comparar(leidas, filas, tolerancia=5.0)
+        self.assertEqual(regresiones, [])
+
+if __name__ == '__main__':
+    unittest.main()
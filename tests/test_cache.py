@@ -0,0 +1,109 @@
+# tests/test_cache.py
+
+import unittest
+import numpy as np
+from src.cache import CacheLRU, CacheFitness, MemoBusquedaLocal, claves_permutaciones
+from src.fitness import EvaluadorPoblacion
+
+class EvaluadorContador:
+    """
+    Envuelve un EvaluadorPoblacion y cuenta cuántos individuos evalúa.
+    """
+    def __init__(self, evaluador):
+        self.evaluador = evaluador
+        self.flow = evaluador.flow
+        self.distances = evaluador.distances
+        self.evaluados = 0
+
+    def evaluar(self, poblacion):
+        self.evaluados += len(poblacion)
+        return self.evaluador.evaluar(poblacion)
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.n = 8
+        self.flujo_matrix = rng.integers(0, 10, size=(self.n, self.n))
+        self.distancia_matrix = rng.integers(1, 20, size=(self.n, self.n)).astype(np.float64)
+        self.poblacion = np.array([rng.permutation(self.n) for _ in range(10)])
+
+    def test_lru_expulsa_la_menos_usada(self):
+        cache = CacheLRU(2)
+        cache.guardar('a', 1)
+        cache.guardar('b', 2)
+        self.assertEqual(cache.obtener('a'), 1)
+        cache.guardar('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIsNone(cache.obtener('b'))
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 1))
+
+    def test_claves_distinguen_permutaciones(self):
+        claves = claves_permutaciones(np.array([[0, 1, 2], [0, 2, 1], [0, 1, 2]]))
+        self.assertNotEqual(claves[0], claves[1])
+        self.assertEqual(claves[0], claves[2])
+
+    def test_cache_fitness_evalua_solo_fallos(self):
+        evaluador = EvaluadorPoblacion(self.flujo_matrix, self.distancia_matrix)
+        contador = EvaluadorContador(evaluador)
+        cache = CacheFitness(contador, capacidad=100)
+        esperado = evaluador.evaluar(self.poblacion)
+        np.testing.assert_array_equal(cache.evaluar(self.poblacion), esperado)
+        self.assertEqual(contador.evaluados, 10)
+
+        # Población con 5 individuos conocidos, uno nuevo repetido y los duplicados se evalúan una vez
+        nuevo = self.poblacion[0][::-1]
+        poblacion = np.vstack([self.poblacion[:5], nuevo, nuevo])
+        contadores = {}
+        fitness = cache.evaluar(poblacion, contadores=contadores)
+        np.testing.assert_array_equal(fitness, evaluador.evaluar(poblacion))
+        self.assertEqual(contador.evaluados, 11)
+        self.assertEqual(cache.cache.aciertos, 6)
+        self.assertEqual(contadores, {'evaluaciones': 1, 'evaluaciones_completas': 1, 'evaluaciones_incrementales': 0,
+                                      'aciertos_cache': 6})
+
+    def test_cache_desactivada(self):
+        contador = EvaluadorContador(EvaluadorPoblacion(self.flujo_matrix, self.distancia_matrix))
+        cache = CacheFitness(contador, capacidad=0)
+        cache.evaluar(self.poblacion)
+        cache.evaluar(self.poblacion)
+        self.assertEqual(contador.evaluados, 20)
+
+    def test_cache_fitness_incremental(self):
+        evaluador = EvaluadorPoblacion(self.flujo_matrix, self.distancia_matrix)
+        contador = EvaluadorContador(evaluador)
+        cache = CacheFitness(contador, capacidad=0, fraccion_incremental=0.5)
+        fitness_padres = evaluador.evaluar(self.poblacion)
+        hijos = self.poblacion[[0, 1, 2]].copy()
+        hijos[0, [0, 1]] = hijos[0, [1, 0]]
+        hijos[2] = hijos[2][::-1]
+        contadores = {}
+        fitness = cache.evaluar(hijos, self.poblacion, np.array([0, 1, -1]), fitness_padres, contadores)
+        np.testing.assert_allclose(fitness, evaluador.evaluar(hijos))
+        self.assertEqual((cache.evaluaciones_incrementales, cache.evaluaciones_completas), (2, 1))
+        self.assertEqual((contadores['evaluaciones_incrementales'], contadores['evaluaciones']), (2, 3))
+        self.assertEqual(contador.evaluados, 1)
+
+    def test_memo_guarda_el_optimo_y_respeta_la_memoria(self):
+        original, optimo = self.poblacion[0], np.sort(self.poblacion[0])
+        clave_original, clave_optimo = claves_permutaciones(np.vstack([original, optimo]))
+        memo = MemoBusquedaLocal(capacidad=100)
+        memo.guardar(clave_original, optimo, 12.0)
+        # El óptimo encontrado también es una clave: volver a optimizarlo no hace falta
+        for clave in (clave_original, clave_optimo):
+            individuo, coste = memo.obtener(clave)
+            np.testing.assert_array_equal(individuo, optimo)
+            self.assertEqual(coste, 12.0)
+
+        # Con un límite de memoria de unas dos entradas, solo quedan las más recientes
+        limitada = MemoBusquedaLocal(capacidad=100, max_bytes=2 * (self.n * 2 + optimo.nbytes + 200))
+        claves = claves_permutaciones(self.poblacion)
+        for clave, individuo in zip(claves, self.poblacion):
+            limitada.guardar(clave, individuo, 1.0)
+        self.assertEqual(len(limitada), 2)
+        self.assertLessEqual(limitada.bytes, limitada.max_bytes)
+        self.assertIn(claves[-1], limitada)
+        self.assertNotIn(claves[0], limitada)
+
+if __name__ == '__main__':
+    unittest.main()
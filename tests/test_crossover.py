@@ -4,7 +4,9 @@ import unittest
 import numpy as np
 import random
 import logging
-from src.crossover import cruce_pmx
+from src.crossover import (cruce_pmx, cruce_pmx_lote, generar_puntos_cruce, cruzar, cruzar_lote, cruce_ox_lote,
+                           cruce_cx_lote, cruce_uniforme_lote, registrar_cruce, generar_aleatorios_cruce,
+                           OPERADORES_CRUCE, _CRUCES_LOTE)
 
 class TestCrossover(unittest.TestCase):
     def setUp(self):
@@ -43,5 +45,108 @@ class TestCrossover(unittest.TestCase):
         # Verificar que los segmentos copiados sean correctos
         # Puedes agregar más aserciones específicas según los puntos de cruce
 
+    def test_cruce_pmx_lote_coincide_con_cruce_pmx(self):
+        rng = np.random.default_rng(self.seed)
+        n, k = 12, 50
+        padres1 = np.array([rng.permutation(n) for _ in range(k)])
+        padres2 = np.array([rng.permutation(n) for _ in range(k)])
+        puntos1, puntos2 = np.empty(k, dtype=int), np.empty(k, dtype=int)
+        esperados1, esperados2 = [], []
+        for j in range(k):
+            # cruce_pmx elige sus puntos con random.sample: se repite la misma extracción
+            random.seed(j)
+            puntos1[j], puntos2[j] = sorted(random.sample(range(n), 2))
+            random.seed(j)
+            hijo1, hijo2 = cruce_pmx(padres1[j], padres2[j])
+            esperados1.append(hijo1)
+            esperados2.append(hijo2)
+        hijos1, hijos2 = cruce_pmx_lote(padres1, padres2, puntos1, puntos2)
+        np.testing.assert_array_equal(hijos1, esperados1)
+        np.testing.assert_array_equal(hijos2, esperados2)
+
+    def test_cruzar_pmx_coincide_con_cruce_pmx(self):
+        rng = np.random.default_rng(self.seed)
+        for j in range(20):
+            padre1, padre2 = rng.permutation(12), rng.permutation(12)
+            # Mismos puntos de random.sample: mismos hijos y misma secuencia del módulo random
+            random.seed(j)
+            esperados = cruce_pmx(padre1, padre2)
+            siguiente = random.random()
+            random.seed(j)
+            hijos = cruzar(list(padre1), list(padre2), 'pmx')
+            np.testing.assert_array_equal(hijos[0], esperados[0])
+            np.testing.assert_array_equal(hijos[1], esperados[1])
+            self.assertEqual(random.random(), siguiente)
+
+    def test_generar_puntos_cruce(self):
+        puntos1, puntos2 = generar_puntos_cruce(1000, 5, np.random.default_rng(self.seed))
+        self.assertTrue(np.all(puntos1 < puntos2))
+        self.assertTrue(np.all((puntos1 >= 0) & (puntos2 < 5)))
+        # Las 10 parejas posibles aparecen
+        self.assertEqual(len(set(zip(puntos1, puntos2))), 10)
+
+    def _padres(self, k=40, n=10):
+        rng = np.random.default_rng(self.seed)
+        return np.array([rng.permutation(n) for _ in range(k)]), np.array([rng.permutation(n) for _ in range(k)])
+
+    def test_operadores_generan_permutaciones(self):
+        padres1, padres2 = self._padres()
+        for operador in OPERADORES_CRUCE:
+            hijos1, hijos2 = cruzar_lote(padres1, padres2, operador, np.random.default_rng(self.seed))
+            self.assertEqual(hijos1.shape, padres1.shape)
+            for hijo in np.vstack([hijos1, hijos2]):
+                np.testing.assert_array_equal(np.sort(hijo), np.arange(padres1.shape[1]), err_msg=operador)
+            hijo1, hijo2 = cruzar(padres1[0], padres2[0], operador, np.random.default_rng(self.seed))
+            np.testing.assert_array_equal(np.sort(hijo1), np.arange(padres1.shape[1]), err_msg=operador)
+
+    def test_cruce_ox(self):
+        padre1 = np.array([[0, 1, 2, 3, 4, 5, 6, 7]])
+        padre2 = np.array([[7, 6, 5, 4, 3, 2, 1, 0]])
+        mascaras = np.zeros((0, 8), dtype=np.bool_)
+        hijos1, _ = cruce_ox_lote(padre1, padre2, np.array([2]), np.array([5]), mascaras)
+        # Segmento [2, 5) del primer padre; desde la posición 5, el resto en el orden del segundo desde la posición 5
+        np.testing.assert_array_equal(hijos1[0], [6, 5, 2, 3, 4, 1, 0, 7])
+
+    def test_cruce_cx_conserva_posiciones(self):
+        padres1, padres2 = self._padres()
+        hijos1, hijos2 = cruce_cx_lote(padres1, padres2, np.zeros(40, dtype=int), np.zeros(40, dtype=int),
+                                       np.zeros((0, 10), dtype=np.bool_))
+        # Cada gen ocupa la posición que tenía en alguno de los padres
+        self.assertTrue(np.all((hijos1 == padres1) | (hijos1 == padres2)))
+        self.assertTrue(np.all((hijos2 == padres1) | (hijos2 == padres2)))
+
+    def test_cruce_uniforme_mascaras(self):
+        padres1, padres2 = self._padres()
+        k, n = padres1.shape
+        # Sin posiciones en la máscara el hijo es el receptor; con todas, el donante
+        vacias = np.zeros((k, n), dtype=np.bool_)
+        hijos1, hijos2 = cruce_uniforme_lote(padres1, padres2, np.zeros(k, dtype=int), np.zeros(k, dtype=int), vacias)
+        np.testing.assert_array_equal(hijos1, padres2)
+        np.testing.assert_array_equal(hijos2, padres1)
+        hijos1, _ = cruce_uniforme_lote(padres1, padres2, np.zeros(k, dtype=int), np.zeros(k, dtype=int), ~vacias)
+        np.testing.assert_array_equal(hijos1, padres1)
+
+    def test_generar_aleatorios_cruce(self):
+        rng = np.random.default_rng(self.seed)
+        _, _, mascaras = generar_aleatorios_cruce('pmx', 5, 8, rng)
+        self.assertEqual(mascaras.shape, (0, 8))
+        _, _, mascaras = generar_aleatorios_cruce('posiciones', 5, 8, rng)
+        self.assertEqual(mascaras.shape, (5, 8))
+        with self.assertRaises(ValueError):
+            generar_aleatorios_cruce('desconocido', 5, 8, rng)
+
+    def test_registrar_cruce(self):
+        def cruce_copia(padres1, padres2, puntos1, puntos2, mascaras):
+            return padres2.copy(), padres1.copy()
+        registrar_cruce('copia', cruce_copia, usa_mascara=False)
+        try:
+            padres1, padres2 = self._padres()
+            hijos1, hijos2 = cruzar_lote(padres1, padres2, 'copia')
+            np.testing.assert_array_equal(hijos1, padres2)
+            # La lista importada antes del registro también incluye el nuevo operador
+            self.assertIn('copia', OPERADORES_CRUCE)
+        finally:
+            del _CRUCES_LOTE['copia']
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_experiments.py
+
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from src.experiments import (argumentos_opciones, cargar_rejilla, expandir_rejilla, ejecutar_rejilla, ejecutar_trabajo,
+                             guardar_tabla, resultado_guardado, ARCHIVO_RESULTADO)
+
+class TestExperiments(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.rejilla = {
+            'salida': self.directorio.name,
+            'instancias': ['nug12'],
+            'directorio_datos': os.path.join('data', 'raw'),
+            'variantes': ['standard'],
+            'semillas': [0, 1],
+            'opciones': {'generations': 5, 'population': 10, 'elitismo': True, 'no_cache': True},
+            'rejilla': {'mutation_rate': [0.02, 0.1]},
+            'hilos_por_trabajo': 1,
+        }
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_argumentos_opciones(self):
+        self.assertEqual(argumentos_opciones({'generations': 5, 'elitismo': True, 'no_cache': False,
+                                              'tabu_tenure': [3, 7], 'seed': None}),
+                         ['--generations', '5', '--elitismo', '--tabu_tenure', '3', '7'])
+
+    def test_expandir_rejilla(self):
+        trabajos = expandir_rejilla(self.rejilla)
+        self.assertEqual(len(trabajos), 4)
+        self.assertEqual(len({trabajo['salida'] for trabajo in trabajos}), 4)
+        self.assertEqual(trabajos[-1]['valores'], {'mutation_rate': 0.1})
+        self.assertIn('--mutation_rate', trabajos[-1]['argumentos'])
+        with self.assertRaises(ValueError):
+            expandir_rejilla(dict(self.rejilla, instancias=['no_existe']))
+
+    def test_trabajo_terminado_se_salta(self):
+        trabajo = expandir_rejilla(self.rejilla)[0]
+        self.assertIsNone(resultado_guardado(trabajo))
+        fila = ejecutar_trabajo(trabajo)
+        self.assertEqual(fila['estado'], 'ok')
+        self.assertEqual(fila['motivo_parada'], 'generaciones')
+        self.assertTrue(os.path.exists(os.path.join(trabajo['salida'], ARCHIVO_RESULTADO)))
+        self.assertEqual(resultado_guardado(trabajo)['coste'], fila['coste'])
+        # Con otros argumentos el resultado guardado ya no vale
+        self.assertIsNone(resultado_guardado(dict(trabajo, argumentos=trabajo['argumentos'] + ['--generations', '6'])))
+
+        rutas = guardar_tabla([fila], os.path.join(self.directorio.name, 'resultados'), ['mutation_rate'])
+        with open(rutas[0], encoding='utf-8') as f:
+            filas = list(csv.DictReader(f))
+        self.assertEqual(filas[0]['mutation_rate'], '0.02')
+        self.assertEqual(float(filas[0]['coste']), fila['coste'])
+
+    def test_rejilla_terminada_no_lanza_el_pool(self):
+        rejilla = dict(self.rejilla, semillas=[0], rejilla={'mutation_rate': [0.02]})
+        for trabajo in expandir_rejilla(rejilla):
+            ejecutar_trabajo(trabajo)
+        with mock.patch('src.experiments.ProcessPoolExecutor', side_effect=AssertionError('pool lanzado')):
+            filas = ejecutar_rejilla(rejilla, cache_dir=None)
+        self.assertEqual([fila['estado'] for fila in filas], ['ok'])
+
+    def test_quiet_en_las_islas(self):
+        # Los procesos de las islas escriben en la salida estándar heredada, no en la redirigida
+        salida = subprocess.run(
+            [sys.executable, '-m', 'src.main', '--variant', 'island', '--islands', '2', '--generations', '3',
+             '--population', '10', '--data', os.path.join('data', 'raw', 'nug12.dat'),
+             '--output', self.directorio.name, '--quiet'],
+            capture_output=True, text=True, timeout=600, check=True).stdout
+        self.assertNotIn('Generación', salida)
+
+    def test_rejilla_de_scripts(self):
+        rejilla = cargar_rejilla(os.path.join('scripts', 'experimentos.json'))
+        self.assertEqual(len(expandir_rejilla(dict(rejilla, salida=self.directorio.name))), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@
 
 import unittest
 import numpy as np
-from src.fitness import calcular_coste, fitness_pop
+from src.fitness import calcular_coste, fitness_pop, EvaluadorPoblacion, calcular_coste_numba, fitness_incremental_lote
+from src.utils import construir_flujo_disperso, detectar_flujo_disperso
 
 class TestFitness(unittest.TestCase):
     def test_calcular_coste_basico(self):
@@ -57,5 +58,98 @@ class TestFitness(unittest.TestCase):
         expected_fitness = np.array([17.0, 16.0, 20.0])
         np.testing.assert_array_equal(fitness_pop(population, flujo_matrix, distancia_matrix), expected_fitness)
 
+    def test_evaluador_por_bloques_identico(self):
+        # El evaluador por bloques debe coincidir bit a bit con la evaluación (poblacion, n, n) completa
+        rng = np.random.default_rng(0)
+        n = 12
+        flujo_matrix = rng.integers(0, 10, size=(n, n)).astype(np.int32)
+        distancia_matrix = rng.integers(0, 100, size=(n, n)).astype(np.float32)
+        population = np.array([rng.permutation(n) for _ in range(23)])
+        esperado = np.sum(
+            flujo_matrix[np.newaxis, :, :] * distancia_matrix[population[:, :, np.newaxis], population[:, np.newaxis, :]],
+            axis=(1, 2)
+        )
+        for tam_bloque in (1, 4, 23, 100):
+            evaluador = EvaluadorPoblacion(flujo_matrix, distancia_matrix, tam_bloque=tam_bloque)
+            np.testing.assert_array_equal(evaluador.evaluar(population), esperado)
+            # Segunda llamada reutilizando los buffers
+            np.testing.assert_array_equal(evaluador.evaluar(population[:5]), esperado[:5])
+
+    def test_evaluador_presupuesto_bytes(self):
+        n = 10
+        flujo_matrix = np.ones((n, n), dtype=np.int32)
+        distancia_matrix = np.ones((n, n), dtype=np.float32)
+        # Un presupuesto menor que un individuo sigue evaluando de uno en uno
+        evaluador = EvaluadorPoblacion(flujo_matrix, distancia_matrix, max_bytes=1)
+        self.assertEqual(evaluador.tam_bloque, 1)
+        population = np.array([np.arange(n), np.arange(n)[::-1]])
+        np.testing.assert_array_equal(evaluador.evaluar(population), [100.0, 100.0])
+
+    def test_fitness_incremental_lote(self):
+        rng = np.random.default_rng(3)
+        n = 14
+        flujo_matrix = rng.integers(0, 10, size=(n, n)).astype(np.int32)
+        distancia_matrix = rng.integers(0, 100, size=(n, n)).astype(np.float32)
+        padres = np.array([rng.permutation(n) for _ in range(6)])
+        fitness_padres = fitness_pop(padres, flujo_matrix, distancia_matrix)
+        hijos = padres[[0, 1, 2, 3, 4, 5, 0]].copy()
+        hijos[0, [2, 9]] = hijos[0, [9, 2]]
+        hijos[1, 3:8] = hijos[1, 3:8][::-1]
+        hijos[2] = rng.permutation(n)
+        indices_padres = np.array([0, 1, 2, 3, 4, 5, -1])
+        out = np.empty(7)
+        calculado = np.empty(7, dtype=bool)
+        fitness_incremental_lote(hijos, padres, indices_padres, fitness_padres, flujo_matrix, distancia_matrix, 5,
+                                 out, calculado)
+        # Sin padre de referencia o con más de 5 cambios se deja para la evaluación completa
+        self.assertFalse(calculado[6])
+        self.assertEqual(calculado[2], np.sum(hijos[2] != padres[2]) <= 5)
+        esperado = fitness_pop(hijos, flujo_matrix, distancia_matrix)
+        np.testing.assert_allclose(out[calculado], esperado[calculado])
+
+    def test_fitness_pop_backend_numba(self):
+        rng = np.random.default_rng(1)
+        n = 15
+        flujo_matrix = rng.integers(0, 10, size=(n, n)).astype(np.int32)
+        distancia_matrix = rng.integers(0, 100, size=(n, n)).astype(np.float32)
+        population = np.array([rng.permutation(n) for _ in range(9)])
+        esperado = fitness_pop(population, flujo_matrix, distancia_matrix)
+        np.testing.assert_array_equal(fitness_pop(population, flujo_matrix, distancia_matrix, backend='numba'), esperado)
+        self.assertEqual(calcular_coste_numba(population[0], flujo_matrix, distancia_matrix),
+                         calcular_coste(population[0], flujo_matrix, distancia_matrix))
+
+    def test_fitness_pop_backend_desconocido(self):
+        with self.assertRaises(ValueError):
+            fitness_pop(np.array([[0, 1]]), np.eye(2), np.eye(2), backend='cuda')
+
+    def test_coste_disperso(self):
+        rng = np.random.default_rng(2)
+        n = 20
+        flujo_matrix = rng.integers(1, 10, size=(n, n)).astype(np.int32)
+        flujo_matrix[rng.random((n, n)) < 0.9] = 0
+        distancia_matrix = rng.integers(0, 100, size=(n, n)).astype(np.float32)
+        flujo_disperso = detectar_flujo_disperso(flujo_matrix)
+        self.assertIsNotNone(flujo_disperso)
+        population = np.array([rng.permutation(n) for _ in range(6)])
+        esperado = fitness_pop(population, flujo_matrix, distancia_matrix)
+        np.testing.assert_array_equal(
+            fitness_pop(population, flujo_matrix, distancia_matrix, flujo_disperso=flujo_disperso), esperado)
+        self.assertEqual(calcular_coste(population[0], flujo_matrix, distancia_matrix, flujo_disperso), esperado[0])
+        # 'auto' elige el kernel disperso si hay vista CSR; un backend explícito se respeta
+        self.assertEqual(EvaluadorPoblacion(flujo_matrix, distancia_matrix, flujo_disperso=flujo_disperso).backend,
+                         'disperso')
+        evaluador = EvaluadorPoblacion(flujo_matrix, distancia_matrix, backend='numba', flujo_disperso=flujo_disperso)
+        self.assertEqual(evaluador.backend, 'numba')
+        np.testing.assert_array_equal(evaluador.evaluar(population), esperado)
+        np.testing.assert_array_equal(fitness_pop(population, flujo_matrix, distancia_matrix, backend='disperso'),
+                                      esperado)
+
+    def test_detectar_flujo_denso(self):
+        flujo_matrix = np.ones((4, 4), dtype=np.int32)
+        self.assertIsNone(detectar_flujo_disperso(flujo_matrix))
+        flujo_disperso = construir_flujo_disperso(flujo_matrix)
+        self.assertEqual(flujo_disperso.densidad, 1.0)
+        np.testing.assert_array_equal(flujo_disperso.indptr, [0, 4, 8, 12, 16])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
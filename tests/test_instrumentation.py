@@ -0,0 +1,56 @@
+# tests/test_instrumentation.py
+
+import json
+import os
+import tempfile
+import unittest
+from src.instrumentation import Instrumentacion, INSTRUMENTACION_NULA, obtener_instrumentacion, perfilar
+
+class TestInstrumentation(unittest.TestCase):
+    def test_fases_y_contadores(self):
+        instrumentacion = Instrumentacion()
+        for gen in range(3):
+            with instrumentacion.fase('cruce'):
+                pass
+            with instrumentacion.fase('evaluacion'):
+                pass
+            instrumentacion.sumar('evaluaciones', 10)
+            instrumentacion.sumar_contadores({'movimientos_aceptados': gen})
+            instrumentacion.cerrar_generacion(gen, 100 - gen)
+        informe = instrumentacion.informe()
+        self.assertEqual(informe['fases']['cruce']['llamadas'], 3)
+        self.assertEqual(informe['contadores'], {'evaluaciones': 30, 'movimientos_aceptados': 3})
+        self.assertEqual(len(informe['generaciones']), 3)
+        self.assertEqual(informe['generaciones'][2]['contadores'], {'evaluaciones': 10, 'movimientos_aceptados': 2})
+        self.assertEqual(informe['generaciones'][2]['mejor_coste'], 98.0)
+        self.assertIn('evaluaciones_por_segundo', informe)
+
+    def test_guardar_json(self):
+        instrumentacion = Instrumentacion()
+        with instrumentacion.fase('seleccion'):
+            pass
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'perfil.json')
+            instrumentacion.guardar(ruta)
+            with open(ruta, encoding='utf-8') as f:
+                self.assertIn('seleccion', json.load(f)['fases'])
+
+    def test_instrumentacion_nula(self):
+        self.assertIs(obtener_instrumentacion({}), INSTRUMENTACION_NULA)
+        with INSTRUMENTACION_NULA.fase('cruce'):
+            INSTRUMENTACION_NULA.sumar('evaluaciones', 5)
+        INSTRUMENTACION_NULA.cerrar_generacion(0)
+        self.assertFalse(INSTRUMENTACION_NULA.activa)
+
+    def test_perfilar(self):
+        self.assertEqual(perfilar(lambda: 3), (3, None))
+        resultado, perfil = perfilar(lambda: sum(range(1000)), 'cprofile')
+        self.assertEqual(resultado, 499500)
+        self.assertTrue(perfil['funciones'])
+        resultado, perfil = perfilar(lambda: [0] * 100000, 'tracemalloc')
+        self.assertGreater(perfil['pico_bytes'], 100000)
+        with self.assertRaises(ValueError):
+            perfilar(lambda: None, 'desconocido')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# tests/test_island_model.py
+
+import queue
+import unittest
+import numpy as np
+from src.fitness import EvaluadorPoblacion
+from src.island_model import Migracion, ejecutar_modelo_islas
+
+class TestIslandModel(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.n = 10
+        self.flujo_matrix = rng.integers(0, 10, size=(self.n, self.n))
+        self.distancia_matrix = rng.integers(1, 20, size=(self.n, self.n)).astype(np.float64)
+
+    def test_topologias(self):
+        buzones = [queue.Queue() for _ in range(4)]
+        self.assertEqual(Migracion(3, buzones, 'anillo').destinos(), [0])
+        self.assertEqual(Migracion(1, buzones, 'completa').destinos(), [0, 2, 3])
+        aleatoria = Migracion(2, buzones, 'aleatoria', rng=np.random.default_rng(0)).destinos()
+        self.assertEqual(len(aleatoria), 1)
+        self.assertNotEqual(aleatoria[0], 2)
+        with self.assertRaises(ValueError):
+            Migracion(0, buzones, 'estrella')
+
+    def test_migracion_sustituye_a_los_peores(self):
+        buzones = [queue.Queue(), queue.Queue()]
+        poblacion = np.array([np.roll(np.arange(self.n), k) for k in range(5)])
+        fitness = np.array([5.0, 1.0, 9.0, 3.0, 7.0])
+        buzones[0].put((np.array([np.arange(self.n)[::-1], np.arange(self.n)]), np.array([2.0, 8.0])))
+        migracion = Migracion(0, buzones, 'anillo', intervalo=2, migrantes=2)
+
+        # Fuera del intervalo no se hace nada
+        migracion(0, poblacion, fitness)
+        self.assertTrue(buzones[1].empty())
+
+        migracion(1, poblacion, fitness)
+        enviados, fitness_enviados = buzones[1].get_nowait()
+        np.testing.assert_array_equal(fitness_enviados, [1.0, 3.0])
+        np.testing.assert_array_equal(enviados[0], np.roll(np.arange(self.n), 1))
+        # El inmigrante de coste 2 sustituye al peor (9); el de coste 8 no mejora al segundo peor (7)
+        np.testing.assert_array_equal(fitness, [5.0, 1.0, 2.0, 3.0, 7.0])
+        np.testing.assert_array_equal(poblacion[2], np.arange(self.n)[::-1])
+        self.assertEqual((migracion.enviados, migracion.recibidos), (2, 1))
+
+    def test_modelo_islas(self):
+        np.random.seed(0)
+        parametros = {'poblacion': 20, 'generaciones': 6, 'tasa_cruce': 0.8, 'tasa_mutacion': 0.05,
+                      'elitismo': True, 'islas': 2, 'intervalo_migracion': 2, 'migrantes': 2}
+        (mejor, coste), historial = ejecutar_modelo_islas(self.n, self.flujo_matrix, self.distancia_matrix, parametros)
+        self.assertEqual(sorted(mejor), list(range(self.n)))
+        evaluador = EvaluadorPoblacion(self.flujo_matrix, self.distancia_matrix)
+        self.assertAlmostEqual(coste, evaluador.evaluar(mejor[np.newaxis, :])[0])
+        self.assertEqual(len(historial), 7)
+        self.assertEqual(min(historial), coste)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
 import unittest
 import numpy as np
 import random
-from src.mutation import mutacion_swap
+from src.mutation import mutacion_swap, mutacion_swap_poblacion, mutar_poblacion, OPERADORES_MUTACION
 
 class TestMutation(unittest.TestCase):
     def setUp(self):
@@ -26,5 +26,50 @@ class TestMutation(unittest.TestCase):
         expected = np.array([2, 1, 0, 3, 4])  # Ajusta según el comportamiento esperado
         np.testing.assert_array_equal(mutado, expected)
 
+    def test_mutacion_swap_poblacion(self):
+        poblacion = np.tile(np.arange(6), (50, 1))
+        mutados = mutacion_swap_poblacion(poblacion, 0.5, np.random.default_rng(self.seed))
+        # Los individuos mutados difieren exactamente en dos posiciones; el resto no cambia
+        diferencias = np.sum(poblacion != np.arange(6), axis=1)
+        np.testing.assert_array_equal(np.flatnonzero(diferencias), mutados)
+        self.assertTrue(np.all(diferencias[mutados] == 2))
+        np.testing.assert_array_equal(np.sort(poblacion, axis=1), np.tile(np.arange(6), (50, 1)))
+
+    def test_mutar_poblacion_operadores(self):
+        rng = np.random.default_rng(self.seed)
+        identidad = np.arange(10)
+        for operador in OPERADORES_MUTACION:
+            poblacion = np.tile(identidad, (40, 1))
+            mutados = mutar_poblacion(poblacion, 0.5, operador, rng)
+            # Siguen siendo permutaciones y los individuos no mutados no cambian
+            np.testing.assert_array_equal(np.sort(poblacion, axis=1), np.tile(identidad, (40, 1)))
+            no_mutados = np.setdiff1d(np.arange(40), mutados)
+            np.testing.assert_array_equal(poblacion[no_mutados], np.tile(identidad, (len(no_mutados), 1)))
+            cambiados = np.flatnonzero(np.any(poblacion != identidad, axis=1))
+            self.assertTrue(np.all(np.isin(cambiados, mutados)))
+
+    def test_mutacion_inversion_e_insercion(self):
+        rng = np.random.default_rng(self.seed)
+        identidad = np.arange(10)
+        poblacion = np.tile(identidad, (20, 1))
+        mutar_poblacion(poblacion, 1.0, 'inversion', rng)
+        for individuo in poblacion:
+            # Un único segmento contiguo invertido
+            cambiadas = np.flatnonzero(individuo != identidad)
+            if cambiadas.size:
+                a, b = cambiadas[0], cambiadas[-1]
+                np.testing.assert_array_equal(individuo[a:b + 1], identidad[a:b + 1][::-1])
+        poblacion = np.tile(identidad, (20, 1))
+        mutar_poblacion(poblacion, 1.0, 'insercion', rng)
+        for individuo in poblacion:
+            # Quitar el elemento desplazado deja el resto en orden
+            desplazado = [x for x in identidad if list(np.delete(individuo, np.flatnonzero(individuo == x))) ==
+                          list(np.delete(identidad, x))]
+            self.assertTrue(desplazado)
+
+    def test_mutar_poblacion_operador_desconocido(self):
+        with self.assertRaises(ValueError):
+            mutar_poblacion(np.tile(np.arange(4), (2, 1)), 1.0, 'desplazamiento')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,188 @@
+# tests/test_optimization.py
+
+import unittest
+import numpy as np
+from src.cache import MemoBusquedaLocal
+from src.fitness import calcular_coste
+from src.optimization import (calcular_delta_coste_numba, calcular_delta_intercambio, calcular_delta_exacto_numba,
+                              calcula_busqueda_local_mascara_jit, calcula_busqueda_local_bits_no_mirar,
+                              calcula_busqueda_tabu_robusta,
+                              optimizar_individuo_busqueda_local, optimizar_poblacion)
+from src.utils import construir_flujo_disperso
+
+class TestOptimization(unittest.TestCase):
+    def setUp(self):
+        # Instancia simétrica con diagonal nula y flujos dispersos
+        rng = np.random.default_rng(42)
+        np.random.seed(42)
+        self.n = 15
+        flujo = rng.integers(1, 10, size=(self.n, self.n))
+        flujo[rng.random((self.n, self.n)) < 0.8] = 0
+        self.flujo_matrix = np.triu(flujo, 1) + np.triu(flujo, 1).T
+        distancia = rng.integers(1, 50, size=(self.n, self.n)).astype(np.float64)
+        self.distancia_matrix = np.triu(distancia, 1) + np.triu(distancia, 1).T
+        self.individuo = rng.permutation(self.n)
+
+    def test_delta_coincide_con_coste(self):
+        coste = calcular_coste(self.individuo, self.flujo_matrix, self.distancia_matrix)
+        vecino = self.individuo.copy()
+        vecino[2], vecino[7] = vecino[7], vecino[2]
+        delta = calcular_delta_coste_numba(self.individuo, self.flujo_matrix, self.distancia_matrix, 2, 7)
+        self.assertAlmostEqual(coste + delta, calcular_coste(vecino, self.flujo_matrix, self.distancia_matrix))
+
+    def test_delta_disperso(self):
+        flujo_disperso = construir_flujo_disperso(self.flujo_matrix)
+        for r in range(self.n):
+            for s in range(r + 1, self.n):
+                self.assertAlmostEqual(
+                    calcular_delta_intercambio(self.individuo, self.flujo_matrix, self.distancia_matrix, r, s, flujo_disperso),
+                    calcular_delta_coste_numba(self.individuo, self.flujo_matrix, self.distancia_matrix, r, s)
+                )
+
+    def test_busqueda_local_mejora(self):
+        coste_inicial = calcular_coste(self.individuo, self.flujo_matrix, self.distancia_matrix)
+        mejor, coste = optimizar_individuo_busqueda_local(self.individuo, self.flujo_matrix, self.distancia_matrix)
+        self.assertEqual(sorted(mejor), list(range(self.n)))
+        self.assertLessEqual(coste, coste_inicial)
+        self.assertAlmostEqual(coste, calcular_coste(mejor, self.flujo_matrix, self.distancia_matrix))
+
+    def test_delta_exacto_asimetrico(self):
+        # Con matrices asimétricas y diagonal no nula el delta exacto debe coincidir con el recálculo completo
+        rng = np.random.default_rng(7)
+        flujo_matrix = rng.integers(0, 10, size=(8, 8))
+        distancia_matrix = rng.integers(0, 10, size=(8, 8)).astype(np.float64)
+        individuo = rng.permutation(8)
+        coste = calcular_coste(individuo, flujo_matrix, distancia_matrix)
+        for r in range(8):
+            for s in range(r + 1, 8):
+                vecino = individuo.copy()
+                vecino[r], vecino[s] = vecino[s], vecino[r]
+                self.assertAlmostEqual(coste + calcular_delta_exacto_numba(individuo, flujo_matrix, distancia_matrix, r, s),
+                                       calcular_coste(vecino, flujo_matrix, distancia_matrix))
+
+    def test_busqueda_local_tabla_deltas(self):
+        mejor, coste = optimizar_individuo_busqueda_local(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                          motor='tabla_deltas')
+        self.assertEqual(sorted(mejor), list(range(self.n)))
+        self.assertAlmostEqual(coste, calcular_coste(mejor, self.flujo_matrix, self.distancia_matrix))
+        # El resultado es un óptimo local del vecindario 2-exchange completo
+        for r in range(self.n):
+            for s in range(r + 1, self.n):
+                self.assertGreaterEqual(
+                    calcular_delta_exacto_numba(mejor, self.flujo_matrix, self.distancia_matrix, r, s), -1e-9)
+
+    def test_busqueda_local_bits_no_mirar(self):
+        for estrategia in ('primera', 'mejor'):
+            mejor, coste = calcula_busqueda_local_bits_no_mirar(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                                estrategia=estrategia, semilla=7)
+            self.assertEqual(sorted(mejor), list(range(self.n)))
+            self.assertAlmostEqual(coste, calcular_coste(mejor, self.flujo_matrix, self.distancia_matrix))
+            # Termina en un óptimo local del vecindario 2-exchange completo
+            for r in range(self.n):
+                for s in range(r + 1, self.n):
+                    self.assertGreaterEqual(
+                        calcular_delta_exacto_numba(mejor, self.flujo_matrix, self.distancia_matrix, r, s), -1e-9)
+            repetido, _ = calcula_busqueda_local_bits_no_mirar(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                               estrategia=estrategia, semilla=7)
+            np.testing.assert_array_equal(mejor, repetido)
+        with self.assertRaises(ValueError):
+            calcula_busqueda_local_bits_no_mirar(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                 estrategia='otra')
+
+    def test_busqueda_tabu_robusta(self):
+        _, coste_descenso = optimizar_individuo_busqueda_local(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                               motor='tabla_deltas')
+        historial = []
+        mejor, coste = calcula_busqueda_tabu_robusta(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                     max_iter=500, semilla=2, historial=historial)
+        self.assertEqual(sorted(mejor), list(range(self.n)))
+        self.assertAlmostEqual(coste, calcular_coste(mejor, self.flujo_matrix, self.distancia_matrix))
+        # Empieza por el mismo descenso que la mejor mejora y sigue más allá del óptimo local
+        self.assertLessEqual(coste, coste_descenso + 1e-9)
+        self.assertEqual(historial[-1][0], 500)
+        repetido, _ = calcula_busqueda_tabu_robusta(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                    max_iter=500, semilla=2)
+        np.testing.assert_array_equal(mejor, repetido)
+
+        # Con límite de tiempo se detiene tras el primer bloque que lo supera
+        historial = []
+        calcula_busqueda_tabu_robusta(self.individuo, self.flujo_matrix, self.distancia_matrix, tiempo_limite=0.0,
+                                      semilla=2, historial=historial)
+        self.assertEqual(len(historial), 1)
+        with self.assertRaises(ValueError):
+            calcula_busqueda_tabu_robusta(self.individuo, self.flujo_matrix, self.distancia_matrix, tenencia_min=5,
+                                          tenencia_max=2)
+
+    def test_motor_desconocido(self):
+        with self.assertRaises(ValueError):
+            optimizar_individuo_busqueda_local(self.individuo, self.flujo_matrix, self.distancia_matrix, motor='otro')
+
+    def test_busqueda_local_mascara_jit(self):
+        flujo_disperso = construir_flujo_disperso(self.flujo_matrix)
+        coste_inicial = calcular_coste(self.individuo, self.flujo_matrix, self.distancia_matrix)
+        for fd in (None, flujo_disperso):
+            mejor, coste = calcula_busqueda_local_mascara_jit(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                              flujo_disperso=fd, semilla=3)
+            self.assertEqual(sorted(mejor), list(range(self.n)))
+            self.assertLessEqual(coste, coste_inicial)
+            self.assertAlmostEqual(coste, calcular_coste(mejor, self.flujo_matrix, self.distancia_matrix))
+            # Misma semilla, mismo resultado
+            repetido, _ = calcula_busqueda_local_mascara_jit(self.individuo, self.flujo_matrix, self.distancia_matrix,
+                                                             flujo_disperso=fd, semilla=3)
+            np.testing.assert_array_equal(mejor, repetido)
+
+    def test_optimizar_poblacion_determinista(self):
+        rng = np.random.default_rng(5)
+        poblacion = np.array([rng.permutation(self.n) for _ in range(6)])
+        indices = np.array([0, 2, 3, 5])
+        referencia, costes = optimizar_poblacion(poblacion, self.flujo_matrix, self.distancia_matrix, indices=indices,
+                                                 motor='mascara_jit', semilla=11)
+        self.assertEqual(referencia.shape, (4, self.n))
+        for idx, (individuo, coste) in enumerate(zip(referencia, costes)):
+            self.assertAlmostEqual(coste, calcular_coste(individuo, self.flujo_matrix, self.distancia_matrix))
+        # El resultado no depende del backend ni del número de trabajadores
+        for backend, trabajadores in (('hilos', 1), ('hilos', 3), ('procesos', 2)):
+            optimizados, _ = optimizar_poblacion(poblacion, self.flujo_matrix, self.distancia_matrix, indices=indices,
+                                                 motor='mascara_jit', backend=backend, trabajadores=trabajadores, semilla=11)
+            np.testing.assert_array_equal(optimizados, referencia)
+
+    def test_optimizar_poblacion_con_memo(self):
+        rng = np.random.default_rng(6)
+        poblacion = np.array([rng.permutation(self.n) for _ in range(4)])
+        poblacion[3] = poblacion[1]
+        memo = MemoBusquedaLocal(capacidad=100)
+        optimizados, costes = optimizar_poblacion(poblacion, self.flujo_matrix, self.distancia_matrix,
+                                                  motor='mascara_jit', semilla=3, memo=memo)
+        # El repetido dentro del lote se optimiza una sola vez
+        self.assertEqual((memo.fallos, memo.aciertos), (3, 1))
+        np.testing.assert_array_equal(optimizados[3], optimizados[1])
+
+        # En la siguiente generación, tanto las permutaciones conocidas como sus óptimos salen de la memoria
+        siguiente = np.vstack([poblacion[:2], optimizados[2:3]])
+        repetidos, costes_repetidos = optimizar_poblacion(siguiente, self.flujo_matrix, self.distancia_matrix,
+                                                          motor='mascara_jit', semilla=4, memo=memo)
+        self.assertEqual((memo.fallos, memo.aciertos), (3, 4))
+        np.testing.assert_array_equal(repetidos, optimizados[:3])
+        np.testing.assert_array_equal(costes_repetidos, costes[:3])
+
+    def test_optimizar_poblacion_contadores(self):
+        rng = np.random.default_rng(7)
+        poblacion = np.array([rng.permutation(self.n) for _ in range(5)])
+        referencia = None
+        for backend in ('secuencial', 'hilos', 'procesos'):
+            contadores = {}
+            optimizar_poblacion(poblacion, self.flujo_matrix, self.distancia_matrix, motor='tabla_deltas',
+                                backend=backend, trabajadores=2, semilla=1, contadores=contadores)
+            self.assertEqual(contadores['busquedas_locales'], 5)
+            self.assertGreater(contadores['movimientos_aceptados'], 0)
+            # Los contadores no dependen del backend
+            referencia = referencia or contadores
+            self.assertEqual(contadores, referencia)
+
+    def test_optimizar_poblacion_hilos_requiere_nogil(self):
+        with self.assertRaises(ValueError):
+            optimizar_poblacion(np.array([self.individuo]), self.flujo_matrix, self.distancia_matrix,
+                                motor='mascara', backend='hilos')
+
+if __name__ == '__main__':
+    unittest.main()
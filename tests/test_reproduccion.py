@@ -0,0 +1,67 @@
+# tests/test_reproduccion.py
+
+import unittest
+import numpy as np
+from src.reproduccion import MotorReproduccion
+from src.crossover import OPERADORES_CRUCE, registrar_cruce, _CRUCES_LOTE
+
+class TestReproduccion(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+        self.n = 9
+        self.poblacion = np.array([self.rng.permutation(self.n) for _ in range(11)])
+        self.fitness = self.rng.random(11)
+
+    def test_siguiente_generacion_valida(self):
+        motor = MotorReproduccion(11, self.n, 0.8, 0.5, True, rng=self.rng)
+        elite = self.poblacion[np.argmin(self.fitness)].copy()
+        nueva = motor.siguiente_generacion(self.poblacion, self.fitness, elite=elite)
+        self.assertEqual(nueva.shape, self.poblacion.shape)
+        np.testing.assert_array_equal(nueva[0], elite)
+        for individuo in nueva:
+            np.testing.assert_array_equal(np.sort(individuo), np.arange(self.n))
+
+    def test_doble_buffer(self):
+        motor = MotorReproduccion(11, self.n, 0.8, 0.1, False, rng=self.rng)
+        primera = motor.siguiente_generacion(self.poblacion, self.fitness)
+        segunda = motor.siguiente_generacion(primera, self.fitness)
+        tercera = motor.siguiente_generacion(segunda, self.fitness)
+        self.assertIsNot(primera, segunda)
+        self.assertIs(primera, tercera)
+
+    def test_sin_cruce_ni_mutacion_copia_padres(self):
+        motor = MotorReproduccion(11, self.n, 0.0, 0.0, False, rng=self.rng)
+        nueva = motor.siguiente_generacion(self.poblacion, self.fitness)
+        # Cada hijo es uno de los padres
+        filas = {tuple(individuo) for individuo in self.poblacion}
+        self.assertTrue(all(tuple(individuo) in filas for individuo in nueva))
+
+    def test_determinista(self):
+        resultados = []
+        for _ in range(2):
+            motor = MotorReproduccion(11, self.n, 0.8, 0.3, True, rng=np.random.default_rng(3))
+            resultados.append(motor.siguiente_generacion(self.poblacion, self.fitness).copy())
+        np.testing.assert_array_equal(resultados[0], resultados[1])
+
+    def test_operadores_de_cruce(self):
+        for operador in OPERADORES_CRUCE:
+            motor = MotorReproduccion(11, self.n, 1.0, 0.2, True, rng=self.rng, operador_cruce=operador)
+            nueva = motor.siguiente_generacion(self.poblacion, self.fitness)
+            for individuo in nueva:
+                np.testing.assert_array_equal(np.sort(individuo), np.arange(self.n), err_msg=operador)
+
+    def test_cruce_registrado(self):
+        # Un operador registrado sin núcleo fusionado pasa por su función por lotes
+        def cruce_copia(padres1, padres2, puntos1, puntos2, mascaras):
+            return padres2.copy(), padres1.copy()
+        registrar_cruce('copia', cruce_copia, usa_mascara=False)
+        try:
+            motor = MotorReproduccion(11, self.n, 0.5, 0.0, False, rng=self.rng, operador_cruce='copia')
+            nueva = motor.siguiente_generacion(self.poblacion, self.fitness)
+            filas = {tuple(individuo) for individuo in self.poblacion}
+            self.assertTrue(all(tuple(individuo) in filas for individuo in nueva))
+        finally:
+            del _CRUCES_LOTE['copia']
+
+if __name__ == '__main__':
+    unittest.main()
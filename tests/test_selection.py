@@ -3,7 +3,8 @@
 import unittest
 import numpy as np
 import random
-from src.selection import seleccion_torneo
+from src.selection import (seleccion_torneo, seleccion_torneo_indices, seleccion_ranking_lineal_indices,
+                           seleccion_sus_indices, seleccionar_indices)
 
 class TestSelection(unittest.TestCase):
     def setUp(self):
@@ -44,5 +45,43 @@ class TestSelection(unittest.TestCase):
         # Con la semilla 42, verifica que se selecciona el mejor fitness=3
         self.assertTrue(np.array_equal(seleccionado, poblacion[3]))
 
+    def test_seleccion_torneo_indices(self):
+        fitness = np.array([10, 5, 8, 3, 9, 8])
+        rng = np.random.default_rng(self.seed)
+        # Con k = 1 no hay presión selectiva: todos los individuos se eligen
+        self.assertEqual(len(set(seleccion_torneo_indices(fitness, 1000, k=1, rng=rng))), 6)
+        # Con reemplazo, el mejor gana si aparece en el torneo (1 - (5/6)²) y el peor solo si lo
+        # ocupa entero ((1/6)²)
+        conteos = np.bincount(seleccion_torneo_indices(fitness, 60000, k=2, rng=rng), minlength=6) / 60000
+        self.assertAlmostEqual(conteos[3], 1 - (5 / 6) ** 2, delta=0.01)
+        self.assertAlmostEqual(conteos[0], (1 / 6) ** 2, delta=0.005)
+        with self.assertRaises(ValueError):
+            seleccion_torneo_indices(fitness, 10, k=0, rng=rng)
+
+    def test_seleccion_ranking_lineal(self):
+        fitness = np.array([10, 5, 8, 3, 9, 8])
+        rng = np.random.default_rng(self.seed)
+        conteos = np.bincount(seleccion_ranking_lineal_indices(fitness, 60000, presion=2.0, rng=rng), minlength=6)
+        # Con presión 2 el peor nunca se elige y el mejor recibe 2/N de las selecciones
+        self.assertEqual(conteos[0], 0)
+        self.assertAlmostEqual(conteos[3] / 60000, 2 / 6, delta=0.01)
+        # Con presión 1 la selección es uniforme
+        conteos = np.bincount(seleccion_ranking_lineal_indices(fitness, 60000, presion=1.0, rng=rng), minlength=6)
+        np.testing.assert_allclose(conteos / 60000, 1 / 6, atol=0.01)
+
+    def test_seleccion_sus(self):
+        fitness = np.array([10.0, 6.0, 8.0, 2.0])
+        esperado = np.array([0, 4, 2, 8]) / 14 * 8
+        rng = np.random.default_rng(self.seed)
+        for _ in range(20):
+            conteos = np.bincount(seleccion_sus_indices(fitness, 8, rng=rng), minlength=4)
+            # Pesos 0, 4, 2, 8: cada individuo aparece su valor esperado redondeado hacia abajo o hacia arriba
+            self.assertEqual(conteos.sum(), 8)
+            self.assertTrue(np.all((conteos >= np.floor(esperado)) & (conteos <= np.ceil(esperado))))
+
+    def test_seleccionar_indices_metodo_desconocido(self):
+        with self.assertRaises(ValueError):
+            seleccionar_indices(np.array([1.0, 2.0]), 2, metodo='ruleta')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+# tests/test_shared_instance.py
+
+import unittest
+import numpy as np
+from src.optimization import crear_ejecutor_busqueda_local, optimizar_poblacion
+from src.shared_instance import InstanciaCompartida, adjuntar_instancia
+from src.utils import construir_flujo_disperso
+
+class TestSharedInstance(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.n = 12
+        flujo = rng.integers(1, 10, size=(self.n, self.n))
+        flujo[rng.random((self.n, self.n)) < 0.8] = 0
+        self.flujo_matrix = np.triu(flujo, 1) + np.triu(flujo, 1).T
+        self.distancia_matrix = rng.integers(1, 50, size=(self.n, self.n)).astype(np.float64)
+        self.flujo_disperso = construir_flujo_disperso(self.flujo_matrix)
+
+    def test_adjuntar_sin_copia(self):
+        with InstanciaCompartida(self.flujo_matrix, self.distancia_matrix, self.flujo_disperso) as instancia:
+            flujo, distancia, flujo_disperso, segmentos = adjuntar_instancia(instancia.descriptor)
+            np.testing.assert_array_equal(flujo, self.flujo_matrix)
+            np.testing.assert_array_equal(distancia, self.distancia_matrix)
+            for campo, esperado in zip(flujo_disperso, self.flujo_disperso):
+                np.testing.assert_array_equal(campo, esperado)
+            # Ambas vistas comparten la misma memoria
+            instancia.distancia_matrix[0, 1] = -1.0
+            self.assertEqual(distancia[0, 1], -1.0)
+            del flujo, distancia, flujo_disperso
+            for segmento in segmentos:
+                segmento.close()
+
+    def test_sin_vista_dispersa(self):
+        with InstanciaCompartida(self.flujo_matrix, self.distancia_matrix) as instancia:
+            self.assertIsNone(instancia.flujo_disperso)
+            self.assertIsNone(adjuntar_instancia(instancia.descriptor)[2])
+
+    def test_cerrar_elimina_segmentos(self):
+        instancia = InstanciaCompartida(self.flujo_matrix, self.distancia_matrix)
+        descriptor = instancia.descriptor
+        instancia.cerrar()
+        instancia.cerrar()
+        self.assertTrue(instancia.cerrada)
+        with self.assertRaises(FileNotFoundError):
+            adjuntar_instancia(descriptor)
+
+    def test_pool_procesos_con_instancia_compartida(self):
+        poblacion = np.array([np.random.default_rng(s).permutation(self.n) for s in range(4)])
+        esperado, costes_esperados = optimizar_poblacion(poblacion, self.flujo_matrix, self.distancia_matrix,
+                                                         motor='tabla_deltas', semilla=3)
+        with InstanciaCompartida(self.flujo_matrix, self.distancia_matrix, self.flujo_disperso) as instancia:
+            with crear_ejecutor_busqueda_local('procesos', self.flujo_matrix, self.distancia_matrix,
+                                               trabajadores=2, instancia=instancia) as ejecutor:
+                optimizados, costes = optimizar_poblacion(poblacion, self.flujo_matrix, self.distancia_matrix,
+                                                          motor='tabla_deltas', backend='procesos', semilla=3,
+                                                          ejecutor=ejecutor)
+            # El pool no libera una instancia que no ha creado
+            self.assertFalse(instancia.cerrada)
+        np.testing.assert_array_equal(optimizados, esperado)
+        np.testing.assert_allclose(costes, costes_esperados)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+# tests/test_simulated_annealing.py
+
+import unittest
+import numpy as np
+from src.fitness import calcular_coste
+from src.simulated_annealing import ejecutar_recocido_simulado
+
+class TestSimulatedAnnealing(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.n = 12
+        self.flujo_matrix = rng.integers(0, 10, size=(self.n, self.n))
+        self.distancia_matrix = rng.integers(1, 20, size=(self.n, self.n)).astype(np.float64)
+
+    def ejecutar(self, **parametros):
+        np.random.seed(0)
+        parametros = {'cadenas': 3, 'movimientos_sa': 6000, 'movimientos_epoca': 500, **parametros}
+        return ejecutar_recocido_simulado(self.n, self.flujo_matrix, self.distancia_matrix, parametros)
+
+    def test_solucion_valida_y_reproducible(self):
+        for enfriamiento in ('geometrico', 'adaptativo'):
+            (mejor, coste), historial = self.ejecutar(enfriamiento=enfriamiento)
+            self.assertEqual(sorted(mejor), list(range(self.n)))
+            # Instancia asimétrica: el coste acumulado con el delta exacto coincide con el real
+            self.assertAlmostEqual(coste, calcular_coste(mejor, self.flujo_matrix, self.distancia_matrix))
+            self.assertEqual(len(historial), 12)
+            self.assertTrue(all(a >= b for a, b in zip(historial, historial[1:])))
+            (repetido, _), _ = self.ejecutar(enfriamiento=enfriamiento)
+            np.testing.assert_array_equal(mejor, repetido)
+
+    def test_enfriamiento_desconocido(self):
+        with self.assertRaises(ValueError):
+            self.ejecutar(enfriamiento='otro')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_termination.py
+
+import itertools
+import unittest
+import numpy as np
+from src.genetic_algorithm import ejecutar_algoritmo_genetico
+from src.lamarckian_ga import ejecutar_varianta_lamarckiana
+from src.termination import ControlParada, contar_evaluaciones, diversidad_poblacion, obtener_control_parada
+
+class TestTermination(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.n = 8
+        self.flujo_matrix = rng.integers(0, 10, size=(self.n, self.n))
+        self.distancia_matrix = rng.integers(1, 20, size=(self.n, self.n)).astype(np.float64)
+        self.parametros = {'poblacion': 20, 'generaciones': 50, 'tasa_cruce': 0.8, 'tasa_mutacion': 0.02,
+                           'elitismo': True, 'tam_poblacion_opt': 4, 'hill_climbing_max_iter': 20}
+
+    def test_diversidad_poblacion(self):
+        rng = np.random.default_rng(0)
+        poblacion = np.array([rng.permutation(self.n) for _ in range(7)])
+        # Distancia de Hamming media entre todas las parejas, normalizada por n
+        esperada = np.mean([np.mean(a != b) for a, b in itertools.combinations(poblacion, 2)])
+        self.assertAlmostEqual(diversidad_poblacion(poblacion), esperada)
+        self.assertEqual(diversidad_poblacion(np.tile(np.arange(self.n), (5, 1))), 0.0)
+
+    def test_criterios(self):
+        control = ControlParada(coste_objetivo=10)
+        self.assertFalse(control.registrar(12, 5))
+        self.assertTrue(control.registrar(10, 5))
+        self.assertEqual(control.motivo, 'coste_objetivo')
+
+        control = ControlParada(max_evaluaciones=10)
+        self.assertFalse(control.registrar(5, 6))
+        self.assertTrue(control.registrar(4, 6))
+        self.assertEqual(control.motivo, 'max_evaluaciones')
+
+        control = ControlParada(tiempo_limite=0.0)
+        self.assertTrue(control.registrar(5, 1))
+        self.assertEqual(control.motivo, 'tiempo_limite')
+
+        control = ControlParada(estancamiento=2)
+        for coste, parar in ((5, False), (4, False), (4, False), (4, True)):
+            self.assertEqual(control.registrar(coste, 1), parar)
+        self.assertEqual(control.motivo, 'estancamiento')
+
+        control = ControlParada()
+        control.registrar(5, 1)
+        self.assertEqual(control.finalizar(), 'generaciones')
+
+    def test_estancamiento_con_diversidad(self):
+        diversa = np.array([np.roll(np.arange(self.n), k) for k in range(self.n)])
+        convergida = np.tile(np.arange(self.n), (self.n, 1))
+        control = ControlParada(estancamiento=1, diversidad_minima=0.1)
+        control.registrar(5, 1, diversa)
+        # Sin mejora pero la población sigue siendo diversa: no se para
+        self.assertFalse(control.registrar(5, 1, diversa))
+        self.assertTrue(control.registrar(5, 1, convergida))
+        self.assertEqual(control.diversidad, 0.0)
+
+    def test_contar_evaluaciones(self):
+        self.assertEqual(contar_evaluaciones({'evaluaciones': 7, 'aciertos_cache': 3}), 7)
+        self.assertEqual(contar_evaluaciones({'evaluaciones': 7}, {'iteraciones_busqueda_local': 40,
+                                                                   'movimientos_aceptados': 5}, None), 47)
+
+    def test_obtener_control_parada(self):
+        control = ControlParada()
+        self.assertIs(obtener_control_parada({'control_parada': control}), control)
+        self.assertEqual(obtener_control_parada({'estancamiento': 3}).estancamiento, 3)
+
+    def test_drivers_paran_antes(self):
+        np.random.seed(0)
+        control = ControlParada(coste_objetivo=np.inf)
+        _, historial = ejecutar_algoritmo_genetico(self.n, self.flujo_matrix, self.distancia_matrix,
+                                                   dict(self.parametros, control_parada=control))
+        self.assertEqual(control.motivo, 'coste_objetivo')
+        self.assertEqual(len(historial), 1)
+
+        # Las iteraciones de la búsqueda local también consumen el presupuesto de evaluaciones
+        control = ControlParada(max_evaluaciones=3 * self.parametros['poblacion'])
+        _, historial = ejecutar_varianta_lamarckiana(self.n, self.flujo_matrix, self.distancia_matrix,
+                                                     dict(self.parametros, control_parada=control))
+        self.assertEqual(control.motivo, 'max_evaluaciones')
+        self.assertGreaterEqual(control.evaluaciones, control.max_evaluaciones)
+        self.assertLessEqual(len(historial), 3)
+
+        control = ControlParada()
+        _, historial = ejecutar_algoritmo_genetico(self.n, self.flujo_matrix, self.distancia_matrix,
+                                                   dict(self.parametros, control_parada=control))
+        self.assertEqual(control.motivo, 'generaciones')
+        self.assertEqual(len(historial), self.parametros['generaciones'] + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# tests/test_utils.py
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.utils import cargar_datos, resolver_instancias
+
+class TestUtils(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.directorio_cache = os.path.join(self.directorio, 'cache')
+        self.ruta = os.path.join(self.directorio, 'prueba.dat')
+        self.escribir_instancia([[0, 2, 1], [2, 0, 3], [1, 3, 0]], [[0, 5, 2], [5, 0, 4], [2, 4, 0]])
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def escribir_instancia(self, flujo, distancias):
+        with open(self.ruta, 'w') as f:
+            f.write(f"{len(flujo)}\n\n")
+            for fila in flujo + distancias:
+                f.write(' '.join(str(v) for v in fila) + '\n')
+
+    def test_cache_coincide_con_texto(self):
+        n, flujo, distancias = cargar_datos(self.ruta)
+        for _ in range(2):
+            n_cache, flujo_cache, distancias_cache = cargar_datos(self.ruta, cache=self.directorio_cache)
+            self.assertEqual(n_cache, n)
+            np.testing.assert_array_equal(flujo_cache, flujo)
+            np.testing.assert_array_equal(distancias_cache, distancias)
+            self.assertEqual(flujo_cache.dtype, np.int32)
+            self.assertEqual(distancias_cache.dtype, np.float32)
+        # La segunda carga es un mapa de memoria de solo lectura
+        self.assertIsInstance(flujo_cache, np.memmap)
+        self.assertFalse(flujo_cache.flags.writeable)
+
+    def test_cache_se_invalida_al_cambiar_el_archivo(self):
+        cargar_datos(self.ruta, cache=self.directorio_cache)
+        self.escribir_instancia([[0, 7], [7, 0]], [[0, 1], [1, 0]])
+        n, flujo, _ = cargar_datos(self.ruta, cache=self.directorio_cache)
+        self.assertEqual(n, 2)
+        self.assertEqual(flujo[0, 1], 7)
+
+    def test_cache_no_se_regenera_si_solo_cambia_la_fecha(self):
+        cargar_datos(self.ruta, cache=self.directorio_cache)
+        ruta_npy = [os.path.join(self.directorio_cache, f) for f in os.listdir(self.directorio_cache) if f.endswith('.npy')][0]
+        mtime_npy = os.stat(ruta_npy).st_mtime_ns
+        estado = os.stat(self.ruta)
+        os.utime(self.ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+        _, flujo, _ = cargar_datos(self.ruta, cache=self.directorio_cache)
+        self.assertIsInstance(flujo, np.memmap)
+        self.assertEqual(os.stat(ruta_npy).st_mtime_ns, mtime_npy)
+
+    def test_filas_partidas_y_lineas_en_blanco(self):
+        with open(self.ruta, 'w') as f:
+            f.write("  3\n\n0 2\n 1\n2 0 3 1 3\n0\n\n\n0 5 2\t5 0\n4 2 4 0.5e1\n")
+        n, flujo, distancias = cargar_datos(self.ruta)
+        self.assertEqual(n, 3)
+        np.testing.assert_array_equal(flujo, [[0, 2, 1], [2, 0, 3], [1, 3, 0]])
+        np.testing.assert_array_equal(distancias, [[0, 5, 2], [5, 0, 4], [2, 4, 5]])
+
+    def test_errores_de_formato(self):
+        casos = [
+            ("2\n0 1\n1 x\n0 3 3 0\n", "línea 3, columna 3"),
+            ("2\n0 1 1 0\n0 3 3 0\n7\n", "línea 4, columna 1"),
+            ("2\n0 1 1 0\n0 3 3\n", "solo hay 7"),
+            ("2.5\n", "entero positivo"),
+        ]
+        for contenido, mensaje in casos:
+            with open(self.ruta, 'w') as f:
+                f.write(contenido)
+            with self.assertRaisesRegex(ValueError, mensaje):
+                cargar_datos(self.ruta)
+
+    def test_resolver_instancias(self):
+        self.assertEqual([os.path.basename(r) for r in resolver_instancias(['nug12'])], ['nug12.dat'])
+        self.assertTrue(all('tai' in r for r in resolver_instancias(['tai*'])))
+        self.assertEqual(resolver_instancias(['prueba', 'prue*'], self.directorio), [self.ruta])
+        with self.assertRaises(ValueError):
+            resolver_instancias(['no_existe'])
+
+if __name__ == '__main__':
+    unittest.main()